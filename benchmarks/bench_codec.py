@@ -0,0 +1,62 @@
+"""Benchmark bulk stream encoding/decoding against the per-packet path.
+
+Run from the repository root with ``python -m benchmarks.bench_codec``.
+"""
+
+import argparse
+import os
+import time
+
+from spacewire.codec import encode_many, decode_many
+from spacewire.packet import PacketFactory, SpaceWirePacket, SpaceFibrePacket
+
+
+def _rate(num_bytes: int, seconds: float) -> str:
+    return f"{num_bytes / seconds / 1e6:10.1f} MB/s"
+
+
+def run(total_bytes: int, chunk_size: int, protocol: str) -> None:
+    data = os.urandom(total_bytes)
+    packets = PacketFactory.create_batch(0x01, 0x02, data, chunk_size, protocol)
+    batch = PacketFactory.create_packet_batch(0x01, 0x02, data, chunk_size, protocol)
+    cls = SpaceFibrePacket if protocol == "spacefibre" else SpaceWirePacket
+
+    print(f"{protocol}: {len(packets)} packets of {chunk_size} bytes")
+
+    start = time.perf_counter()
+    frames = [p.to_bytes() for p in packets]
+    b"".join(frames)
+    print(f"  per-packet to_bytes    {_rate(total_bytes, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    stream = encode_many(packets)
+    print(f"  encode_many (objects)  {_rate(total_bytes, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    encode_many(batch)
+    print(f"  encode_many (batch)    {_rate(total_bytes, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    decoded = [cls.from_bytes(f) for f in frames]
+    print(f"  per-packet from_bytes  {_rate(total_bytes, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    views = list(decode_many(stream, protocol))
+    print(f"  decode_many (views)    {_rate(total_bytes, time.perf_counter() - start)}")
+
+    assert len(views) == len(decoded) == len(packets)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024, help="Bytes to encode")
+    parser.add_argument("--chunk-size", type=int, nargs="+", default=[64, 1000])
+    args = parser.parse_args()
+
+    for chunk_size in args.chunk_size:
+        for protocol in ("spacewire", "spacefibre"):
+            run(args.size, chunk_size, protocol)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark packet object size and construction rate.
+
+Compares the slotted packet classes (wall-clock, deferred and simulated
+timestamps) against a ``__dict__``-based replica of the original layout.
+Run from the repository root with ``python -m benchmarks.bench_packets``.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from spacewire.packet import CRC8, SpaceWirePacket, SpaceFibrePacket, PacketPriority, PacketType
+
+
+class LegacyPacket:
+    """The pre-``__slots__`` SpaceWirePacket layout, kept for comparison."""
+
+    def __init__(
+        self,
+        src=0x01,
+        dst=0x02,
+        route=0x00,
+        data=b"",
+        packet_type=PacketType.DATA,
+        priority=PacketPriority.NORMAL,
+        crc=None,
+    ):
+        self.src = src
+        self.dst = dst
+        self.route = route
+        self.data = data
+        self.packet_type = packet_type
+        self.priority = priority
+        self.crc = CRC8.calculate(data) if crc is None else crc
+        self.timestamp = time.time()
+
+
+def _list_overhead(count: int) -> int:
+    """Approximate size of the list holding the packets."""
+    return 56 + 8 * count
+
+
+def _measure(label: str, factory, count: int) -> None:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    packets = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    per_packet = (allocated - _list_overhead(count)) / count
+    del packets
+
+    start = time.perf_counter()
+    for _ in range(count):
+        factory()
+    rate = count / (time.perf_counter() - start)
+    print(f"  {label:<28} {per_packet:8.1f} bytes/packet  {rate:12,.0f} packets/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    payload = b"x" * 64
+    simulated = [0.0]
+
+    def sim_clock() -> float:
+        return simulated[0]
+
+    print(f"{args.count} packets, shared 64-byte payload, precomputed CRC")
+    _measure("legacy (__dict__)", lambda: LegacyPacket(data=payload, crc=0), args.count)
+
+    SpaceWirePacket.set_clock()
+    _measure("slots, wall clock", lambda: SpaceWirePacket(data=payload, crc=0), args.count)
+    SpaceWirePacket.set_clock(deferred=True)
+    _measure("slots, deferred timestamp", lambda: SpaceWirePacket(data=payload, crc=0), args.count)
+    SpaceWirePacket.set_clock(sim_clock)
+    _measure("slots, simulated clock", lambda: SpaceWirePacket(data=payload, crc=0), args.count)
+    _measure(
+        "spacefibre, simulated clock", lambda: SpaceFibrePacket(data=payload, crc=0), args.count
+    )
+    SpaceWirePacket.set_clock()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark single-pair queries: dict Dijkstra vs array Dijkstra vs A*.
+
+Run from the repository root with ``python -m benchmarks.bench_pathfinding``.
+"""
+
+import argparse
+import random
+import time
+
+from spacewire.topology import Node, Topology, TopologyType
+
+
+def geometric_grid(side: int, seed: int = 0) -> Topology:
+    """Jittered ``side x side`` grid with Euclidean link costs."""
+    rng = random.Random(seed)
+    topo = Topology("Grid", TopologyType.MESH)
+    topo.add_nodes(
+        Node(id=r * side + c, name=f"N{r}_{c}", x=c + rng.random() * 0.4, y=r + rng.random() * 0.4)
+        for r in range(side)
+        for c in range(side)
+    )
+    topo.add_edges(
+        [(r * side + c, r * side + c + 1) for r in range(side) for c in range(side - 1)]
+        + [(r * side + c, (r + 1) * side + c) for r in range(side - 1) for c in range(side)]
+    )
+    topo.set_euclidean_weights()
+    return topo
+
+
+def run(side: int, queries: int) -> None:
+    topo = geometric_grid(side)
+    n = side * side
+    print(f"{n} nodes")
+    rng = random.Random(1)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(queries)]
+    weights = dict(topo.link_weights)
+
+    # Warm the cached CSR snapshot and A* heuristic.
+    topo.astar_path(0, 1)
+
+    for label, search in (
+        ("dijkstra (dict)", lambda a, b: topo.dijkstra_path(a, b, weights)),
+        ("dijkstra (array)", topo.dijkstra_path),
+        ("a* (coordinates)", topo.astar_path),
+    ):
+        start = time.perf_counter()
+        for src, dst in pairs:
+            search(src, dst)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:18s} {elapsed / queries * 1000:8.2f} ms/query")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--side", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    for side in args.side:
+        run(side, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark RoutingTable precompute, lookup rate and all-pairs shortest paths.
+
+Run from the repository root with ``python -m benchmarks.bench_routing``.
+"""
+
+import argparse
+import os
+import random
+import time
+
+from spacewire.topology import Topology, TopologyType, RoutingTable, DynamicRoutingTable
+
+
+def torus(side: int) -> Topology:
+    """Square 2D torus with ``side * side`` nodes."""
+    topo = Topology("Torus", TopologyType.MESH)
+    for y in range(side):
+        for x in range(side):
+            node = y * side + x
+            topo.add_edge(node, y * side + (x + 1) % side)
+            topo.add_edge(node, ((y + 1) % side) * side + x)
+    return topo
+
+
+def run(side: int, lookups: int, workers: int) -> None:
+    topo = torus(side)
+    n = side * side
+    print(f"{n} nodes, {sum(len(d) for d in topo.edges.values())} directed edges")
+
+    start = time.perf_counter()
+    table = RoutingTable(topo)
+    elapsed = time.perf_counter() - start
+    print(f"  precompute           {elapsed:10.3f} s ({table.next_hops.nbytes / 1e6:.1f} MB)")
+
+    rng = random.Random(0)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    for src, dst in pairs:
+        table.next_hop(src, dst)
+    elapsed = time.perf_counter() - start
+    print(f"  next_hop             {lookups / elapsed:10.0f} lookups/s")
+
+    start = time.perf_counter()
+    for src, dst in pairs[: lookups // 10]:
+        table.path(src, dst)
+    elapsed = time.perf_counter() - start
+    print(f"  path                 {lookups // 10 / elapsed:10.0f} paths/s")
+
+    start = time.perf_counter()
+    for src, dst in pairs[:100]:
+        topo.bfs_path(src, dst)
+    elapsed = time.perf_counter() - start
+    print(f"  bfs_path (baseline)  {100 / elapsed:10.0f} paths/s")
+
+    for count in sorted({1, workers}):
+        start = time.perf_counter()
+        topo.all_pairs_shortest_paths(workers=count)
+        elapsed = time.perf_counter() - start
+        print(f"  all-pairs hops       {elapsed:10.3f} s ({count} workers)")
+
+    # Weighted all-pairs runs one Dijkstra per source; time a slice of sources.
+    weights = {(0, 1): 2.0}
+    csr = topo.to_csr()
+    edge_weights = csr.edge_weights(weights)
+    sample = min(n, 200)
+    start = time.perf_counter()
+    csr.shortest_path_rows(list(range(sample)), edge_weights)
+    elapsed = time.perf_counter() - start
+    print(f"  all-pairs weighted   {elapsed / sample * n:10.3f} s (est., 1 worker)")
+
+    dynamic = DynamicRoutingTable(topo)
+    events = 20
+    start = time.perf_counter()
+    for _ in range(events):
+        src = rng.randrange(n)
+        dst = topo.edges[src][0]
+        dynamic.fail_link(src, dst)
+        dynamic.restore_link(src, dst)
+    elapsed = time.perf_counter() - start
+    print(f"  link fail+restore    {elapsed / events * 1000:10.1f} ms/event (incremental)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--side",
+        type=int,
+        nargs="+",
+        default=[32, 71, 100],
+        help="Torus side lengths (nodes = side^2)",
+    )
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    for side in args.side:
+        run(side, args.lookups, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark the discrete-event simulator: packets and events per second.
+
+Run from the repository root with ``python -m benchmarks.bench_simulator``.
+
+The kernel is bound by per-event Python work: on CPython 3.11 it runs
+about 0.5 million events per second, one event per hop plus one per
+injection. One million packets therefore take about 12 s on a 10x10
+torus (5 hops on average) and about 35 s on a 32x32 torus (16 hops),
+not the few seconds it would take to call million-packet runs fast.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from spacewire.simulator import Simulator, WormholeSimulator
+from spacewire.topology import TopologyBuilder
+
+
+def run(side: int, packets: int) -> None:
+    topo = TopologyBuilder.torus_2d(side, side)
+    n = side * side
+    sim = Simulator(topo, hop_latency=1e-6)
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    sim.inject_many(
+        rng.integers(0, n, packets),
+        rng.integers(0, n, packets),
+        np.full(packets, 1000),
+        rng.random(packets),
+    )
+    injected = time.perf_counter() - start
+
+    start = time.perf_counter()
+    events = sim.run()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{n:5d} nodes, {packets} packets: inject {injected:.2f} s, run {elapsed:.2f} s "
+        f"({packets / elapsed:,.0f} packets/s, {events / elapsed:,.0f} events/s, "
+        f"mean {np.mean(sim.packet_hops):.1f} hops)"
+    )
+
+
+def link_packets(sim: Simulator, src_ids: np.ndarray, dst_ids: np.ndarray) -> np.ndarray:
+    """Packets each directed link carries under the simulator's routing table."""
+    routing = sim.routing
+    n = len(routing.node_ids)
+    node = np.array([routing.index_of[i] for i in src_ids.tolist()], dtype=np.int64)
+    dst = np.array([routing.index_of[i] for i in dst_ids.tolist()], dtype=np.int64)
+    counts = np.zeros(n * n, dtype=np.int64)
+    active = np.flatnonzero(node != dst)
+    while len(active):
+        hop = routing.next_hops[node[active], dst[active]].astype(np.int64)
+        counts += np.bincount(node[active] * n + hop, minlength=n * n)
+        node[active] = hop
+        active = active[hop != dst[active]]
+    return counts[counts > 0]
+
+
+def run_wormhole(k: int, packets: int, load: float) -> None:
+    """
+    Wormhole switching on a k-ary fat-tree, the busiest link offered ``load``.
+
+    Shortest-path routing takes a single next hop, so the traffic of many
+    hosts shares the same uplinks. The injection window is therefore sized
+    from the per-link packet counts so that the busiest link, not the
+    average host, is offered ``load`` of its rate; the mean offered load
+    over the links used is printed alongside.
+    """
+    topo = TopologyBuilder.fat_tree(k)
+    hosts = np.array([i for i, node in topo.nodes.items() if node.metadata["role"] == "host"])
+    sim = WormholeSimulator(topo)
+    rng = np.random.default_rng(0)
+    src, dst = rng.choice(hosts, packets), rng.choice(hosts, packets)
+    per_link = link_packets(sim, src, dst)
+    delay = sim.params.serialization_delay(1000)
+    duration = per_link.max() * delay / load
+    mean_load = per_link.mean() * delay / duration
+
+    start = time.perf_counter()
+    sim.inject_many(src, dst, np.full(packets, 1000), rng.random(packets) * duration)
+    events = sim.run()
+    elapsed = time.perf_counter() - start
+    stats = sim.blocking_stats()
+    print(
+        f"wormhole fat-tree k={k} ({len(topo.nodes)} nodes), {packets} packets, "
+        f"peak link load {load}, mean link load {mean_load:.2f}: "
+        f"{elapsed:.2f} s ({packets / elapsed:,.0f} packets/s, {events / elapsed:,.0f} events/s, "
+        f"{stats['blocked_packets']} blocked, mean wait {stats['mean_wait'] * 1e3:.2f} ms "
+        f"over a {duration * 1e3:.0f} ms window)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--side", type=int, nargs="+", default=[10, 32])
+    parser.add_argument("--packets", type=int, default=1_000_000)
+    parser.add_argument(
+        "--fat-tree", type=int, default=16, help="Fat-tree arity for the wormhole run"
+    )
+    parser.add_argument("--wormhole-packets", type=int, default=200_000)
+    parser.add_argument("--load", type=float, default=0.5, help="Offered load on the busiest link")
+    args = parser.parse_args()
+
+    for side in args.side:
+        run(side, args.packets)
+    run_wormhole(args.fat_tree, args.wormhole_packets, args.load)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark topology construction, including the large-scale generators.
+
+Run from the repository root with ``python -m benchmarks.bench_topology``.
+"""
+
+import argparse
+import time
+
+from spacewire.topology import Topology, TopologyBuilder
+
+
+def run(size: int) -> None:
+    ids = list(range(size))
+    print(f"{size} nodes")
+
+    start = time.perf_counter()
+    topo = TopologyBuilder.mesh(ids)
+    elapsed = time.perf_counter() - start
+    links = sum(len(dsts) for dsts in topo.edges.values())
+    print(f"  mesh                 {elapsed:8.3f} s ({links} directed links)")
+
+    start = time.perf_counter()
+    TopologyBuilder.ring(ids[0], ids[1:])
+    print(f"  ring                 {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    Topology.from_edge_list((i, (i + 1) % size) for i in ids)
+    print(f"  from_edge_list       {time.perf_counter() - start:8.3f} s")
+
+
+def run_generators(scale: int) -> None:
+    side2 = int(round(scale**0.5))
+    side3 = int(round(scale ** (1 / 3)))
+    fat_k = 2 * int(round((4 * scale) ** (1 / 3) / 2))
+    generators = [
+        (f"torus_2d({side2}x{side2})", lambda: TopologyBuilder.torus_2d(side2, side2)),
+        (f"torus_3d({side3}^3)", lambda: TopologyBuilder.torus_3d(side3, side3, side3)),
+        ("k_ary_n_cube(2, 16)", lambda: TopologyBuilder.k_ary_n_cube(2, 16)),
+        (f"fat_tree({fat_k})", lambda: TopologyBuilder.fat_tree(fat_k)),
+        ("random_geometric", lambda: TopologyBuilder.random_geometric(scale, 2.0 / side2)),
+        ("dual_plane_backbone", lambda: TopologyBuilder.dual_plane_backbone(scale, 256)),
+    ]
+    print(f"generators at ~{scale} nodes")
+    for label, build in generators:
+        start = time.perf_counter()
+        topo = build()
+        elapsed = time.perf_counter() - start
+        links = sum(len(dsts) for dsts in topo.edges.values())
+        print(f"  {label:22s} {elapsed:8.3f} s ({len(topo.nodes)} nodes, {links} links)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--scale", type=int, default=100_000, help="Generator node count")
+    args = parser.parse_args()
+
+    for size in args.size:
+        run(size)
+    run_generators(args.scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,42 @@ SpaceWire/SpaceFibre Network Simulation Package
 
 A comprehensive simulation toolkit for spacecraft communication networks
 implementing SpaceWire and SpaceFibre protocols.
+
+Public names are resolved lazily (PEP 562): ``import spacewire`` does not
+import NumPy or any submodule until one of the names below is accessed.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "SpaceWire Team"
 
-from spacewire.packet import SpaceWirePacket, SpaceFibrePacket, CRC8, CRC16
-from spacewire.topology import Topology, get_topology
-from spacewire.metrics import MetricsCollector, MetricsSnapshot
-
-__all__ = [
-    "SpaceWirePacket",
-    "SpaceFibrePacket",
-    "CRC8",
-    "CRC16",
-    "Topology",
-    "get_topology",
-    "MetricsCollector",
-    "MetricsSnapshot",
-]
+# typing is not imported here to keep the package import near-free.
+_LAZY_ATTRIBUTES = {
+    "SpaceWirePacket": "spacewire.packet",
+    "SpaceFibrePacket": "spacewire.packet",
+    "CRC8": "spacewire.packet",
+    "CRC16": "spacewire.packet",
+    "CRC16Context": "spacewire.packet",
+    "PacketBatch": "spacewire.packet",
+    "PacketView": "spacewire.packet",
+    "Topology": "spacewire.topology",
+    "get_topology": "spacewire.topology",
+    "MetricsCollector": "spacewire.metrics",
+    "MetricsSnapshot": "spacewire.metrics",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> object:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,42 @@
+"""Deferred imports for optional heavy dependencies."""
+
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule(ModuleType):
+    """
+    Module placeholder that imports the real module on first attribute access.
+
+    Lets a module keep ``yaml.safe_load(...)``-style call sites while the
+    import cost is only paid by code paths that actually use the dependency.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a placeholder for ``name`` that imports it when first used."""
+    return LazyModule(name)
+
+
+def is_available(name: str) -> bool:
+    """Check whether an optional dependency is installed, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
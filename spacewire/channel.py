@@ -0,0 +1,164 @@
+"""Bit-error channel models for link-level error simulation."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from spacewire.packet import CRC16, PacketBatch, SpaceWirePacket
+
+
+@dataclass
+class ChannelReport:
+    """Outcome of sending a batch through a channel."""
+
+    packets: int
+    bits_sent: int
+    bit_errors: int
+    corrupted: np.ndarray
+    detected: np.ndarray
+
+    @property
+    def packets_corrupted(self) -> int:
+        return int(self.corrupted.sum())
+
+    @property
+    def errors_detected(self) -> int:
+        return int(self.detected.sum())
+
+    @property
+    def undetected_errors(self) -> int:
+        """Corrupted packets whose CRC still verified."""
+        return int((self.corrupted & ~self.detected).sum())
+
+    @property
+    def undetected_error_rate(self) -> float:
+        """Fraction of corrupted packets that passed the CRC check."""
+        corrupted = self.packets_corrupted
+        return self.undetected_errors / corrupted if corrupted else 0.0
+
+    @property
+    def measured_ber(self) -> float:
+        return self.bit_errors / self.bits_sent if self.bits_sent else 0.0
+
+
+class BitErrorChannel:
+    """
+    Binary channel with independent bit errors and error bursts.
+
+    Every payload and CRC bit of a batch is treated as one serial
+    stream. Independent errors hit each bit with probability ``ber``.
+    Bursts start at each bit with probability ``burst_rate``; a burst
+    spans a geometrically distributed number of bits (mean
+    ``burst_length``) whose first bit is always flipped and whose other
+    bits flip with probability ``burst_density``. All error positions for
+    a batch are drawn with a handful of vectorized RNG calls, so the cost
+    scales with the number of errors rather than the number of bits.
+
+    Header bytes are not corrupted: a damaged address would be a routing
+    fault rather than a CRC-detectable payload error.
+    """
+
+    def __init__(
+        self,
+        ber: float = 1e-6,
+        burst_rate: float = 0.0,
+        burst_length: float = 8.0,
+        burst_density: float = 0.5,
+        seed: Optional[int] = None,
+    ):
+        if not 0.0 <= ber <= 1.0 or not 0.0 <= burst_rate <= 1.0:
+            raise ValueError("Error probabilities must be within [0, 1]")
+        if not 0.0 <= burst_density <= 1.0:
+            raise ValueError("burst_density must be within [0, 1]")
+        if burst_length < 1.0:
+            raise ValueError("burst_length must be at least 1 bit")
+        self.ber = ber
+        self.burst_rate = burst_rate
+        self.burst_length = burst_length
+        self.burst_density = burst_density
+        self.rng = np.random.default_rng(seed)
+
+    def error_positions(self, num_bits: int) -> np.ndarray:
+        """Draw the sorted, de-duplicated bit positions hit in ``num_bits`` bits."""
+        rng = self.rng
+        count = rng.binomial(num_bits, self.ber) if num_bits else 0
+        positions = rng.integers(0, num_bits, size=count) if count else np.empty(0, np.int64)
+
+        bursts = rng.binomial(num_bits, self.burst_rate) if num_bits and self.burst_rate else 0
+        if bursts:
+            starts = rng.integers(0, num_bits, size=bursts)
+            lengths = rng.geometric(1.0 / self.burst_length, size=bursts)
+            owner = np.repeat(np.arange(bursts), lengths)
+            offsets = np.arange(len(owner)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            flipped = (offsets == 0) | (rng.random(len(owner)) < self.burst_density)
+            burst_bits = (starts[owner] + offsets)[flipped]
+            positions = np.concatenate([positions, burst_bits[burst_bits < num_bits]])
+
+        # A bit hit twice is flipped back, so keep positions with odd counts.
+        positions, hits = np.unique(positions, return_counts=True)
+        odd: np.ndarray = positions[hits % 2 == 1]
+        return odd
+
+    def transmit(self, batch: PacketBatch) -> ChannelReport:
+        """
+        Corrupt a batch and report what the CRC caught.
+
+        Payload bits are flipped in a copy of ``batch.payload``, which then
+        replaces it, so a buffer the batch was built on is never modified;
+        CRC bits are flipped in ``batch.crc``.
+        """
+        crc_bits = 8 * PacketBatch.CRC_SIZES[batch.protocol]
+        payload_bits = 8 * len(batch.payload)
+        num_bits = payload_bits + crc_bits * len(batch)
+        positions = self.error_positions(num_bits)
+
+        in_payload = positions[positions < payload_bits]
+        if len(in_payload):
+            batch.payload = batch.payload.copy()
+            np.bitwise_xor.at(
+                batch.payload, in_payload >> 3, (0x80 >> (in_payload & 7)).astype(np.uint8)
+            )
+        in_crc = positions[positions >= payload_bits] - payload_bits
+        if len(in_crc):
+            np.bitwise_xor.at(
+                batch.crc,
+                in_crc // crc_bits,
+                (1 << (crc_bits - 1 - in_crc % crc_bits)).astype(np.uint16),
+            )
+
+        corrupted = np.zeros(len(batch), dtype=bool)
+        if len(in_payload):
+            owners = np.searchsorted(batch.offsets, in_payload >> 3, side="right") - 1
+            corrupted[owners] = True
+        corrupted[in_crc // crc_bits] = True
+
+        return ChannelReport(
+            packets=len(batch),
+            bits_sent=num_bits,
+            bit_errors=len(positions),
+            corrupted=corrupted,
+            detected=~batch.verify(),
+        )
+
+    def transmit_packet(self, packet: SpaceWirePacket) -> bool:
+        """
+        Corrupt a single packet in place.
+
+        Returns True if any bit was flipped; ``packet.verify()`` then tells
+        whether the CRC detected it.
+        """
+        crc_bits = 16 if packet.CRC is CRC16 else 8
+        payload_bits = 8 * len(packet.data)
+        positions = self.error_positions(payload_bits + crc_bits)
+        if not len(positions):
+            return False
+
+        in_payload = positions[positions < payload_bits]
+        if len(in_payload):
+            data = np.frombuffer(packet.data, dtype=np.uint8).copy()
+            np.bitwise_xor.at(data, in_payload >> 3, (0x80 >> (in_payload & 7)).astype(np.uint8))
+            packet.data = data.tobytes()
+        for bit in (positions[positions >= payload_bits] - payload_bits).tolist():
+            packet.crc ^= 1 << (crc_bits - 1 - bit)
+        return True
@@ -4,10 +4,13 @@ import argparse
 import sys
 import json
 from pathlib import Path
+from typing import Optional
 
 from spacewire.topology import TopologyBuilder, get_topology
 from spacewire.packet import SpaceWirePacket, SpaceFibrePacket, PacketFactory, PacketPriority
 from spacewire.metrics import MetricsCollector
+from spacewire.channel import BitErrorChannel
+from spacewire.simulator import LinkSimulator
 from spacewire.config import Config, get_config
 from spacewire.logging_config import setup_logging, get_logger
 
@@ -21,34 +24,45 @@ def cmd_send(args) -> None:
     dst = int(args.dst, 16) if isinstance(args.dst, str) else args.dst
     num_packets = args.count
     chunk_size = args.chunk_size
+    channel = _make_channel(args)
+    simulator = _make_simulator(src, dst, metrics, args)
+    undetected = 0
 
-    logger.info(f"Sending {num_packets} packets from 0x{src:02X} to 0x{dst:02X}")
-
-    for i in range(num_packets):
-        data = bytes([(i + j) % 256 for j in range(chunk_size)])
-        
-        if args.protocol == "spacefibre":
-            packet = PacketFactory.create_spacefibre(
-                src, dst, data,
-                virtual_channel=args.vc,
-                priority=PacketPriority(args.priority)
-            )
-        else:
-            packet = PacketFactory.create_spacewire(
-                src, dst, data,
-                priority=PacketPriority(args.priority)
-            )
+    if args.file:
+        _send_file(args, src, dst, metrics, channel, simulator)
+    else:
+        logger.info(f"Sending {num_packets} packets from 0x{src:02X} to 0x{dst:02X}")
 
-        metrics.record_sent(len(data))
-        
-        has_error = packet.simulate_error(args.error_rate)
-        if has_error:
-            metrics.record_error()
+        for i in range(num_packets):
+            data = bytes([(i + j) % 256 for j in range(chunk_size)])
         
-        latency = 0.001 + (i * 0.0001)
-        metrics.record_received(latency, len(data))
-
-        logger.debug(f"Sent packet {i+1}/{num_packets}: {packet}")
+            if args.protocol == "spacefibre":
+                packet = PacketFactory.create_spacefibre(
+                    src, dst, data,
+                    virtual_channel=args.vc,
+                    priority=PacketPriority(args.priority)
+                )
+            else:
+                packet = PacketFactory.create_spacewire(
+                    src, dst, data,
+                    priority=PacketPriority(args.priority)
+                )
+
+            if channel is not None:
+                corrupted = channel.transmit_packet(packet)
+                has_error = corrupted and not packet.verify()
+                undetected += corrupted and not has_error
+            else:
+                has_error = packet.simulate_error(args.error_rate)
+            if has_error:
+                metrics.record_error()
+
+            simulator.inject(src, dst, len(data), priority=packet.priority)
+            logger.debug(f"Sent packet {i+1}/{num_packets}: {packet}")
+
+        simulator.run()
+        if channel is not None:
+            metrics.record_event("channel", {"undetected_errors": int(undetected)})
 
     summary = metrics.get_summary()
     print(json.dumps(summary, indent=2))
@@ -57,6 +71,71 @@ def cmd_send(args) -> None:
         metrics.export_json(args.output)
 
 
+def _make_channel(args) -> Optional[BitErrorChannel]:
+    """Build the bit-error channel requested on the command line, if any."""
+    if not args.ber and not args.burst_rate:
+        return None
+    return BitErrorChannel(
+        ber=args.ber,
+        burst_rate=args.burst_rate,
+        burst_length=args.burst_length,
+        seed=args.seed,
+    )
+
+
+def _make_simulator(src: int, dst: int, metrics: MetricsCollector, args) -> LinkSimulator:
+    """Event simulator for a point-to-point link, timed from the network config."""
+    topology = TopologyBuilder.point_to_point(src, dst)
+    config = get_config()
+    return LinkSimulator.from_network_config(
+        topology, config.network, config.qos, metrics=metrics, seed=args.seed
+    )
+
+
+def _send_file(
+    args,
+    src: int,
+    dst: int,
+    metrics: MetricsCollector,
+    channel: Optional[BitErrorChannel],
+    simulator: LinkSimulator,
+) -> None:
+    """Stream a file through the packetizer in fixed-size blocks."""
+    logger = get_logger("cli")
+    logger.info(f"Sending {args.file} from 0x{src:02X} to 0x{dst:02X}")
+
+    blocks = PacketFactory.iter_file_batches(
+        args.file,
+        args.chunk_size,
+        args.protocol,
+        src=src,
+        dst=dst,
+        batch_size=1024,
+        virtual_channel=args.vc,
+        priority=PacketPriority(args.priority),
+    )
+    undetected = 0
+    for batch in blocks:
+        if channel is not None:
+            report = channel.transmit(batch)
+            errors = report.detected
+            undetected += report.undetected_errors
+        else:
+            errors = batch.inject_errors(args.error_rate)
+        for _ in range(int(errors.sum())):
+            metrics.record_error()
+        count = len(batch)
+        simulator.inject_many(
+            [src] * count, [dst] * count, batch.lengths, [simulator.now] * count, batch.priority
+        )
+        simulator.run()
+
+        logger.debug(f"Sent block: {batch}")
+
+    if channel is not None:
+        metrics.record_event("channel", {"undetected_errors": undetected})
+
+
 def cmd_topology(args) -> None:
     """Display topology information."""
     logger = get_logger("cli")
@@ -136,6 +215,11 @@ def main():
     send_parser.add_argument("--vc", type=int, default=0, help="Virtual channel (SpaceFibre)")
     send_parser.add_argument("--chunk-size", type=int, default=1000)
     send_parser.add_argument("--error-rate", type=float, default=0.1)
+    send_parser.add_argument("-f", "--file", help="Stream this file instead of generated data")
+    send_parser.add_argument("--ber", type=float, default=0.0, help="Per-bit error rate")
+    send_parser.add_argument("--burst-rate", type=float, default=0.0, help="Per-bit burst start rate")
+    send_parser.add_argument("--burst-length", type=float, default=8.0, help="Mean burst length (bits)")
+    send_parser.add_argument("--seed", type=int, help="Channel RNG seed")
     send_parser.add_argument("-o", "--output", help="Output file for metrics")
 
     topo_parser = subparsers.add_parser("topology", help="Show topology")
@@ -0,0 +1,182 @@
+"""Bulk wire encoding and decoding of packet streams with EOP/EEP framing."""
+
+import struct
+from typing import Any, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from spacewire.packet import SpaceWirePacket, SpaceFibrePacket, PacketBatch, PacketView
+
+EOP = 0x00
+"""End-of-packet marker: the packet completed normally."""
+
+EEP = 0x01
+"""Error-end-of-packet marker: the packet was truncated or corrupted in transit."""
+
+LENGTH_SIZE = 4
+MARKER_SIZE = 1
+FRAME_OVERHEAD = LENGTH_SIZE + MARKER_SIZE
+
+_LENGTH = struct.Struct("<I")
+_SPW_HEADER = struct.Struct("<I4B")
+_SPF_HEADER = struct.Struct("<I5B")
+
+
+def encoded_size(packets: Union[Sequence[SpaceWirePacket], PacketBatch]) -> int:
+    """Number of stream bytes ``encode_many`` needs for packets."""
+    if isinstance(packets, PacketBatch):
+        per_packet = (
+            PacketBatch.HEADER_SIZES[packets.protocol]
+            + PacketBatch.CRC_SIZES[packets.protocol]
+            + FRAME_OVERHEAD
+        )
+        return len(packets.payload) + len(packets) * per_packet
+
+    total = 0
+    for packet in packets:
+        protocol = "spacefibre" if isinstance(packet, SpaceFibrePacket) else "spacewire"
+        total += (
+            len(packet.data)
+            + PacketView.HEADER_SIZES[protocol]
+            + PacketView.CRC_SIZES[protocol]
+            + FRAME_OVERHEAD
+        )
+    return total
+
+
+def encode_many(
+    packets: Union[Sequence[SpaceWirePacket], PacketBatch],
+    out: Optional[bytearray] = None,
+    offset: int = 0,
+    errors: Optional[Sequence[bool]] = None,
+) -> bytearray:
+    """
+    Encode packets into a single stream buffer.
+
+    Every packet is written as a little-endian 32-bit frame length, the
+    serialized frame (as produced by ``to_bytes``) and a one-byte end
+    marker. A SpaceWire link signals the end of a packet with an EOP or
+    EEP control character rather than a data byte; the length word plays
+    the role of the data/control flag so payload bytes never need
+    escaping and the stream can be sliced without scanning it.
+
+    Args:
+        packets: Packet objects of one protocol, or a PacketBatch
+        out: Optional destination buffer; allocated when omitted
+        offset: Position in ``out`` to start writing at
+        errors: Optional per-packet flags; flagged packets end with EEP
+
+    Returns:
+        The buffer that was written to
+    """
+    size = encoded_size(packets)
+    if out is None:
+        out = bytearray(offset + size)
+    elif len(out) < offset + size:
+        raise ValueError(f"Output buffer too small: need {offset + size} bytes")
+
+    if isinstance(packets, PacketBatch):
+        _encode_batch(packets, out, offset, errors)
+        return out
+
+    pos = offset
+    for i, packet in enumerate(packets):
+        data = packet.data
+        length = len(data)
+        if isinstance(packet, SpaceFibrePacket):
+            _SPF_HEADER.pack_into(
+                out,
+                pos,
+                length + 7,
+                packet.src,
+                packet.dst,
+                packet.virtual_channel,
+                packet.sequence_number & 0xFF,
+                0x01 if packet.flow_control else 0x00,
+            )
+            pos += 9
+            out[pos : pos + length] = data
+            pos += length
+            out[pos] = packet.crc >> 8
+            out[pos + 1] = packet.crc & 0xFF
+            pos += 2
+        else:
+            _SPW_HEADER.pack_into(
+                out,
+                pos,
+                length + 5,
+                packet.src,
+                packet.dst,
+                packet.route,
+                packet.packet_type.value,
+            )
+            pos += 8
+            out[pos : pos + length] = data
+            pos += length
+            out[pos] = packet.crc & 0xFF
+            pos += 1
+        out[pos] = EEP if errors is not None and errors[i] else EOP
+        pos += 1
+    return out
+
+
+def _encode_batch(
+    batch: PacketBatch, out: bytearray, offset: int, errors: Optional[Sequence[bool]]
+) -> None:
+    """Vectorized ``encode_many`` for a PacketBatch."""
+    header = batch.header_columns()
+    trailer = batch.crc_columns()
+    frame_lengths = (batch.lengths + len(header) + len(trailer)).astype("<u4")
+    length_columns = [
+        ((frame_lengths >> (8 * k)) & 0xFF).astype(np.uint8) for k in range(LENGTH_SIZE)
+    ]
+    if errors is None:
+        marker = np.full(len(batch), EOP, dtype=np.uint8)
+    else:
+        marker = np.where(np.asarray(errors, dtype=bool), EEP, EOP).astype(np.uint8)
+
+    size = encoded_size(batch)
+    target = np.frombuffer(out, dtype=np.uint8)[offset : offset + size]
+    batch.frame_array(length_columns + header, trailer + [marker], out=target)
+
+
+def iter_frames(stream: Any, offset: int = 0) -> Iterator[Tuple[memoryview, int]]:
+    """
+    Iterate over the frames of an encoded stream without copying.
+
+    Yields ``(frame, marker)`` pairs where ``frame`` is a memoryview of the
+    serialized packet and ``marker`` is EOP or EEP. A trailing partial
+    frame is ignored so streams can be decoded while still being filled.
+    """
+    view = memoryview(stream)
+    if view.ndim != 1 or view.itemsize != 1:
+        view = view.cast("B")
+    end = len(view)
+    pos = offset
+    while pos + LENGTH_SIZE <= end:
+        (length,) = _LENGTH.unpack_from(view, pos)
+        stop = pos + LENGTH_SIZE + length
+        if stop + MARKER_SIZE > end:
+            break
+        marker = view[stop]
+        if marker not in (EOP, EEP):
+            raise ValueError(f"Invalid end-of-packet marker 0x{marker:02X} at offset {stop}")
+        yield view[pos + LENGTH_SIZE : stop], marker
+        pos = stop + MARKER_SIZE
+
+
+def decode_many(
+    stream: Any, protocol: str = "spacewire", skip_eep: bool = True
+) -> Iterator[PacketView]:
+    """
+    Iterate packets out of an encoded stream as zero-copy PacketViews.
+
+    Args:
+        stream: Buffer produced by ``encode_many``
+        protocol: Protocol of the frames in the stream
+        skip_eep: Drop packets terminated by EEP, as a receiving node would
+    """
+    for frame, marker in iter_frames(stream):
+        if marker == EEP and skip_eep:
+            continue
+        yield PacketView(frame, protocol)
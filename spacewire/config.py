@@ -2,11 +2,14 @@
 
 import os
 import json
-import yaml
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
+from spacewire._lazy import lazy_import
+
+yaml = lazy_import("yaml")
+
 
 @dataclass
 class NetworkConfig:
@@ -17,6 +20,12 @@ class NetworkConfig:
     chunk_size: int = 1000
     timeout: float = 30.0
     retry_count: int = 3
+    link_protocol: str = "spacewire"
+    data_rate: float = 200e6
+    propagation_delay: float = 5e-8
+    rx_buffer: int = 56
+    switching: str = "store_and_forward"
+    links: List[Dict[str, Any]] = field(default_factory=list)
 
 
 @dataclass
@@ -27,6 +36,9 @@ class SimulationConfig:
     latency_variance: float = 0.0001
     packet_delay: float = 0.5
     topology: str = "point-to-point"
+    bit_error_rate: float = 0.0
+    burst_rate: float = 0.0
+    burst_length: float = 8.0
 
 
 @dataclass
@@ -41,6 +53,7 @@ class QoSConfig:
         2: 0.2,  # Normal
         3: 0.1,  # Low
     })
+    queue_limit: int = 64
 
 
 @dataclass
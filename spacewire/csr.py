@@ -0,0 +1,589 @@
+"""Compressed-sparse-row adjacency for large topologies."""
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+BFS_BLOCK_SIZE = 256
+"""Sources expanded together by the multi-source BFS."""
+
+
+class CSRAdjacency:
+    """
+    Directed adjacency stored as compressed-sparse-row NumPy arrays.
+
+    Nodes are addressed by a dense index ``0..num_nodes-1``; ``node_ids``
+    maps an index back to the topology's node id. The out-neighbors of
+    index ``i`` are ``indices[indptr[i]:indptr[i + 1]]``. Edge attributes
+    such as weights are arrays aligned with ``indices``; the optional
+    ``weights`` array is the graph's own link costs and is used by the
+    weighted searches whenever no other weights are passed.
+
+    The arrays are treated as read-only once built, so one instance can be
+    shared by any number of routing queries.
+    """
+
+    __slots__ = ("node_ids", "indptr", "indices", "weights", "_index_of", "_lists", "_costs")
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+    ):
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+        if len(self.indptr) != len(self.node_ids) + 1:
+            raise ValueError("indptr must have one entry more than node_ids")
+        if self.weights is not None and self.weights.shape != self.indices.shape:
+            raise ValueError("weights must be aligned with indices")
+        self._index_of: Optional[Dict[int, int]] = None
+        self._lists: Optional[Tuple[List[int], List[int]]] = None
+        self._costs: Optional[List[float]] = None
+
+    @classmethod
+    def from_edges(
+        cls,
+        src_ids: Iterable[int],
+        dst_ids: Iterable[int],
+        node_ids: Optional[Iterable[int]] = None,
+        weights: Optional[Iterable[float]] = None,
+    ) -> "CSRAdjacency":
+        """
+        Build from parallel arrays of directed edges.
+
+        Node ids default to every id that appears in an edge; pass
+        ``node_ids`` to include isolated nodes. Within each node the
+        neighbor order of the input is preserved. ``weights``, if given,
+        holds one cost per edge in the same order.
+        """
+        src = np.asarray(src_ids if isinstance(src_ids, np.ndarray) else list(src_ids), np.int64)
+        dst = np.asarray(dst_ids if isinstance(dst_ids, np.ndarray) else list(dst_ids), np.int64)
+        if src.shape != dst.shape:
+            raise ValueError("src_ids and dst_ids must have the same length")
+        ids = np.concatenate([src, dst])
+        if node_ids is not None:
+            ids = np.concatenate([ids, np.fromiter(node_ids, dtype=np.int64)])
+        ids = np.unique(ids)
+
+        src_index = np.searchsorted(ids, src)
+        dst_index = np.searchsorted(ids, dst)
+        order = np.argsort(src_index, kind="stable")
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src_index, minlength=len(ids)), out=indptr[1:])
+        if weights is not None:
+            weights = np.asarray(
+                weights if isinstance(weights, np.ndarray) else list(weights), np.float64
+            )[order]
+        return cls(ids, indptr, dst_index[order], weights)
+
+    @classmethod
+    def from_dict(
+        cls,
+        edges: Mapping[int, Iterable[int]],
+        node_ids: Optional[Iterable[int]] = None,
+        weights: Optional[Dict[Tuple[int, int], float]] = None,
+    ) -> "CSRAdjacency":
+        """
+        Build from the ``Dict[int, List[int]]`` form used by Topology.
+
+        ``weights`` maps ``(src, dst)`` to a link cost; links without an
+        entry cost 1.
+        """
+        src: List[int] = []
+        dst: List[int] = []
+        for node_id, neighbors in edges.items():
+            before = len(dst)
+            dst.extend(neighbors)
+            src.extend([node_id] * (len(dst) - before))
+        ids = set(edges)
+        if node_ids is not None:
+            ids.update(node_ids)
+        costs = [weights.get(edge, 1.0) for edge in zip(src, dst)] if weights else None
+        return cls.from_edges(src, dst, ids, costs)
+
+    def weight_dict(self) -> Dict[Tuple[int, int], float]:
+        """Stored link costs as a ``{(src_id, dst_id): weight}`` dict."""
+        if self.weights is None:
+            return {}
+        sources = self.node_ids[self.edge_sources()].tolist()
+        targets = self.node_ids[self.indices].tolist()
+        return dict(zip(zip(sources, targets), self.weights.tolist()))
+
+    def to_dict(self) -> Dict[int, List[int]]:
+        """Convert back to the ``Dict[int, List[int]]`` form."""
+        ids = self.node_ids.tolist()
+        targets = self.node_ids[self.indices].tolist()
+        bounds = self.indptr.tolist()
+        return {ids[i]: targets[bounds[i] : bounds[i + 1]] for i in range(len(ids))}
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def degree(self) -> np.ndarray:
+        """Out-degree of every node."""
+        return np.diff(self.indptr)
+
+    def index(self, node_id: int) -> Optional[int]:
+        """Dense index of ``node_id``, or None if it is not in the graph."""
+        if self._index_of is None:
+            self._index_of = {node_id: i for i, node_id in enumerate(self.node_ids.tolist())}
+        return self._index_of.get(node_id)
+
+    def neighbors(self, index: int) -> np.ndarray:
+        """Out-neighbor indices of node ``index``."""
+        return self.indices[self.indptr[index] : self.indptr[index + 1]]
+
+    def edge_sources(self) -> np.ndarray:
+        """Source index of every edge, aligned with ``indices``."""
+        return np.repeat(np.arange(self.num_nodes), self.degree())
+
+    def edge_weights(
+        self, weights: Dict[Tuple[int, int], float], default: float = 1.0
+    ) -> np.ndarray:
+        """Edge-aligned weight array from a ``{(src_id, dst_id): weight}`` dict."""
+        out = np.full(self.num_edges, default, dtype=np.float64)
+        if not weights:
+            return out
+        sources = self.node_ids[self.edge_sources()].tolist()
+        targets = self.node_ids[self.indices].tolist()
+        for k, edge in enumerate(zip(sources, targets)):
+            weight = weights.get(edge)
+            if weight is not None:
+                out[k] = weight
+        return out
+
+    def _adjacency_lists(self) -> Tuple[List[int], List[int]]:
+        """``indptr``/``indices`` as Python lists for scalar-heavy loops."""
+        if self._lists is None:
+            self._lists = (self.indptr.tolist(), self.indices.tolist())
+        return self._lists
+
+    def _cost_list(self, weights: Optional[np.ndarray]) -> List[float]:
+        """Edge costs as a list: ``weights``, else the stored weights, else 1."""
+        if weights is not None:
+            costs: List[float] = np.asarray(weights, np.float64).tolist()
+            return costs
+        if self._costs is None:
+            self._costs = [1.0] * self.num_edges if self.weights is None else self.weights.tolist()
+        return self._costs
+
+    def expand(self, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All edges leaving ``frontier``.
+
+        Returns ``(owner, neighbors)`` where ``owner[k]`` is the position in
+        ``frontier`` of the edge's source and ``neighbors[k]`` its target.
+        """
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        owner = np.repeat(np.arange(len(frontier)), counts)
+        offsets = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return owner, self.indices[starts[owner] + offsets]
+
+    def bfs(self, source: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Level-synchronous BFS from index ``source``.
+
+        Returns ``(distance, parent)`` arrays; unreachable nodes have
+        distance -1 and parent -1, and the source is its own parent.
+        """
+        distance = np.full(self.num_nodes, -1, dtype=np.int64)
+        parent = np.full(self.num_nodes, -1, dtype=np.int64)
+        distance[source] = 0
+        parent[source] = source
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        while len(frontier):
+            level += 1
+            owner, neighbors = self.expand(frontier)
+            fresh = distance[neighbors] < 0
+            owner, neighbors = owner[fresh], neighbors[fresh]
+            # Several frontier nodes may reach the same neighbor; any one is a valid parent.
+            parent[neighbors] = frontier[owner]
+            frontier = np.unique(neighbors)
+            distance[frontier] = level
+        return distance, parent
+
+    def first_hops(self, sources: np.ndarray) -> np.ndarray:
+        """First-hop rows for several sources; see ``multi_source_bfs``."""
+        return self.multi_source_bfs(sources)[0]
+
+    def multi_source_bfs(self, sources: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        BFS from several sources at once, recording first hops and hop counts.
+
+        The frontier is a flat array of ``source_row * num_nodes + node``
+        entries, so every level costs a fixed number of NumPy calls for the
+        whole block of sources. Each reached node inherits the first hop of
+        the node it was reached from. Returns a ``(len(sources), num_nodes)``
+        array of first-hop indices, -1 where unreachable and the source
+        itself on the diagonal, and a matching int32 array of hop counts
+        (-1 where unreachable).
+        """
+        n = self.num_nodes
+        rows = len(sources)
+        hops = np.full(rows * n, -1, dtype=np.int32)
+        distance = np.full(rows * n, -1, dtype=np.int32)
+        marker = np.empty(rows * n, dtype=np.int32)
+        frontier = np.arange(rows, dtype=np.int64) * n + sources
+        hops[frontier] = sources
+        distance[frontier] = 0
+        frontier_hops: Optional[np.ndarray] = None
+        level = 0
+
+        while len(frontier):
+            level += 1
+            row, node = np.divmod(frontier, n)
+            owner, neighbors = self.expand(node)
+            candidates = row[owner] * n + neighbors
+            first = neighbors if frontier_hops is None else frontier_hops[owner]
+
+            fresh = hops[candidates] < 0
+            candidates, first = candidates[fresh], first[fresh]
+            # Keep one entry per newly reached node (last writer wins).
+            order = np.arange(len(candidates), dtype=np.int32)
+            marker[candidates] = order
+            unique = marker[candidates] == order
+            frontier, frontier_hops = candidates[unique], first[unique]
+            hops[frontier] = frontier_hops
+            distance[frontier] = level
+
+        return hops.reshape(rows, n), distance.reshape(rows, n)
+
+    def dijkstra(
+        self,
+        source: int,
+        weights: Optional[np.ndarray] = None,
+        target: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Dijkstra from index ``source`` with edge-aligned ``weights``.
+
+        The stored ``weights`` (or unit weights) are used when ``weights``
+        is None. Distances, parents and costs live in flat lists indexed by
+        node and edge position, so a relaxation is two list reads rather
+        than a dict lookup. The search stops early once ``target`` is
+        settled. Returns ``(distance, parent)`` arrays with ``inf``/-1 for
+        nodes not reached.
+        """
+        indptr, indices = self._adjacency_lists()
+        cost = self._cost_list(weights)
+        inf = float("inf")
+        dist = [inf] * self.num_nodes
+        prev = [-1] * self.num_nodes
+        dist[source] = 0.0
+        prev[source] = source
+        heap = [(0.0, source)]
+
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            if node == target:
+                break
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[k]
+                candidate = d + cost[k]
+                if candidate < dist[neighbor]:
+                    dist[neighbor] = candidate
+                    prev[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+
+        return np.array(dist), np.array(prev, dtype=np.int64)
+
+    def shortest_path_rows(
+        self, sources: np.ndarray, weights: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distance and next-hop rows for each source index.
+
+        Uses a blocked multi-source BFS for unit weights and Dijkstra per
+        source otherwise (``weights``, else the stored weights). Returns float64 distances (``inf`` when
+        unreachable) and int32 next-hop indices (-1 when unreachable, the
+        source itself on the diagonal).
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        n = self.num_nodes
+        distance = np.empty((len(sources), n), dtype=np.float64)
+        next_hop = np.empty((len(sources), n), dtype=np.int32)
+        if weights is None and self.weights is None:
+            for start in range(0, len(sources), BFS_BLOCK_SIZE):
+                block = slice(start, start + BFS_BLOCK_SIZE)
+                next_hop[block], hops = self.multi_source_bfs(sources[block])
+                distance[block] = np.where(hops >= 0, hops, np.inf)
+            return distance, next_hop
+
+        for row, source in enumerate(sources.tolist()):
+            distance[row], parent = self.dijkstra(source, weights)
+            next_hop[row] = _first_hops_from_parents(parent, source)
+        return distance, next_hop
+
+    def all_pairs(
+        self, weights: Optional[np.ndarray] = None, workers: Optional[int] = None
+    ) -> "AllPairsPaths":
+        """
+        Shortest paths between every pair of nodes.
+
+        Source nodes are split into shards and solved in a process pool of
+        ``workers`` processes (default: CPU count). Each worker receives the
+        CSR arrays once, through the pool initializer, and only reads them;
+        with the default fork start method they are not even copied. Pass
+        ``workers=1`` to solve in the calling process.
+        """
+        n = self.num_nodes
+        workers = workers or os.cpu_count() or 1
+        if weights is None:
+            weights = self.weights
+        distance = np.empty((n, n), dtype=np.float64)
+        next_hop = np.empty((n, n), dtype=np.int32)
+
+        if workers <= 1 or n < 2 * workers:
+            distance[:], next_hop[:] = self.shortest_path_rows(np.arange(n), weights)
+            return AllPairsPaths(self.node_ids, distance, next_hop)
+
+        shards = np.array_split(np.arange(n), min(n, workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.node_ids, self.indptr, self.indices, weights),
+        ) as pool:
+            for sources, dist_rows, hop_rows in pool.map(_solve_shard, shards):
+                distance[sources] = dist_rows
+                next_hop[sources] = hop_rows
+
+        return AllPairsPaths(self.node_ids, distance, next_hop)
+
+    def heuristic_scale(self, coords: np.ndarray, weights: Optional[np.ndarray] = None) -> float:
+        """
+        Largest factor that keeps a straight-line A* heuristic admissible.
+
+        It is the smallest ratio of link cost to link length, so
+        ``scale * distance(a, b)`` never exceeds the cost of any route from
+        ``a`` to ``b``. Links between coincident nodes or with unknown
+        coordinates do not constrain it.
+        """
+        cost = np.asarray(self._cost_list(weights))
+        src, dst = coords[self.edge_sources()], coords[self.indices]
+        length = np.hypot(src[:, 0] - dst[:, 0], src[:, 1] - dst[:, 1])
+        usable = length > 0
+        if not usable.any():
+            return 0.0
+        return float(np.min(cost[usable] / length[usable]))
+
+    def astar(
+        self,
+        source: int,
+        target: int,
+        coords: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        scale: Optional[float] = None,
+    ) -> Tuple[float, np.ndarray]:
+        """
+        A* from index ``source`` to ``target`` guided by node coordinates.
+
+        ``coords`` is a ``(num_nodes, 2)`` array of x/y positions (NaN where
+        unknown, which gives those nodes a zero heuristic). The heuristic is
+        ``scale`` times the straight-line distance to the target; ``scale``
+        defaults to ``heuristic_scale`` so the result is always a shortest
+        path. Returns the path cost (``inf`` if unreachable) and the parent
+        array of the nodes explored.
+        """
+        indptr, indices = self._adjacency_lists()
+        cost = self._cost_list(weights)
+        if scale is None:
+            scale = self.heuristic_scale(coords, weights)
+        dx = coords[:, 0] - coords[target, 0]
+        dy = coords[:, 1] - coords[target, 1]
+        estimate = np.nan_to_num(np.hypot(dx, dy) * scale, nan=0.0).tolist()
+
+        inf = float("inf")
+        dist = [inf] * self.num_nodes
+        prev = [-1] * self.num_nodes
+        dist[source] = 0.0
+        prev[source] = source
+        heap = [(estimate[source], 0.0, source)]
+
+        while heap:
+            _, d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            if node == target:
+                break
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[k]
+                candidate = d + cost[k]
+                if candidate < dist[neighbor]:
+                    dist[neighbor] = candidate
+                    prev[neighbor] = node
+                    heapq.heappush(heap, (candidate + estimate[neighbor], candidate, neighbor))
+
+        return dist[target], np.array(prev, dtype=np.int64)
+
+    def astar_path(
+        self,
+        src_id: int,
+        dst_id: int,
+        coords: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        scale: Optional[float] = None,
+    ) -> Optional[List[int]]:
+        """A* shortest path between two node ids."""
+        src, dst = self.index(src_id), self.index(dst_id)
+        if src is None or dst is None:
+            return None
+        _, parent = self.astar(src, dst, coords, weights, scale)
+        return self.path_from_parents(parent, dst)
+
+    def path_from_parents(self, parent: np.ndarray, target: int) -> Optional[List[int]]:
+        """Node ids on the path to index ``target`` recorded in ``parent``."""
+        if parent[target] < 0:
+            return None
+        path = [target]
+        while parent[path[-1]] != path[-1]:
+            path.append(int(parent[path[-1]]))
+        path.reverse()
+        path_ids: List[int] = self.node_ids[path].tolist()
+        return path_ids
+
+    def bfs_path(self, src_id: int, dst_id: int) -> Optional[List[int]]:
+        """Hop-count shortest path between two node ids."""
+        src, dst = self.index(src_id), self.index(dst_id)
+        if src is None or dst is None:
+            return None
+        _, parent = self.bfs(src)
+        return self.path_from_parents(parent, dst)
+
+    def dijkstra_path(
+        self, src_id: int, dst_id: int, weights: Optional[np.ndarray] = None
+    ) -> Optional[List[int]]:
+        """Weighted shortest path between two node ids."""
+        src, dst = self.index(src_id), self.index(dst_id)
+        if src is None or dst is None:
+            return None
+        _, parent = self.dijkstra(src, weights, target=dst)
+        return self.path_from_parents(parent, dst)
+
+    def undirected(self) -> "CSRAdjacency":
+        """The same nodes with every edge also present in reverse."""
+        sources = self.edge_sources()
+        src = np.concatenate([sources, self.indices])
+        dst = np.concatenate([self.indices, sources])
+        order = np.argsort(src, kind="stable")
+        indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=self.num_nodes), out=indptr[1:])
+        return CSRAdjacency(self.node_ids, indptr, dst[order])
+
+    def is_connected(self) -> bool:
+        """
+        True if the graph is weakly connected.
+
+        Link direction is ignored, as in Topology.is_connected.
+        """
+        if not self.num_nodes:
+            return True
+        distance, _ = self.undirected().bfs(0)
+        return bool((distance >= 0).all())
+
+    def validate(self) -> Tuple[bool, List[str]]:
+        """Check the arrays are well formed and the graph is connected."""
+        errors: List[str] = []
+
+        if not self.num_nodes:
+            errors.append("Topology has no nodes")
+        if (
+            self.indptr[0] != 0
+            or self.indptr[-1] != self.num_edges
+            or (np.diff(self.indptr) < 0).any()
+        ):
+            errors.append("Malformed indptr array")
+            return False, errors
+        if self.num_edges and (self.indices.min() < 0 or self.indices.max() >= self.num_nodes):
+            errors.append("Edge target index out of range")
+            return False, errors
+        if not self.is_connected():
+            errors.append("Topology is not fully connected")
+
+        return len(errors) == 0, errors
+
+
+@dataclass
+class AllPairsPaths:
+    """
+    All-pairs shortest-path result.
+
+    ``distance[i, j]`` is the cost from ``node_ids[i]`` to ``node_ids[j]``
+    (``inf`` if unreachable) and ``next_hop[i, j]`` the index of the first
+    node after ``i`` on that path (-1 if unreachable).
+    """
+
+    node_ids: np.ndarray
+    distance: np.ndarray
+    next_hop: np.ndarray
+
+    def __post_init__(self) -> None:
+        self._index_of = {node_id: i for i, node_id in enumerate(self.node_ids.tolist())}
+
+    def index(self, node_id: int) -> Optional[int]:
+        return self._index_of.get(node_id)
+
+    def path(self, src_id: int, dst_id: int) -> Optional[List[int]]:
+        """Node ids on the shortest path from ``src_id`` to ``dst_id``."""
+        src, dst = self.index(src_id), self.index(dst_id)
+        if src is None or dst is None or self.next_hop[src, dst] < 0:
+            return None
+        path = [src]
+        while path[-1] != dst:
+            path.append(int(self.next_hop[path[-1], dst]))
+        path_ids: List[int] = self.node_ids[path].tolist()
+        return path_ids
+
+
+def _first_hops_from_parents(parent: np.ndarray, source: int) -> np.ndarray:
+    """
+    Turn a shortest-path tree's parent array into first hops from its root.
+
+    Children of the root point to themselves; every other reached node
+    starts at its parent and jumps to its pointer's pointer until nothing
+    changes, which takes O(log depth) vectorized rounds.
+    """
+    n = len(parent)
+    reached = parent >= 0
+    hop = np.where(parent == source, np.arange(n), parent)
+    hop[source] = source
+    hop[~reached] = -1
+    safe = np.where(reached, hop, 0)
+    while True:
+        jumped = np.where(reached, hop[safe], -1)
+        if np.array_equal(jumped, hop):
+            return hop
+        hop = jumped
+        safe = np.where(reached, hop, 0)
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    node_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray, weights: Optional[np.ndarray]
+) -> None:
+    """Pool initializer: keep the read-only graph for every shard this process solves."""
+    _worker_state["csr"] = CSRAdjacency(node_ids, indptr, indices)
+    _worker_state["weights"] = weights
+
+
+def _solve_shard(sources: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    distance, next_hop = _worker_state["csr"].shortest_path_rows(sources, _worker_state["weights"])
+    return sources, distance, next_hop
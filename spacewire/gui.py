@@ -9,11 +9,13 @@ from typing import Optional, Dict, List, Any
 from collections import deque
 
 from spacewire.topology import (
-    TopologyBuilder, TopologyType, Topology, 
+    TopologyBuilder, TopologyType, Topology, PathSelector,
     get_topology, format_node_id
 )
-from spacewire.packet import SpaceWirePacket, SpaceFibrePacket, PacketPriority
+from spacewire.packet import SpaceWirePacket, SpaceFibrePacket, PacketFactory, PacketPriority
 from spacewire.metrics import MetricsCollector, QoSMetrics
+from spacewire.channel import BitErrorChannel
+from spacewire.simulator import LinkSimulator
 from spacewire.config import Config, get_config
 from spacewire.logging_config import setup_logging, get_logger
 
@@ -47,6 +49,9 @@ NODE_IMAGES = {
     0x05: "🛰️",  # AOCS
 }
 
+SIMULATION_STEP = 100
+"""Packets simulated between GUI updates."""
+
 
 class NetworkCanvas(tk.Canvas):
     """Custom canvas for network topology visualization."""
@@ -176,6 +181,8 @@ class SpaceWireGUI:
         self.simulation_running = False
         self.simulation_thread: Optional[threading.Thread] = None
         self.current_topology: Optional[Topology] = None
+        self.path_selector: Optional[PathSelector] = None
+        self.simulator: Optional[LinkSimulator] = None
         self.log_messages = deque(maxlen=1000)
 
         self._setup_styles()
@@ -441,6 +448,12 @@ class SpaceWireGUI:
             self.current_topology = builders[topo_name](devices)
 
         if self.current_topology:
+            self.path_selector = PathSelector(self.current_topology, mode=PathSelector.ROUND_ROBIN)
+            self.simulator = LinkSimulator.from_network_config(
+                self.current_topology, self.config.network, self.config.qos,
+                metrics=self.metrics, qos_metrics=self.qos_metrics,
+                path_selector=self.path_selector,
+            )
             self.canvas.draw_topology(self.current_topology, 700, 400)
 
     def _start_simulation(self) -> None:
@@ -470,37 +483,74 @@ class SpaceWireGUI:
         self.progress.pack_forget()
 
     def _simulation_worker(self) -> None:
-        """Background simulation worker."""
+        """
+        Background simulation worker.
+
+        Packets are injected ``packet_delay`` simulated seconds apart and
+        the event simulator is run in steps of SIMULATION_STEP packets, so
+        metrics are in simulated time and no wall-clock time is spent
+        waiting between packets.
+        """
         src = int(self.src_var.get(), 16)
         dst = int(self.dst_var.get(), 16)
         error_rate = float(self.error_rate_var.get()) / 100
         protocol = self.protocol_var.get()
+        channel = self._make_channel()
+        simulator = self.simulator
+        interval = self.config.simulation.packet_delay
 
-        while self.simulation_running:
-            packet_data = bytes([random.randint(0, 255) for _ in range(100)])
-
-            if protocol == "SpaceWire":
-                packet = SpaceWirePacket(src=src, dst=dst, data=packet_data)
-            else:
-                packet = SpaceFibrePacket(src=src, dst=dst, data=packet_data)
-
-            self.metrics.record_sent(len(packet.data))
-
-            has_error = packet.simulate_error(error_rate)
-            if has_error:
-                self.metrics.record_error()
+        if simulator is None:
+            self.root.after(0, self._stop_simulation)
+            return
+        known = simulator.routing.index_of
+        if src not in known or dst not in known:
+            self.root.after(
+                0, self._log_message, f"Nodes 0x{src:02X}/0x{dst:02X} are not in this topology"
+            )
+            self.root.after(0, self._stop_simulation)
+            return
 
-            latency = random.uniform(0.001, 0.01)
-            self.metrics.record_received(latency, len(packet.data))
+        send_time = simulator.now
+        while self.simulation_running:
+            for _ in range(SIMULATION_STEP):
+                packet_data = bytes([random.randint(0, 255) for _ in range(100)])
+
+                if protocol == "SpaceWire":
+                    packet = SpaceWirePacket(src=src, dst=dst, data=packet_data)
+                else:
+                    packet = SpaceFibrePacket(src=src, dst=dst, data=packet_data)
+
+                if channel is not None:
+                    has_error = channel.transmit_packet(packet) and not packet.verify()
+                else:
+                    has_error = packet.simulate_error(error_rate)
+                if has_error:
+                    self.metrics.record_error()
+
+                last = simulator.inject_packet(packet, at=send_time)
+                send_time += interval
+
+            simulator.run(until=send_time)
+            self.root.after(
+                0, self._log_message,
+                f"Simulated {SIMULATION_STEP} {protocol} packets, t = {simulator.now:.1f} s",
+            )
 
-            self._log_message(f"Sent {protocol} packet: {packet}")
+            path = simulator.route(last)
+            if path:
+                self.root.after(0, lambda p=path: self.canvas.animate_packet(p))
 
-            if self.current_topology:
-                path = self.current_topology.bfs_path(src, dst)
-                if path:
-                    self.root.after(0, lambda p=path: self.canvas.animate_packet(p))
+            # Only to let the Tk thread take the GIL; simulated time does not depend on it.
+            time.sleep(0.05)
 
-            time.sleep(0.5)
+    def _make_channel(self) -> Optional[BitErrorChannel]:
+        """Build a bit-error channel from the simulation config, if enabled."""
+        sim = self.config.simulation
+        if not sim.bit_error_rate and not sim.burst_rate:
+            return None
+        return BitErrorChannel(
+            ber=sim.bit_error_rate, burst_rate=sim.burst_rate, burst_length=sim.burst_length
+        )
 
     def _update_metrics_display(self) -> None:
         """Update metrics display."""
@@ -576,6 +626,65 @@ class SpaceWireGUI:
         filepath = filedialog.askopenfilename(title="Select File")
         if filepath:
             self._log_message(f"Selected file: {filepath}")
+            threading.Thread(
+                target=self._file_transfer_worker, args=(filepath,), daemon=True
+            ).start()
+
+    def _file_transfer_worker(self, filepath: str) -> None:
+        """
+        Stream a file through the packetizer and the link simulator.
+
+        Packets cross the current topology, or a point-to-point link if none
+        has been built, so sends, deliveries and latencies are recorded in
+        simulated time as for the simulation tab.
+        """
+        src = int(self.src_var.get(), 16)
+        dst = int(self.dst_var.get(), 16)
+        error_rate = float(self.error_rate_var.get()) / 100
+        protocol = self.protocol_var.get().lower()
+
+        if self.simulation_running:
+            self.root.after(
+                0, self._log_message, "Stop the simulation before transferring a file"
+            )
+            return
+        simulator = self.simulator
+        if simulator is None:
+            simulator = LinkSimulator.from_network_config(
+                TopologyBuilder.point_to_point(src, dst), self.config.network, self.config.qos,
+                metrics=self.metrics, qos_metrics=self.qos_metrics,
+            )
+        elif src not in simulator.routing.index_of or dst not in simulator.routing.index_of:
+            self.root.after(
+                0, self._log_message, f"Nodes 0x{src:02X}/0x{dst:02X} are not in this topology"
+            )
+            return
+
+        packets = errors = 0
+        blocks = PacketFactory.iter_file_batches(
+            filepath, self.config.network.chunk_size, protocol, src=src, dst=dst, batch_size=1024
+        )
+        channel = self._make_channel()
+        for batch in blocks:
+            if channel is not None:
+                corrupted = channel.transmit(batch).detected
+            else:
+                corrupted = batch.inject_errors(error_rate)
+            batch_errors = int(corrupted.sum())
+            for _ in range(batch_errors):
+                self.metrics.record_error()
+            count = len(batch)
+            simulator.inject_many(
+                [src] * count, [dst] * count, batch.lengths, [simulator.now] * count, batch.priority
+            )
+            simulator.run()
+            packets += count
+            errors += batch_errors
+
+        self.root.after(
+            0, self._log_message,
+            f"Transferred {filepath}: {packets} {self.protocol_var.get()} packets, {errors} errors",
+        )
 
     def _show_about(self) -> None:
         """Show about dialog."""
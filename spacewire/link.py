@@ -0,0 +1,384 @@
+"""Link-layer model: data rate, propagation delay and credit-based flow control."""
+
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from spacewire.config import NetworkConfig, QoSConfig
+from spacewire.packet import PacketView
+
+SPACEWIRE = "spacewire"
+SPACEFIBRE = "spacefibre"
+
+SPACEWIRE_DATA_BITS = 10
+"""Bits per SpaceWire data character (8 data, parity, data/control flag)."""
+
+SPACEWIRE_EOP_BITS = 4
+"""Bits per SpaceWire EOP/EEP control character."""
+
+FCT_CHARACTERS = 8
+"""Receive-buffer space, in N-chars, announced by one SpaceWire FCT."""
+
+SPACEFIBRE_FRAME_BYTES = 256
+"""Maximum data bytes in one SpaceFibre data frame."""
+
+SPACEFIBRE_FRAME_OVERHEAD = 8
+"""SDF and EDF control words wrapped around each data frame."""
+
+SPACEFIBRE_CREDIT_BYTES = 256
+"""Virtual-channel buffer space, in bytes, announced by one SpaceFibre FCC."""
+
+SPACEFIBRE_HEADER_BYTES = 8
+"""Start-of-frame word plus the first data word, which carries the address."""
+
+CRITICAL_PRIORITY = 0
+"""Priority class whose virtual channels are served ahead of all others."""
+
+
+@dataclass
+class LinkParameters:
+    """
+    Physical and flow-control settings of one directed link.
+
+    ``rx_buffer`` is the receiver's input buffer per virtual channel, in
+    bytes (SpaceWire N-chars). SpaceWire links have one channel and
+    return credit in FCTs of 8 characters; SpaceFibre links have
+    ``virtual_channels`` channels with credit in 256-byte units.
+
+    The channels are split evenly between ``num_priorities`` priority
+    classes, and ``bandwidth_allocation`` (share per class, equal shares
+    if None) is divided evenly among a class's channels. ``quantum`` is
+    the bytes per round of the channel with the smallest share, and
+    ``queue_limit`` bounds each channel's queue in packets (0: no bound).
+    """
+
+    protocol: str = SPACEWIRE
+    data_rate: float = 200e6
+    propagation_delay: float = 5e-8
+    rx_buffer: int = 56
+    virtual_channels: int = 1
+    num_priorities: int = 4
+    bandwidth_allocation: Optional[Dict[int, float]] = None
+    quantum: int = 2048
+    queue_limit: int = 0
+
+    def __post_init__(self) -> None:
+        if self.protocol not in (SPACEWIRE, SPACEFIBRE):
+            raise ValueError(f"Unknown link protocol: {self.protocol}")
+        if self.data_rate <= 0 or self.propagation_delay < 0:
+            raise ValueError("data_rate must be positive and propagation_delay non-negative")
+        if self.rx_buffer < self.credit_unit:
+            raise ValueError(f"rx_buffer must hold at least one credit ({self.credit_unit} bytes)")
+        if self.quantum <= 0 or self.queue_limit < 0 or self.num_priorities <= 0:
+            raise ValueError(
+                "quantum and num_priorities must be positive, queue_limit non-negative"
+            )
+        if self.protocol == SPACEWIRE:
+            self.virtual_channels = 1
+
+    @classmethod
+    def from_config(
+        cls, network: NetworkConfig, qos: Optional[QoSConfig] = None
+    ) -> "LinkParameters":
+        """Default link settings from the network (and, for SpaceFibre, QoS) config."""
+        params = cls(
+            protocol=network.link_protocol,
+            data_rate=network.data_rate,
+            propagation_delay=network.propagation_delay,
+            rx_buffer=network.rx_buffer,
+        )
+        if qos is None or not qos.enabled:
+            return params
+        return params.override(
+            virtual_channels=qos.virtual_channels if network.link_protocol == SPACEFIBRE else 1,
+            num_priorities=qos.num_priorities,
+            bandwidth_allocation={int(k): v for k, v in qos.bandwidth_allocation.items()},
+            queue_limit=qos.queue_limit,
+        )
+
+    def override(self, **changes: Any) -> "LinkParameters":
+        """Copy with some settings replaced, e.g. from a per-link config entry."""
+        return replace(self, **changes)
+
+    def vc_of_priority(self, priority: int) -> int:
+        """First virtual channel of a priority class."""
+        return priority * self.virtual_channels // self.num_priorities
+
+    def priority_of_vc(self, vc: int) -> int:
+        """Highest priority class (lowest value) served by a virtual channel."""
+        return vc * self.num_priorities // self.virtual_channels
+
+    def vc_shares(self) -> List[Tuple[float, bool]]:
+        """``(bandwidth share, strict priority)`` of each virtual channel."""
+        channels = self.virtual_channels
+        allocation = self.bandwidth_allocation
+        shares = [0.0] * channels
+        strict = [False] * channels
+        for priority in range(self.num_priorities):
+            first = self.vc_of_priority(priority)
+            last = max(self.vc_of_priority(priority + 1), first + 1)
+            share = (
+                1.0 / self.num_priorities if allocation is None else allocation.get(priority, 0.0)
+            )
+            for vc in range(first, last):
+                shares[vc] += share / (last - first)
+                strict[vc] |= priority == CRITICAL_PRIORITY
+        return list(zip(shares, strict))
+
+    @property
+    def credit_unit(self) -> int:
+        return FCT_CHARACTERS if self.protocol == SPACEWIRE else SPACEFIBRE_CREDIT_BYTES
+
+    def frame_bytes(self, size: int) -> int:
+        """Bytes a packet with ``size`` payload bytes occupies in a buffer."""
+        return size + PacketView.HEADER_SIZES[self.protocol] + PacketView.CRC_SIZES[self.protocol]
+
+    def wire_bits(self, size: int) -> int:
+        """Line bits needed to send a packet, including encoding and framing."""
+        frame = self.frame_bytes(size)
+        if self.protocol == SPACEWIRE:
+            return SPACEWIRE_DATA_BITS * frame + SPACEWIRE_EOP_BITS
+        frames = -(-frame // SPACEFIBRE_FRAME_BYTES)
+        # 8B/10B: ten line bits per byte.
+        return 10 * (frame + SPACEFIBRE_FRAME_OVERHEAD * frames)
+
+    def serialization_delay(self, size: int) -> float:
+        """Seconds to clock a packet onto the line."""
+        return self.wire_bits(size) / self.data_rate
+
+    def header_delay(self) -> float:
+        """
+        Seconds until a router has the routing address of a packet.
+
+        A wormhole router can choose the output port once the leading
+        address character (SpaceWire) or first data word (SpaceFibre) is in.
+        """
+        if self.protocol == SPACEWIRE:
+            return SPACEWIRE_DATA_BITS / self.data_rate
+        return 10 * SPACEFIBRE_HEADER_BYTES / self.data_rate
+
+    def credit_cost(self, size: int) -> int:
+        """
+        Receive-buffer credit a packet holds until it leaves the receiver.
+
+        The frame (plus EOP on SpaceWire) is rounded up to whole credits;
+        a packet larger than the buffer needs the whole buffer, so it can
+        only start once the receiver has drained.
+        """
+        unit = self.credit_unit
+        chars = self.frame_bytes(size) + (1 if self.protocol == SPACEWIRE else 0)
+        return min(self.rx_buffer, -(-chars // unit) * unit)
+
+
+class Link:
+    """
+    Runtime state of one directed link.
+
+    Packets wait in a FIFO per virtual channel. The transmitter sends one
+    packet at a time and only when the receiver has announced enough
+    credit on the packet's channel; otherwise it stalls, which is how
+    back-pressure propagates upstream. Credit comes back once the packet
+    has left the receiver's buffer, one propagation delay later.
+
+    Channels of the CRITICAL class are served first, in index order. The
+    rest share the link by deficit round robin: ``active`` lists the
+    non-empty channels in service order, and a channel sends while its
+    deficit covers its head packet; otherwise it earns its quantum,
+    proportional to its bandwidth share, and goes to the back. A
+    channel without credit is passed over and keeps its deficit. Each
+    choice is O(1) as long as the quantum covers the largest packet.
+    A packet arriving to a full queue (``queue_limit``) is refused.
+
+    Under wormhole switching the link is instead held by one packet
+    (``holder``) from ``reserve`` to ``release``, and the queues hold the
+    packets whose headers wait for it.
+    """
+
+    __slots__ = (
+        "index",
+        "src",
+        "dst",
+        "params",
+        "credits",
+        "queues",
+        "queued",
+        "busy",
+        "packets_sent",
+        "bytes_sent",
+        "busy_time",
+        "stall_time",
+        "_stalled_since",
+        "holder",
+        "hol_time",
+        "_reserved_at",
+        "strict",
+        "quantum",
+        "deficit",
+        "active",
+        "dropped",
+    )
+
+    def __init__(self, index: int, src: int, dst: int, params: LinkParameters):
+        self.index = index
+        self.src = src
+        self.dst = dst
+        self.params = params
+        self.credits: List[int] = [params.rx_buffer] * params.virtual_channels
+        self.queues: List[Deque[Tuple[int, int, int]]] = [
+            deque() for _ in range(params.virtual_channels)
+        ]
+        self.queued = 0
+        self.busy = False
+        self.packets_sent = 0
+        self.bytes_sent = 0
+        self.busy_time = 0.0
+        self.stall_time = 0.0
+        self._stalled_since: Optional[float] = None
+        self.holder = -1
+        self.hol_time = 0.0
+        self._reserved_at = 0.0
+
+        shares = params.vc_shares()
+        smallest = min((share for share, strict in shares if share > 0 and not strict), default=1.0)
+        self.strict = [vc for vc, (_, strict) in enumerate(shares) if strict]
+        self.quantum = [
+            0 if strict else int(params.quantum * max(share, smallest) / smallest)
+            for share, strict in shares
+        ]
+        self.deficit = [0] * params.virtual_channels
+        self.active: Deque[int] = deque()
+        self.dropped = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"Link({self.src}->{self.dst}, {self.params.protocol}, "
+            f"{self.params.data_rate / 1e6:g} Mbit/s, queued={self.queued})"
+        )
+
+    def enqueue(self, packet: int, vc: int, cost: int, size: int, bounded: bool = True) -> bool:
+        """
+        Queue a packet on a virtual channel with the credit it will need.
+
+        ``bounded=False`` skips the queue limit, for packets still held by
+        their source.
+
+        Returns:
+            False if the channel's queue is full and the packet is refused
+
+        Raises:
+            ValueError: If the link has no channel ``vc``
+        """
+        if not 0 <= vc < len(self.queues):
+            raise ValueError(f"Link {self.src}->{self.dst} has no virtual channel {vc}")
+        queue = self.queues[vc]
+        if bounded and self.params.queue_limit and len(queue) >= self.params.queue_limit:
+            self.dropped += 1
+            return False
+        if not queue and self.quantum[vc]:
+            self.active.append(vc)
+        queue.append((packet, cost, size))
+        self.queued += 1
+        return True
+
+    def select(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Pick the next packet to send; ``start`` or ``dequeue`` must follow.
+
+        Returns:
+            ``(vc, packet, cost)`` or None if nothing can be sent
+        """
+        credits = self.credits
+        queues = self.queues
+        for vc in self.strict:
+            queue = queues[vc]
+            if queue and credits[vc] >= queue[0][1]:
+                packet, cost, _ = queue[0]
+                return vc, packet, cost
+
+        active = self.active
+        deficit = self.deficit
+        stalled = 0
+        while stalled < len(active):
+            vc = active[0]
+            packet, cost, size = queues[vc][0]
+            if credits[vc] < cost:
+                stalled += 1
+            elif deficit[vc] >= size:
+                return vc, packet, cost
+            else:
+                deficit[vc] += self.quantum[vc]
+                stalled = 0
+            active.rotate(-1)
+        return None
+
+    def _pop(self, vc: int) -> int:
+        """Remove the head of a channel chosen by ``select``."""
+        queue = self.queues[vc]
+        packet, _, size = queue.popleft()
+        self.queued -= 1
+        if self.quantum[vc]:
+            self.deficit[vc] -= size
+            if not queue:
+                # select leaves the channel it chose at the front.
+                self.deficit[vc] = 0
+                self.active.popleft()
+        return packet
+
+    def start(self, vc: int, size: int, cost: int, now: float) -> float:
+        """
+        Dequeue the selected packet and begin sending it.
+
+        Returns:
+            Serialization delay of the packet
+        """
+        self._pop(vc)
+        self.credits[vc] -= cost
+        self.busy = True
+        if self._stalled_since is not None:
+            self.stall_time += now - self._stalled_since
+            self._stalled_since = None
+        delay = self.params.serialization_delay(size)
+        self.packets_sent += 1
+        self.bytes_sent += size
+        self.busy_time += delay
+        return delay
+
+    def dequeue(self, vc: int) -> int:
+        """Remove the selected packet from its queue without sending it."""
+        return self._pop(vc)
+
+    def reserve(self, packet: int, size: int, now: float) -> None:
+        """Hold the link for one packet until ``release`` (wormhole switching)."""
+        self.holder = packet
+        self.busy = True
+        self.packets_sent += 1
+        self.bytes_sent += size
+        self._reserved_at = now
+
+    def release(self, now: float) -> None:
+        """Free the link once the packet's tail has passed."""
+        self.busy_time += now - self._reserved_at
+        self.holder = -1
+        self.busy = False
+
+    def stall(self, now: float) -> None:
+        """Note that packets are waiting but none has credit."""
+        if self._stalled_since is None:
+            self._stalled_since = now
+
+    def utilization(self, elapsed: float) -> float:
+        """Fraction of ``elapsed`` seconds spent transmitting."""
+        return self.busy_time / elapsed if elapsed > 0 else 0.0
+
+    def stats(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "src": self.src,
+            "dst": self.dst,
+            "packets_sent": self.packets_sent,
+            "bytes_sent": self.bytes_sent,
+            "utilization": self.utilization(elapsed),
+            "stall_time": self.stall_time,
+            "hol_time": self.hol_time,
+            "queued": self.queued,
+            "dropped": self.dropped,
+        }
@@ -3,7 +3,7 @@
 import time
 import threading
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
 from enum import Enum
 import json
 import statistics
@@ -68,17 +68,22 @@ class MetricsCollector:
     - Latency measurements
     - Throughput calculations
     - Power consumption estimation
+
+    Times come from ``clock`` (wall-clock ``time.time`` by default); pass
+    a simulator's clock to measure runtime and throughput in simulated
+    time.
     """
 
     _lock = threading.Lock()
 
-    def __init__(self):
+    def __init__(self, clock: Optional[Callable[[], float]] = None):
+        self._clock = clock or time.time
         self._packets_sent = 0
         self._packets_received = 0
         self._errors_detected = 0
         self._latency_records: List[float] = []
         self._bytes_transferred = 0
-        self._start_time = time.time()
+        self._start_time = self._clock()
         self._snapshots: List[MetricsSnapshot] = []
         self._event_log: List[Dict[str, Any]] = []
 
@@ -90,10 +95,16 @@ class MetricsCollector:
             self._errors_detected = 0
             self._latency_records.clear()
             self._bytes_transferred = 0
-            self._start_time = time.time()
+            self._start_time = self._clock()
             self._snapshots.clear()
             self._event_log.clear()
 
+    def set_clock(self, clock: Optional[Callable[[], float]] = None) -> None:
+        """Switch time source (``time.time`` when None) and restart the runtime."""
+        with self._lock:
+            self._clock = clock or time.time
+            self._start_time = self._clock()
+
     def record_sent(self, packet_size: int) -> None:
         """Record a packet being sent."""
         with self._lock:
@@ -115,7 +126,7 @@ class MetricsCollector:
         """Record a custom event."""
         with self._lock:
             self._event_log.append({
-                "timestamp": time.time(),
+                "timestamp": self._clock(),
                 "type": event_type,
                 "details": details,
             })
@@ -124,7 +135,7 @@ class MetricsCollector:
         """Take a snapshot of current metrics."""
         with self._lock:
             snapshot = MetricsSnapshot(
-                timestamp=time.time(),
+                timestamp=self._clock(),
                 packets_sent=self._packets_sent,
                 packets_received=self._packets_received,
                 errors_detected=self._errors_detected,
@@ -152,7 +163,7 @@ class MetricsCollector:
 
     @property
     def runtime(self) -> float:
-        return time.time() - self._start_time
+        return self._clock() - self._start_time
 
     def get_avg_latency(self) -> float:
         """Get average latency."""
@@ -235,13 +246,29 @@ class MetricsCollector:
 
 
 class QoSMetrics:
-    """Quality of Service metrics tracking."""
+    """
+    Quality of Service metrics tracking.
 
-    def __init__(self):
+    Latencies are kept per priority level and, with traffic and
+    throughput, per virtual channel. Throughput is over the time since
+    creation (or ``set_clock``) on ``clock``, ``time.time`` by default.
+    """
+
+    def __init__(self, clock: Optional[Callable[[], float]] = None):
         self._priority_counts: Dict[int, int] = {0: 0, 1: 0, 2: 0, 3: 0}
         self._priority_latencies: Dict[int, List[float]] = {0: [], 1: [], 2: [], 3: []}
+        self._vc_bytes: Dict[int, int] = {}
+        self._vc_latencies: Dict[int, List[float]] = {}
+        self._clock = clock or time.time
+        self._start_time = self._clock()
         self._lock = threading.Lock()
 
+    def set_clock(self, clock: Optional[Callable[[], float]] = None) -> None:
+        """Switch time source (``time.time`` when None) and restart the throughput window."""
+        with self._lock:
+            self._clock = clock or time.time
+            self._start_time = self._clock()
+
     def record_priority(self, priority: int, latency: float) -> None:
         """Record metrics for a priority level."""
         with self._lock:
@@ -249,6 +276,32 @@ class QoSMetrics:
                 self._priority_counts[priority] += 1
                 self._priority_latencies[priority].append(latency)
 
+    def record_vc(self, vc: int, latency: float, packet_size: int) -> None:
+        """Record a packet delivered on a virtual channel."""
+        with self._lock:
+            if vc not in self._vc_bytes:
+                self._vc_bytes[vc] = 0
+                self._vc_latencies[vc] = []
+            self._vc_bytes[vc] += packet_size
+            self._vc_latencies[vc].append(latency)
+
+    def get_vc_stats(self) -> Dict[int, Dict[str, Any]]:
+        """Get traffic, throughput and latency by virtual channel."""
+        with self._lock:
+            elapsed = self._clock() - self._start_time
+            stats = {}
+            for vc in sorted(self._vc_bytes):
+                latencies = self._vc_latencies[vc]
+                bytes_sent = self._vc_bytes[vc]
+                stats[vc] = {
+                    "count": len(latencies),
+                    "bytes": bytes_sent,
+                    "throughput_bps": bytes_sent * 8 / elapsed if elapsed > 0 else 0.0,
+                    "avg_latency": statistics.mean(latencies),
+                    "max_latency": max(latencies),
+                }
+            return stats
+
     def get_priority_stats(self) -> Dict[int, Dict[str, Any]]:
         """Get statistics by priority level."""
         with self._lock:
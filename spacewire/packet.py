@@ -1,18 +1,23 @@
 """SpaceWire and SpaceFibre packet implementations with CRC error detection."""
 
+import mmap
+import os
 import random
+import struct
 import time
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Sequence, Tuple, Iterator, Type, Union
 from enum import Enum
 import threading
 
+import numpy as np
 
-try:
-    from scapy.all import Packet as ScapyPacket, ByteField, StrLenField, ByteField as Byte
-    HAS_SCAPY = True
-except ImportError:
-    HAS_SCAPY = False
+from spacewire._lazy import is_available
+
+
+# scapy is optional and slow to import; only probe for it here and import
+# it in the code that needs it.
+HAS_SCAPY = is_available("scapy")
 
 
 class PacketPriority(Enum):
@@ -44,23 +49,50 @@ class PacketMetrics:
     priority: PacketPriority = PacketPriority.NORMAL
 
 
+def _right_aligned(payloads: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack payloads into a zero-padded uint8 matrix, one right-aligned row each."""
+    lengths = np.fromiter((len(p) for p in payloads), dtype=np.int64, count=len(payloads))
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.zeros((len(payloads), width), dtype=np.uint8)
+    for row, payload in enumerate(payloads):
+        if len(payload):
+            matrix[row, width - len(payload):] = np.frombuffer(payload, dtype=np.uint8)
+    return matrix, lengths
+
+
 class CRC8:
     """CRC-8 error detection implementation."""
 
     POLYNOMIAL = 0x07
+    TABLE: List[int] = []
+    _NP_TABLE: np.ndarray = np.empty(0, dtype=np.uint8)
 
-    @staticmethod
-    def calculate(data: bytes) -> int:
-        """Calculate CRC-8 checksum for data."""
-        crc = 0
-        for byte in data:
-            crc ^= byte
+    @classmethod
+    def _init_table(cls) -> List[int]:
+        """Initialize CRC lookup table."""
+        if cls.TABLE:
+            return cls.TABLE
+        table = [0] * 256
+        for i in range(256):
+            crc = i
             for _ in range(8):
                 if crc & 0x80:
-                    crc = (crc << 1) ^ CRC8.POLYNOMIAL
+                    crc = (crc << 1) ^ cls.POLYNOMIAL
                 else:
                     crc <<= 1
                 crc &= 0xFF
+            table[i] = crc
+        cls._NP_TABLE = np.array(table, dtype=np.uint8)
+        cls.TABLE = table
+        return table
+
+    @staticmethod
+    def calculate(data: Any) -> int:
+        """Calculate CRC-8 checksum for bytes-like data."""
+        table = CRC8.TABLE or CRC8._init_table()
+        crc = 0
+        for byte in data:
+            crc = table[crc ^ byte]
         return crc
 
     @staticmethod
@@ -68,19 +100,60 @@ class CRC8:
         """Verify data against CRC-8 checksum."""
         return CRC8.calculate(data) == checksum
 
+    @staticmethod
+    def calculate_matrix(matrix: np.ndarray) -> np.ndarray:
+        """
+        Calculate CRC-8 checksums for every row of a 2-D uint8 array.
+
+        The register starts at zero and ``TABLE[0] == 0``, so leading zero
+        bytes do not change the result. Shorter payloads can therefore be
+        right-aligned in the matrix with zero padding on the left.
+        """
+        CRC8._init_table()
+        table = CRC8._NP_TABLE
+        crc = np.zeros(matrix.shape[0], dtype=np.uint8)
+        for column in matrix.T:
+            crc = table[crc ^ column]
+        return crc
+
+    @staticmethod
+    def calculate_batch(payloads: Sequence[bytes]) -> np.ndarray:
+        """
+        Calculate CRC-8 checksums for many payloads in one call.
+
+        Returns a uint8 array with one checksum per payload, bit-identical
+        to calling ``calculate`` on each payload.
+        """
+        matrix, _ = _right_aligned(payloads)
+        return CRC8.calculate_matrix(matrix)
+
+    @staticmethod
+    def calculate_chunks(data: bytes, chunk_size: int) -> np.ndarray:
+        """Calculate CRC-8 checksums for consecutive ``chunk_size`` slices of data."""
+        buf = np.frombuffer(data, dtype=np.uint8)
+        full = len(buf) // chunk_size
+        crcs = CRC8.calculate_matrix(buf[: full * chunk_size].reshape(full, chunk_size))
+        if len(buf) % chunk_size:
+            tail = CRC8.calculate(buf[full * chunk_size:].tobytes())
+            crcs = np.append(crcs, np.uint8(tail))
+        return crcs
+
 
 class CRC16:
     """CRC-16 (CCITT) error detection implementation."""
 
     POLYNOMIAL = 0x1021
+    INITIAL = 0xFFFF
     TABLE = None
+    SLICE_TABLES: List[List[int]] = []
+    _NP_TABLE: np.ndarray = np.empty(0, dtype=np.uint16)
 
     @classmethod
     def _init_table(cls) -> List[int]:
         """Initialize CRC lookup table."""
         if cls.TABLE is not None:
             return cls.TABLE
-        cls.TABLE = [0] * 256
+        table = [0] * 256
         for i in range(256):
             crc = i << 8
             for _ in range(8):
@@ -89,23 +162,132 @@ class CRC16:
                 else:
                     crc <<= 1
                 crc &= 0xFFFF
-            cls.TABLE[i] = crc
-        return cls.TABLE
+            table[i] = crc
+
+        # SLICE_TABLES[k][b] is the register contribution of byte b followed
+        # by k zero bytes, which lets update() fold 4 or 8 bytes per step.
+        slices = [table]
+        for _ in range(7):
+            prev = slices[-1]
+            slices.append([((c << 8) & 0xFFFF) ^ table[c >> 8] for c in prev])
+        cls.SLICE_TABLES = slices
+        cls._NP_TABLE = np.array(table, dtype=np.uint16)
+        cls.TABLE = table
+        return table
 
     @staticmethod
-    def calculate(data: bytes) -> int:
-        """Calculate CRC-16 checksum for data."""
-        CRC16._init_table()
-        crc = 0xFFFF
-        for byte in data:
-            crc = ((crc << 8) & 0xFFFF) ^ CRC16.TABLE[((crc >> 8) ^ byte) & 0xFF]
-        return crc & 0xFFFF
+    def update(crc: int, data: Any, slices: int = 8) -> int:
+        """
+        Advance a CRC-16 register over data and return the new register.
+
+        Accepts any bytes-like object, including memoryviews. ``slices``
+        selects the slice-by-N path (1, 4 or 8 bytes per table step).
+        """
+        table = CRC16.TABLE or CRC16._init_table()
+        view = memoryview(data)
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast("B")
+        length = len(view)
+        head = 0
+
+        if slices == 8 and length >= 8:
+            t7, t6, t5, t4, t3, t2, t1, t0 = CRC16.SLICE_TABLES[7::-1]
+            head = length - length % 8
+            for b0, b1, b2, b3, b4, b5, b6, b7 in struct.iter_unpack("8B", view[:head]):
+                crc = (
+                    t7[b0 ^ (crc >> 8)] ^ t6[b1 ^ (crc & 0xFF)] ^ t5[b2] ^ t4[b3]
+                    ^ t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7]
+                )
+        elif slices == 4 and length >= 4:
+            t3, t2, t1, t0 = CRC16.SLICE_TABLES[3::-1]
+            head = length - length % 4
+            for b0, b1, b2, b3 in struct.iter_unpack("4B", view[:head]):
+                crc = t3[b0 ^ (crc >> 8)] ^ t2[b1 ^ (crc & 0xFF)] ^ t1[b2] ^ t0[b3]
+        elif slices not in (1, 4, 8):
+            raise ValueError(f"Unsupported slice width: {slices}")
+
+        for byte in view[head:]:
+            crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+        return crc
+
+    @staticmethod
+    def calculate(data: Any) -> int:
+        """Calculate CRC-16 checksum for bytes-like data."""
+        return CRC16.update(CRC16.INITIAL, data)
 
     @staticmethod
     def verify(data: bytes, checksum: int) -> bool:
         """Verify data against CRC-16 checksum."""
         return CRC16.calculate(data) == checksum
 
+    @staticmethod
+    def calculate_matrix(matrix: np.ndarray, lengths: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calculate CRC-16 checksums for every row of a 2-D uint8 array.
+
+        Rows are right-aligned payloads. Unlike CRC-8 the register starts
+        at 0xFFFF, so when ``lengths`` is given the leading padding columns
+        of shorter rows are masked out instead of being hashed.
+        """
+        CRC16._init_table()
+        table = CRC16._NP_TABLE
+        rows, width = matrix.shape
+        crc = np.full(rows, CRC16.INITIAL, dtype=np.uint16)
+        start = None if lengths is None else width - np.asarray(lengths)
+        for j, column in enumerate(matrix.T):
+            updated = (crc << 8) ^ table[(crc >> 8) ^ column]
+            crc = updated if start is None else np.where(start <= j, updated, crc)
+        return crc
+
+    @staticmethod
+    def calculate_batch(payloads: Sequence[bytes]) -> np.ndarray:
+        """Calculate CRC-16 checksums for many payloads in one call."""
+        matrix, lengths = _right_aligned(payloads)
+        if len(lengths) and (lengths == lengths[0]).all():
+            return CRC16.calculate_matrix(matrix)
+        return CRC16.calculate_matrix(matrix, lengths)
+
+
+CRCEngine = Type[Union[CRC8, CRC16]]
+"""CRC class a protocol checks its payloads with."""
+
+
+class CRC16Context:
+    """
+    Incremental CRC-16 state.
+
+    Feed the payload in any number of pieces with ``update`` and read the
+    checksum with ``digest``; the result equals ``CRC16.calculate`` over
+    the concatenated pieces, without building the concatenation.
+    """
+
+    __slots__ = ("_crc", "slices")
+
+    def __init__(self, data: Any = b"", slices: int = 8):
+        self.slices = slices
+        self._crc = CRC16.INITIAL
+        if data:
+            self.update(data)
+
+    def update(self, data: Any) -> "CRC16Context":
+        """Add a chunk of data to the running checksum."""
+        self._crc = CRC16.update(self._crc, data, self.slices)
+        return self
+
+    def digest(self) -> int:
+        """Return the checksum of all data seen so far."""
+        return self._crc
+
+    def copy(self) -> "CRC16Context":
+        """Return an independent copy of the current state."""
+        clone = CRC16Context(slices=self.slices)
+        clone._crc = self._crc
+        return clone
+
+    def reset(self) -> None:
+        """Discard all data seen so far."""
+        self._crc = CRC16.INITIAL
+
 
 class SpaceWirePacket:
     """
@@ -116,6 +298,12 @@ class SpaceWirePacket:
     """
 
     PROTOCOL_ID = 0x88B5
+    CRC: CRCEngine = CRC8
+
+    __slots__ = ("src", "dst", "route", "data", "packet_type", "priority", "crc", "_timestamp")
+
+    _clock: Callable[[], float] = staticmethod(time.time)
+    _deferred_timestamps = False
 
     def __init__(
         self,
@@ -125,6 +313,8 @@ class SpaceWirePacket:
         data: bytes = b"",
         packet_type: PacketType = PacketType.DATA,
         priority: PacketPriority = PacketPriority.NORMAL,
+        crc: Optional[int] = None,
+        timestamp: Optional[float] = None,
     ):
         self.src = src
         self.dst = dst
@@ -132,8 +322,37 @@ class SpaceWirePacket:
         self.data = data
         self.packet_type = packet_type
         self.priority = priority
-        self.crc = CRC8.calculate(data)
-        self.timestamp = time.time()
+        self.crc = self.CRC.calculate(data) if crc is None else int(crc)
+        if timestamp is None and not self._deferred_timestamps:
+            timestamp = self._clock()
+        self._timestamp = timestamp
+
+    @classmethod
+    def set_clock(
+        cls, clock: Optional[Callable[[], float]] = None, deferred: bool = False
+    ) -> None:
+        """
+        Choose how packets of this class are timestamped.
+
+        Args:
+            clock: Time source, e.g. a simulator's ``now``; wall-clock
+                ``time.time`` when None
+            deferred: Skip stamping at construction and read the clock the
+                first time ``timestamp`` is accessed instead
+        """
+        cls._clock = staticmethod(clock or time.time)
+        cls._deferred_timestamps = deferred
+
+    @property
+    def timestamp(self) -> float:
+        """Creation time, taken from the packet clock."""
+        if self._timestamp is None:
+            self._timestamp = self._clock()
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: float) -> None:
+        self._timestamp = value
 
     def __repr__(self) -> str:
         return (
@@ -142,8 +361,8 @@ class SpaceWirePacket:
         )
 
     def verify(self) -> bool:
-        """Verify packet integrity using CRC-8."""
-        return CRC8.verify(self.data, self.crc)
+        """Verify packet integrity using the protocol CRC (CRC-8 or CRC-16)."""
+        return self.CRC.verify(self.data, self.crc)
 
     def simulate_error(self, error_probability: float = 0.1) -> bool:
         """
@@ -162,15 +381,22 @@ class SpaceWirePacket:
         return header + self.data + bytes([self.crc])
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> "SpaceWirePacket":
-        """Deserialize packet from bytes."""
-        if len(data) < 5:
-            raise ValueError("Packet data too short")
-        src, dst, route, packet_type = data[:4]
-        packet_type = PacketType(packet_type)
-        crc = data[-1]
-        payload = data[4:-1]
-        return cls(src, dst, route, payload, packet_type)
+    def from_bytes(cls, data: Any) -> "SpaceWirePacket":
+        """
+        Deserialize packet from bytes.
+
+        The CRC byte received on the wire is kept, so ``verify()`` reports
+        corruption that happened in transit.
+        """
+        view = PacketView(data, "spacewire")
+        return cls(
+            view.src,
+            view.dst,
+            view.route,
+            view.data.tobytes(),
+            view.packet_type,
+            crc=view.wire_crc,
+        )
 
 
 class SpaceFibrePacket(SpaceWirePacket):
@@ -183,6 +409,9 @@ class SpaceFibrePacket(SpaceWirePacket):
 
     PROTOCOL_ID = 0x88B6
     NUM_VIRTUAL_CHANNELS = 8
+    CRC = CRC16
+
+    __slots__ = ("virtual_channel", "sequence_number", "flow_control")
 
     def __init__(
         self,
@@ -195,12 +424,13 @@ class SpaceFibrePacket(SpaceWirePacket):
         flow_control: bool = False,
         packet_type: PacketType = PacketType.DATA,
         priority: PacketPriority = PacketPriority.NORMAL,
+        crc: Optional[int] = None,
+        timestamp: Optional[float] = None,
     ):
-        super().__init__(src, dst, route, data, packet_type, priority)
+        super().__init__(src, dst, route, data, packet_type, priority, crc, timestamp)
         self.virtual_channel = virtual_channel
         self.sequence_number = sequence_number
         self.flow_control = flow_control
-        self.crc = CRC16.calculate(data)
 
     def __repr__(self) -> str:
         return (
@@ -209,10 +439,6 @@ class SpaceFibrePacket(SpaceWirePacket):
             f"size={len(self.data)} bytes)"
         )
 
-    def verify(self) -> bool:
-        """Verify packet integrity using CRC-16."""
-        return CRC16.verify(self.data, self.crc)
-
     def to_bytes(self) -> bytes:
         """Serialize packet to bytes."""
         header = bytes([
@@ -224,12 +450,441 @@ class SpaceFibrePacket(SpaceWirePacket):
         ])
         return header + self.data + bytes([self.crc >> 8, self.crc & 0xFF])
 
+    @classmethod
+    def from_bytes(cls, data: Any) -> "SpaceFibrePacket":
+        """Deserialize packet from bytes, keeping the received CRC-16."""
+        view = PacketView(data, "spacefibre")
+        return cls(
+            view.src,
+            view.dst,
+            data=view.data.tobytes(),
+            virtual_channel=view.virtual_channel,
+            sequence_number=view.sequence_number,
+            flow_control=view.flow_control,
+            crc=view.wire_crc,
+        )
+
+
+class PacketView:
+    """
+    Zero-copy view of one serialized SpaceWire or SpaceFibre packet.
+
+    Header fields are read straight from the underlying buffer and ``data``
+    is a memoryview slice of it, so parsing captured traffic allocates no
+    payload copies. The payload CRC is only computed when first needed and
+    is checked against the CRC actually carried in the frame.
+    """
+
+    __slots__ = ("buffer", "protocol", "_crc")
+
+    HEADER_SIZES = {"spacewire": 4, "spacefibre": 5}
+    CRC_SIZES = {"spacewire": 1, "spacefibre": 2}
+
+    def __init__(self, buffer: Any, protocol: str = "spacewire"):
+        if protocol not in self.HEADER_SIZES:
+            raise ValueError(f"Unknown protocol: {protocol}")
+        view = memoryview(buffer)
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast("B")
+        if len(view) < self.HEADER_SIZES[protocol] + self.CRC_SIZES[protocol]:
+            raise ValueError("Packet data too short")
+        self.buffer = view
+        self.protocol = protocol
+        self._crc: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"PacketView(protocol={self.protocol}, src=0x{self.src:02X}, "
+            f"dst=0x{self.dst:02X}, size={len(self)} bytes)"
+        )
+
+    def __len__(self) -> int:
+        return len(self.buffer) - self.HEADER_SIZES[self.protocol] - self.CRC_SIZES[self.protocol]
+
+    @property
+    def src(self) -> int:
+        return self.buffer[0]
+
+    @property
+    def dst(self) -> int:
+        return self.buffer[1]
+
+    @property
+    def route(self) -> int:
+        return self.buffer[2] if self.protocol == "spacewire" else 0x00
+
+    @property
+    def packet_type(self) -> PacketType:
+        if self.protocol == "spacewire":
+            return PacketType(self.buffer[3])
+        return PacketType.DATA
+
+    @property
+    def virtual_channel(self) -> int:
+        return self.buffer[2] if self.protocol == "spacefibre" else 0
+
+    @property
+    def sequence_number(self) -> int:
+        return self.buffer[3] if self.protocol == "spacefibre" else 0
+
+    @property
+    def flow_control(self) -> bool:
+        return self.protocol == "spacefibre" and bool(self.buffer[4])
+
+    @property
+    def data(self) -> memoryview:
+        """Payload as a memoryview into the original buffer."""
+        header = self.HEADER_SIZES[self.protocol]
+        return self.buffer[header:len(self.buffer) - self.CRC_SIZES[self.protocol]]
+
+    @property
+    def wire_crc(self) -> int:
+        """CRC carried in the frame."""
+        if self.protocol == "spacefibre":
+            return (self.buffer[-2] << 8) | self.buffer[-1]
+        return self.buffer[-1]
+
+    @property
+    def crc(self) -> int:
+        """CRC computed over the payload, cached after the first access."""
+        if self._crc is None:
+            if self.protocol == "spacefibre":
+                self._crc = CRC16.calculate(self.data)
+            else:
+                self._crc = CRC8.calculate(self.data)
+        return self._crc
+
+    def verify(self) -> bool:
+        """Check the payload against the CRC received on the wire."""
+        return self.crc == self.wire_crc
+
+    def to_packet(self) -> SpaceWirePacket:
+        """Materialize a packet object (copies the payload)."""
+        if self.protocol == "spacefibre":
+            return SpaceFibrePacket.from_bytes(self.buffer)
+        return SpaceWirePacket.from_bytes(self.buffer)
+
+
+class PacketBatch:
+    """
+    Columnar (struct-of-arrays) batch of SpaceWire or SpaceFibre packets.
+
+    Header fields and CRCs are NumPy arrays with one entry per packet, and
+    all payloads share one contiguous uint8 buffer indexed by ``offsets``
+    (packet ``i`` spans ``payload[offsets[i]:offsets[i + 1]]``). Packet
+    objects are only built when indexed or iterated.
+    """
+
+    HEADER_SIZES = PacketView.HEADER_SIZES
+    CRC_SIZES = PacketView.CRC_SIZES
+
+    def __init__(
+        self,
+        payload: Any,
+        offsets: Any,
+        src: Any,
+        dst: Any,
+        protocol: str = "spacewire",
+        route: Any = 0,
+        virtual_channel: Any = 0,
+        sequence_number: Any = 0,
+        flow_control: Any = 0,
+        priority: Any = PacketPriority.NORMAL.value,
+        packet_type: Any = PacketType.DATA.value,
+        crc: Any = None,
+    ):
+        if protocol not in self.HEADER_SIZES:
+            raise ValueError(f"Unknown protocol: {protocol}")
+        self.protocol = protocol
+        self.payload = np.frombuffer(payload, dtype=np.uint8) if not isinstance(
+            payload, np.ndarray
+        ) else payload
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        n = len(self.offsets) - 1
+
+        def column(value: Any, dtype: Any) -> np.ndarray:
+            if isinstance(value, Enum):
+                value = value.value
+            array: np.ndarray = np.broadcast_to(np.asarray(value, dtype=dtype), (n,)).copy()
+            return array
+
+        self.src = column(src, np.uint8)
+        self.dst = column(dst, np.uint8)
+        self.route = column(route, np.uint8)
+        self.virtual_channel = column(virtual_channel, np.uint8)
+        self.sequence_number = column(sequence_number, np.int64)
+        self.flow_control = column(flow_control, np.uint8)
+        self.priority = column(priority, np.uint8)
+        self.packet_type = column(packet_type, np.uint8)
+        self.crc = self.compute_crc() if crc is None else column(crc, np.uint16)
+
+    @classmethod
+    def from_chunks(
+        cls,
+        src: int,
+        dst: int,
+        data: Any,
+        chunk_size: int = 1000,
+        protocol: str = "spacewire",
+        **fields: Any,
+    ) -> "PacketBatch":
+        """Split data into ``chunk_size`` payloads without copying it."""
+        size = len(memoryview(data).cast("B"))
+        offsets = np.append(np.arange(0, size, chunk_size, dtype=np.int64), size)
+        return cls(data, offsets, src, dst, protocol=protocol, **fields)
+
+    @classmethod
+    def from_packets(cls, packets: Sequence[SpaceWirePacket]) -> "PacketBatch":
+        """Build a batch from packet objects of a single protocol."""
+        protocol = "spacefibre" if packets and isinstance(packets[0], SpaceFibrePacket) else "spacewire"
+        lengths = [len(p.data) for p in packets]
+        offsets = np.zeros(len(packets) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(
+            b"".join(p.data for p in packets),
+            offsets,
+            [p.src for p in packets],
+            [p.dst for p in packets],
+            protocol=protocol,
+            route=[p.route for p in packets],
+            virtual_channel=[getattr(p, "virtual_channel", 0) for p in packets],
+            sequence_number=[getattr(p, "sequence_number", 0) for p in packets],
+            flow_control=[getattr(p, "flow_control", False) for p in packets],
+            priority=[p.priority.value for p in packets],
+            packet_type=[p.packet_type.value for p in packets],
+            crc=[p.crc for p in packets],
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __repr__(self) -> str:
+        return (
+            f"PacketBatch(protocol={self.protocol}, packets={len(self)}, "
+            f"payload={len(self.payload)} bytes)"
+        )
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Payload length of every packet."""
+        return np.diff(self.offsets)
+
+    @property
+    def crc_engine(self) -> CRCEngine:
+        """CRC class used by this batch's protocol."""
+        return CRC16 if self.protocol == "spacefibre" else CRC8
+
+    def payload_view(self, index: int) -> memoryview:
+        """Return a zero-copy view of one packet's payload."""
+        return self.payload[self.offsets[index]:self.offsets[index + 1]].data
+
+    def compute_crc(self) -> np.ndarray:
+        """Compute the CRC of every payload with one vectorized pass per length."""
+        lengths = self.lengths
+        crc = np.zeros(len(lengths), dtype=np.uint16)
+        engine = self.crc_engine
+        for length in np.unique(lengths):
+            rows = np.flatnonzero(lengths == length)
+            starts = self.offsets[rows]
+            if len(rows) > 1 and (np.diff(starts) == length).all():
+                first = starts[0]
+                matrix = self.payload[first:first + len(rows) * length].reshape(-1, length)
+            else:
+                matrix = self.payload[starts[:, None] + np.arange(length)]
+            crc[rows] = engine.calculate_matrix(matrix)
+        return crc
+
+    def verify(self) -> np.ndarray:
+        """Return a boolean array, True where the stored CRC matches the payload."""
+        matches: np.ndarray = self.compute_crc() == self.crc
+        return matches
+
+    def inject_errors(
+        self, error_probability: float = 0.1, rng: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """
+        Vectorized counterpart of ``SpaceWirePacket.simulate_error``.
+
+        Returns a boolean mask of the packets whose CRC was corrupted.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        mask = rng.random(len(self)) < error_probability
+        self.crc[mask] ^= 0xFF
+        return mask
+
+    def header_columns(self) -> List[np.ndarray]:
+        """Header byte columns in wire order."""
+        if self.protocol == "spacefibre":
+            return [
+                self.src,
+                self.dst,
+                self.virtual_channel,
+                (self.sequence_number & 0xFF).astype(np.uint8),
+                (self.flow_control != 0).astype(np.uint8),
+            ]
+        return [self.src, self.dst, self.route, self.packet_type]
+
+    def crc_columns(self) -> List[np.ndarray]:
+        """CRC byte columns in wire order."""
+        if self.protocol == "spacefibre":
+            return [(self.crc >> 8).astype(np.uint8), (self.crc & 0xFF).astype(np.uint8)]
+        return [(self.crc & 0xFF).astype(np.uint8)]
+
+    def frame_array(
+        self,
+        leading: Sequence[np.ndarray],
+        trailing: Sequence[np.ndarray],
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Lay out every packet back to back in one uint8 array.
+
+        Each packet becomes ``leading`` byte columns, its payload, then
+        ``trailing`` byte columns. The run of equal-length payloads at the
+        front of the batch (every chunk but the last, for file data) is
+        written as a 2-D block; any remainder falls back to scattered
+        header writes plus one masked payload assignment. When ``out`` is
+        given the frames are written into it instead of a new array.
+        """
+        overhead = len(leading) + len(trailing)
+        n = len(self)
+        lengths = self.lengths
+        if out is None:
+            out = np.empty(len(self.payload) + n * overhead, dtype=np.uint8)
+        if n == 0:
+            return out
+
+        uniform = int(np.argmin(lengths == lengths[0])) if (lengths != lengths[0]).any() else n
+        width = int(lengths[0])
+        block = out[: uniform * (width + overhead)].reshape(uniform, width + overhead)
+        for k, values in enumerate(leading):
+            block[:, k] = values[:uniform]
+        block[:, len(leading):len(leading) + width] = self.payload[: uniform * width].reshape(
+            uniform, width
+        )
+        for k, values in enumerate(trailing):
+            block[:, len(leading) + width + k] = values[:uniform]
+        if uniform == n:
+            return out
+
+        rest = slice(uniform, n)
+        base = uniform * (width + overhead)
+        starts = (
+            self.offsets[rest] - self.offsets[uniform]
+            + np.arange(n - uniform, dtype=np.int64) * overhead
+        )
+        tail = out[base:]
+        is_payload = np.ones(len(tail), dtype=bool)
+        for k, values in enumerate(leading):
+            tail[starts + k] = values[rest]
+            is_payload[starts + k] = False
+        tail_starts = starts + len(leading) + lengths[rest]
+        for k, values in enumerate(trailing):
+            tail[tail_starts + k] = values[rest]
+            is_payload[tail_starts + k] = False
+        tail[is_payload] = self.payload[self.offsets[uniform]:]
+        return out
+
+    def to_bytes(self) -> bytes:
+        """Serialize every packet back to back, identical to joining ``to_bytes()``."""
+        return self.frame_array(self.header_columns(), self.crc_columns()).tobytes()
+
+    def packet(self, index: int) -> SpaceWirePacket:
+        """Materialize one packet object."""
+        data = self.payload_view(index).tobytes()
+        packet_type = _PACKET_TYPES[int(self.packet_type[index])]
+        priority = _PRIORITIES[int(self.priority[index])]
+        if self.protocol == "spacefibre":
+            return SpaceFibrePacket(
+                src=int(self.src[index]),
+                dst=int(self.dst[index]),
+                route=int(self.route[index]),
+                data=data,
+                virtual_channel=int(self.virtual_channel[index]),
+                sequence_number=int(self.sequence_number[index]),
+                flow_control=bool(self.flow_control[index]),
+                packet_type=packet_type,
+                priority=priority,
+                crc=int(self.crc[index]),
+            )
+        return SpaceWirePacket(
+            src=int(self.src[index]),
+            dst=int(self.dst[index]),
+            route=int(self.route[index]),
+            data=data,
+            packet_type=packet_type,
+            priority=priority,
+            crc=int(self.crc[index]),
+        )
+
+    def __getitem__(self, index: int) -> SpaceWirePacket:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("packet index out of range")
+        return self.packet(index)
+
+    def __iter__(self) -> Iterator[SpaceWirePacket]:
+        for index in range(len(self)):
+            yield self.packet(index)
+
+
+_PACKET_TYPES = {t.value: t for t in PacketType}
+_PRIORITIES = {p.value: p for p in PacketPriority}
+
+
+class SequenceAllocator:
+    """
+    Thread-safe allocator for packet sequence numbers.
+
+    Each key (for example a ``(src, dst, virtual_channel)`` link/VC pair)
+    has its own sequence space that starts at 0 and wraps at ``modulus``,
+    matching the one-byte SpaceFibre ``sequence_number`` header field.
+    ``reserve`` hands out a contiguous range with a single lock
+    acquisition and ``next`` takes one number the same way, so single and
+    batch allocations on a key always come out in order.
+    """
+
+    def __init__(self, modulus: Optional[int] = 256):
+        self.modulus = modulus
+        self._counters: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def _wrap(self, value: int) -> int:
+        return value % self.modulus if self.modulus else value
+
+    def reserve(self, count: int, key: Any = None) -> int:
+        """
+        Reserve ``count`` consecutive numbers in ``key``'s space.
+
+        Returns the first number before wraparound; the range is
+        ``first .. first + count - 1`` modulo ``modulus``.
+        """
+        with self._lock:
+            first = self._counters.get(key, 0)
+            self._counters[key] = first + count
+        return first
+
+    def reserve_array(self, count: int, key: Any = None) -> np.ndarray:
+        """Reserve ``count`` numbers and return them, wrapped, as an array."""
+        first = self.reserve(count, key)
+        values = np.arange(first, first + count, dtype=np.int64)
+        return values % self.modulus if self.modulus else values
+
+    def next(self, key: Any = None) -> int:
+        """Return the next number for ``key``."""
+        return self._wrap(self.reserve(1, key))
+
+    def reset(self) -> None:
+        """Restart every sequence space at zero."""
+        with self._lock:
+            self._counters.clear()
+
 
 class PacketFactory:
     """Factory for creating different packet types."""
 
-    _packet_id_counter = 0
-    _lock = threading.Lock()
+    _sequences = SequenceAllocator()
 
     @classmethod
     def create_spacewire(
@@ -238,6 +893,7 @@ class PacketFactory:
         dst: int,
         data: bytes,
         priority: PacketPriority = PacketPriority.NORMAL,
+        crc: Optional[int] = None,
     ) -> SpaceWirePacket:
         """Create a SpaceWire packet."""
         return SpaceWirePacket(
@@ -245,6 +901,7 @@ class PacketFactory:
             dst=dst,
             data=data,
             priority=priority,
+            crc=crc,
         )
 
     @classmethod
@@ -255,11 +912,10 @@ class PacketFactory:
         data: bytes,
         virtual_channel: int = 0,
         priority: PacketPriority = PacketPriority.NORMAL,
+        crc: Optional[int] = None,
     ) -> SpaceFibrePacket:
         """Create a SpaceFibre packet."""
-        with cls._lock:
-            cls._packet_id_counter += 1
-            seq_num = cls._packet_id_counter
+        seq_num = cls._sequences.next((src, dst, virtual_channel))
 
         return SpaceFibrePacket(
             src=src,
@@ -268,6 +924,7 @@ class PacketFactory:
             virtual_channel=virtual_channel,
             sequence_number=seq_num,
             priority=priority,
+            crc=crc,
         )
 
     @classmethod
@@ -281,15 +938,113 @@ class PacketFactory:
         **kwargs,
     ) -> List[SpaceWirePacket]:
         """Create a batch of packets from file data."""
-        packets: List[SpaceWirePacket] = []
+        if protocol != "spacefibre" and "virtual_channel" in kwargs:
+            raise TypeError("virtual_channel only applies to SpaceFibre packets")
+        return list(cls.create_packet_batch(src, dst, file_data, chunk_size, protocol, **kwargs))
+
+    @classmethod
+    def create_packet_batch(
+        cls,
+        src: int,
+        dst: int,
+        file_data: Any,
+        chunk_size: int = 1000,
+        protocol: str = "spacewire",
+        virtual_channel: int = 0,
+        priority: PacketPriority = PacketPriority.NORMAL,
+    ) -> PacketBatch:
+        """
+        Create a columnar PacketBatch from file data.
+
+        SpaceFibre sequence numbers are reserved as one contiguous range in
+        the ``(src, dst, virtual_channel)`` sequence space.
+        """
         num_chunks = len(file_data) // chunk_size + (1 if len(file_data) % chunk_size != 0 else 0)
+        sequence_number: Any = 0
+        if protocol == "spacefibre":
+            sequence_number = cls._sequences.reserve_array(
+                num_chunks, (src, dst, virtual_channel)
+            )
 
-        for i in range(num_chunks):
-            chunk = file_data[i * chunk_size : (i + 1) * chunk_size]
-            if protocol == "spacefibre":
-                pkt = cls.create_spacefibre(src, dst, chunk, **kwargs)
-            else:
-                pkt = cls.create_spacewire(src, dst, chunk, **kwargs)
-            packets.append(pkt)
+        return PacketBatch.from_chunks(
+            src,
+            dst,
+            file_data,
+            chunk_size,
+            protocol,
+            virtual_channel=virtual_channel,
+            sequence_number=sequence_number,
+            priority=priority,
+        )
+
+    @classmethod
+    def iter_file(
+        cls,
+        path: str,
+        chunk_size: int = 1000,
+        protocol: str = "spacewire",
+        src: int = 0x01,
+        dst: int = 0x02,
+        virtual_channel: int = 0,
+        priority: PacketPriority = PacketPriority.NORMAL,
+    ) -> Iterator[SpaceWirePacket]:
+        """
+        Stream packets from a file without reading it into memory.
+
+        Packets are materialized one at a time from the blocks of
+        ``iter_file_batches``.
+        """
+        for block in cls.iter_file_batches(
+            path, chunk_size, protocol, src, dst,
+            virtual_channel=virtual_channel, priority=priority,
+        ):
+            yield from block
+
+    @classmethod
+    def iter_file_batches(
+        cls,
+        path: str,
+        chunk_size: int = 1000,
+        protocol: str = "spacewire",
+        src: int = 0x01,
+        dst: int = 0x02,
+        batch_size: int = 256,
+        virtual_channel: int = 0,
+        priority: PacketPriority = PacketPriority.NORMAL,
+    ) -> Iterator[PacketBatch]:
+        """
+        Stream PacketBatch blocks from a file without reading it into memory.
+
+        The file is memory-mapped and packetized lazily, ``batch_size``
+        packets at a time; each block's payload is a view into the
+        mapping. Only the block being packetized needs to be resident, so
+        memory use does not grow with the file size.
+        """
+        block_size = batch_size * chunk_size
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        return packets
+        try:
+            for start in range(0, size, block_size):
+                with memoryview(mapped) as view:
+                    block = cls.create_packet_batch(
+                        src,
+                        dst,
+                        view[start:start + block_size],
+                        chunk_size,
+                        protocol,
+                        virtual_channel=virtual_channel,
+                        priority=priority,
+                    )
+                yield block
+                del block
+        finally:
+            try:
+                mapped.close()
+            except BufferError:
+                # A yielded batch still references the mapping; it is
+                # unmapped once the last payload view is released.
+                pass
@@ -0,0 +1,251 @@
+"""SpaceWire router model with path and logical addressing."""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spacewire.csr import CSRAdjacency
+from spacewire.topology import Topology
+
+CONFIG_PORT = 0
+"""Port 0 is the router's configuration port; here it also delivers to the local node."""
+
+PATH_ADDRESS_MAX = 31
+"""Header bytes 0-31 name an output port directly (path addressing)."""
+
+LOGICAL_ADDRESS_MIN = 32
+LOGICAL_ADDRESS_MAX = 254
+"""Logical addresses are looked up in the routing table; 255 is reserved."""
+
+NUM_ADDRESSES = 256
+
+
+class Router:
+    """
+    SpaceWire router at one topology node.
+
+    Port ``i`` (``i >= 1``) is the link to ``ports[i]``; port 0 is the
+    configuration port, which stands for the node attached to the router,
+    so ``ports[0]`` is ``node_id``.
+    The routing table is a 256-entry list indexed by the leading header
+    byte. Each logical address (32-254) maps to a tuple of output ports,
+    the group used for group adaptive routing, and to a header-deletion
+    flag. Path addresses (0-31) select a port directly and are always
+    deleted. Forwarding a packet is therefore one list lookup.
+
+    ``busy`` holds one flag per port; ``forward`` picks the first port of
+    a group that is not busy, so traffic spreads over parallel links. The
+    link simulators copy ``Link.busy`` into it before each decision.
+    """
+
+    __slots__ = ("node_id", "ports", "port_of", "table", "delete_header", "busy")
+
+    def __init__(self, node_id: int, neighbors: Sequence[int]):
+        self.node_id = node_id
+        self.ports: List[int] = [node_id, *neighbors]
+        self.port_of: Dict[int, int] = {dst: port for port, dst in enumerate(self.ports) if port}
+        self.table: List[Tuple[int, ...]] = [()] * NUM_ADDRESSES
+        self.delete_header = bytearray(NUM_ADDRESSES)
+        self.busy = bytearray(len(self.ports))
+
+    def __repr__(self) -> str:
+        return f"Router(node=0x{self.node_id:02X}, ports={len(self.ports) - 1})"
+
+    @property
+    def num_ports(self) -> int:
+        """Link ports, not counting the configuration port."""
+        return len(self.ports) - 1
+
+    def set_route(self, address: int, ports: Sequence[int], delete_header: bool = False) -> None:
+        """Map a logical address to a port group."""
+        if not LOGICAL_ADDRESS_MIN <= address <= LOGICAL_ADDRESS_MAX:
+            raise ValueError(f"Logical address out of range: {address}")
+        for port in ports:
+            if not 0 <= port < len(self.ports):
+                raise ValueError(f"Router 0x{self.node_id:02X} has no port {port}")
+        self.table[address] = tuple(ports)
+        self.delete_header[address] = 1 if delete_header else 0
+
+    def lookup(self, address: int) -> Tuple[int, ...]:
+        """Candidate output ports for a header byte; empty if it cannot be routed."""
+        if address <= PATH_ADDRESS_MAX:
+            return (address,) if address < len(self.ports) else ()
+        return self.table[address]
+
+    def forward(self, header: bytes) -> Optional[Tuple[int, bytes]]:
+        """
+        Route a packet by its leading header byte.
+
+        Returns:
+            ``(output_port, header)`` where ``header`` is what the next
+            router sees, or None if the address is invalid and the packet
+            is spilled
+        """
+        if not header:
+            return None
+        address = header[0]
+        group = self.lookup(address)
+        if not group:
+            return None
+        port = group[0]
+        if len(group) > 1:
+            busy = self.busy
+            for candidate in group:
+                if not busy[candidate]:
+                    port = candidate
+                    break
+        if address <= PATH_ADDRESS_MAX or self.delete_header[address]:
+            header = header[1:]
+        return port, header
+
+
+class RouterNetwork:
+    """
+    Routers for every node of a topology, with compiled routing tables.
+
+    Each node is given a logical address, either from ``addresses`` or,
+    by default, its own id when all ids fit in 32-254, else 32, 33, ... in
+    id order. ``compile`` fills every router's table from hop-count
+    shortest paths: the entry for a destination lists all ports whose
+    neighbor is one hop closer, which is the group used for adaptive
+    routing. With ``delete_logical`` the destination's own router deletes
+    the address byte before delivery. Like RoutingTable, it records the
+    topology ``version`` and recompiles on the next lookup after the graph
+    changes.
+
+    Path addressing needs no tables and works for any network size, as
+    long as the ports used are 1-31. LinkSimulator and WormholeSimulator
+    route every hop through these routers when given ``routers``.
+    """
+
+    def __init__(
+        self,
+        topology: Topology,
+        addresses: Optional[Dict[int, int]] = None,
+        delete_logical: bool = False,
+    ):
+        self.topology = topology
+        self.delete_logical = delete_logical
+        self.address_of = dict(addresses) if addresses is not None else self._assign_addresses()
+        self.node_at: List[Optional[int]] = [None] * NUM_ADDRESSES
+        for node_id, address in self.address_of.items():
+            if not LOGICAL_ADDRESS_MIN <= address <= LOGICAL_ADDRESS_MAX:
+                raise ValueError(f"Logical address out of range: {address}")
+            if self.node_at[address] is not None:
+                raise ValueError(f"Logical address {address} assigned twice")
+            self.node_at[address] = node_id
+        self.routers: Dict[int, Router] = {}
+        self.built_version = -1
+        self.compile()
+
+    def _assign_addresses(self) -> Dict[int, int]:
+        node_ids = sorted(self.topology.node_ids())
+        capacity = LOGICAL_ADDRESS_MAX - LOGICAL_ADDRESS_MIN + 1
+        if len(node_ids) > capacity:
+            raise ValueError(
+                f"{len(node_ids)} nodes do not fit in {capacity} logical addresses; "
+                "pass addresses for a subset and use path addressing for the rest"
+            )
+        if all(LOGICAL_ADDRESS_MIN <= node_id <= LOGICAL_ADDRESS_MAX for node_id in node_ids):
+            return {node_id: node_id for node_id in node_ids}
+        return {node_id: LOGICAL_ADDRESS_MIN + i for i, node_id in enumerate(node_ids)}
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the topology changed since the tables were compiled."""
+        return self.built_version != self.topology.version
+
+    def compile(self) -> None:
+        """(Re)build every router and its routing table."""
+        csr = self.topology.to_csr()
+        ids = csr.node_ids.tolist()
+        indptr = csr.indptr.tolist()
+        targets = csr.node_ids[csr.indices].tolist()
+        self.routers = {
+            node_id: Router(node_id, targets[indptr[i] : indptr[i + 1]])
+            for i, node_id in enumerate(ids)
+        }
+
+        # Distances *to* each destination are BFS distances on the reversed graph.
+        sources = csr.edge_sources()
+        reverse = CSRAdjacency(csr.node_ids, *_reverse_arrays(csr.num_nodes, sources, csr.indices))
+        ports = np.arange(csr.num_edges) - csr.indptr[sources] + 1
+        for node_id, address in self.address_of.items():
+            dest = csr.index(node_id)
+            if dest is None:
+                continue
+            distance, _ = reverse.bfs(dest)
+            closer = distance[csr.indices] == distance[sources] - 1
+            closer &= distance[csr.indices] >= 0
+            on_path = np.flatnonzero(closer)
+            for src, port_group in _group_by_source(sources[on_path], ports[on_path]):
+                self.routers[ids[src]].set_route(address, port_group)
+            self.routers[node_id].set_route(address, (CONFIG_PORT,), self.delete_logical)
+        self.built_version = self.topology.version
+
+    def router(self, node_id: int) -> Router:
+        """Router at a node, recompiling first if the topology changed."""
+        if self.is_stale:
+            self.compile()
+        return self.routers[node_id]
+
+    def logical_header(self, dst_id: int) -> bytes:
+        """One-byte header that reaches ``dst_id`` by logical addressing."""
+        return bytes([self.address_of[dst_id]])
+
+    def path_header(self, path: Sequence[int]) -> bytes:
+        """
+        Path-address header for a node route: one port byte per hop, then
+        the configuration port to deliver at the last router.
+        """
+        header = bytearray()
+        for src_id, dst_id in zip(path, path[1:]):
+            port = self.router(src_id).port_of.get(dst_id)
+            if port is None:
+                raise ValueError(f"No link from 0x{src_id:02X} to 0x{dst_id:02X}")
+            if port > PATH_ADDRESS_MAX:
+                raise ValueError(f"Port {port} of router 0x{src_id:02X} cannot be path-addressed")
+            header.append(port)
+        header.append(CONFIG_PORT)
+        return bytes(header)
+
+    def trace(self, src_id: int, header: bytes, max_hops: int = 255) -> Optional[List[int]]:
+        """
+        Nodes a packet visits when injected at ``src_id``.
+
+        Returns None if a router spills the packet or it does not arrive
+        within ``max_hops`` hops.
+        """
+        node_id = src_id
+        visited = [node_id]
+        for _ in range(max_hops + 1):
+            decision = self.router(node_id).forward(header)
+            if decision is None:
+                return None
+            port, header = decision
+            if port == CONFIG_PORT:
+                return visited
+            node_id = self.routers[node_id].ports[port]
+            visited.append(node_id)
+        return None
+
+
+def _reverse_arrays(
+    num_nodes: int, sources: np.ndarray, targets: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """``(indptr, indices)`` of the graph with every edge reversed."""
+    order = np.argsort(targets, kind="stable")
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(targets, minlength=num_nodes), out=indptr[1:])
+    return indptr, sources[order]
+
+
+def _group_by_source(sources: np.ndarray, ports: np.ndarray) -> List[Tuple[int, List[int]]]:
+    """Split edge-aligned ports into ``(source, ports)`` runs; sources must be sorted."""
+    if not len(sources):
+        return []
+    starts = np.flatnonzero(np.diff(sources)) + 1
+    bounds = [0, *starts.tolist(), len(sources)]
+    src_list = sources.tolist()
+    port_list = ports.tolist()
+    return [(src_list[a], port_list[a:b]) for a, b in zip(bounds, bounds[1:])]
@@ -0,0 +1,993 @@
+"""Discrete-event network simulation on simulated time."""
+
+import heapq
+import random
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from spacewire.config import NetworkConfig, QoSConfig, SimulationConfig
+from spacewire.link import Link, LinkParameters
+from spacewire.metrics import MetricsCollector, QoSMetrics
+from spacewire.packet import PacketPriority, SpaceWirePacket
+from spacewire.router import CONFIG_PORT, Router, RouterNetwork
+from spacewire.topology import PathSelector, RoutingTable, Topology
+
+INJECT = 0
+"""A packet enters the network at its source node."""
+
+HOP = 1
+"""A packet arrives at an intermediate router."""
+
+DELIVER = 2
+"""A packet arrives at its destination node."""
+
+TX_DONE = 3
+"""A link finishes clocking a packet onto the line."""
+
+CREDIT = 4
+"""Flow-control credit for a packet's buffer space reaches the transmitter."""
+
+TAIL = 5
+"""The last character of a wormhole-switched packet reaches its destination."""
+
+
+class Simulator:
+    """
+    Discrete-event simulator for packets crossing a topology.
+
+    Pending events are ``(time, sequence, kind, packet, link)`` tuples in
+    a binary heap, so the next event is popped in O(log n) and events at
+    the same time run in the order they were scheduled. ``kind`` indexes
+    ``handlers``; subclasses add event kinds by appending handlers.
+    Simulated time only advances when an event is popped, so a run takes
+    as long as the CPU needs to process its events, independent of the
+    simulated duration.
+
+    Packets are kept as parallel lists indexed by packet id, and are
+    routed hop by hop with the next-hop table of a RoutingTable. With a
+    ``path_selector`` each packet instead gets a source route when it
+    enters the network, chosen per flow by ``PathSelector.select``, so
+    traffic spreads over equal-cost or k-shortest paths; routes are not
+    revised if the topology changes while a packet is in flight. Each hop
+    takes ``hop_delay``: ``hop_latency`` plus a uniform jitter of up to
+    ``jitter``. The metrics collector is switched to the simulated clock,
+    so its latencies, runtime and throughput are all in simulated seconds;
+    so is ``qos_metrics``, which if given also records each delivery by
+    priority and virtual channel.
+    """
+
+    def __init__(
+        self,
+        topology: Topology,
+        metrics: Optional[MetricsCollector] = None,
+        hop_latency: float = 1e-3,
+        jitter: float = 0.0,
+        seed: Optional[int] = None,
+        routing: Optional[RoutingTable] = None,
+        qos_metrics: Optional[QoSMetrics] = None,
+        path_selector: Optional[PathSelector] = None,
+    ):
+        self.topology = topology
+        self.routing = routing or RoutingTable(topology)
+        self.path_selector = path_selector
+        self.metrics = metrics if metrics is not None else MetricsCollector()
+        self.qos_metrics = qos_metrics
+        self.hop_latency = hop_latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+
+        self.now = 0.0
+        self.events_processed = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._queue: List[Tuple[float, int, int, int, int]] = []
+        self._sequence = 0
+        self.handlers: List[Callable[[int, int], None]] = [
+            self._on_inject,
+            self._forward,
+            self._on_deliver,
+        ]
+
+        self.packet_src: List[int] = []
+        self.packet_dst: List[int] = []
+        self.packet_size: List[int] = []
+        self.packet_priority: List[int] = []
+        self.packet_vc: List[int] = []
+        self.packet_sent: List[float] = []
+        self.packet_received: List[float] = []
+        self.packet_node: List[int] = []
+        self.packet_hops: List[int] = []
+        self.packet_flow: List[Any] = []
+        self.packet_route: List[Optional[List[int]]] = []
+
+        self._arrival_time: List[float] = []
+        self._arrival_packet: List[int] = []
+        self._next_arrival = 0
+
+        self._rows: List[Optional[List[int]]] = []
+        self._node_ids: List[int] = list(self.routing.node_ids)
+        self._routing_version = -1
+        self._fixed_delay: Optional[float] = None
+        self.metrics.set_clock(self.clock)
+        if qos_metrics is not None:
+            qos_metrics.set_clock(self.clock)
+
+    @classmethod
+    def from_config(cls, topology: Topology, config: SimulationConfig, **kwargs) -> "Simulator":
+        """Simulator with per-hop latency and jitter from a SimulationConfig."""
+        kwargs.setdefault("hop_latency", config.latency_base)
+        kwargs.setdefault("jitter", config.latency_variance)
+        return cls(topology, **kwargs)
+
+    def clock(self) -> float:
+        """Current simulated time."""
+        return self.now
+
+    @property
+    def pending(self) -> int:
+        """Number of scheduled events not yet processed."""
+        return len(self._queue) + len(self._arrival_time) - self._next_arrival
+
+    @property
+    def num_packets(self) -> int:
+        return len(self.packet_src)
+
+    @property
+    def in_flight(self) -> int:
+        """Injected packets neither delivered nor dropped yet."""
+        return self.num_packets - self.delivered - self.dropped
+
+    def latency(self, packet: int) -> Optional[float]:
+        """End-to-end latency of a delivered packet, else None."""
+        received = self.packet_received[packet]
+        return received - self.packet_sent[packet] if received >= 0 else None
+
+    def schedule(self, time: float, kind: int, packet: int, link: int = -1) -> None:
+        """
+        Queue an event; ``time`` must not be earlier than ``now``.
+
+        The handler for ``kind`` is called as ``handler(packet, link)``;
+        ``link`` is -1 for events that do not concern a link.
+        """
+        if time < self.now:
+            raise ValueError(f"Cannot schedule at {time}, before the current time {self.now}")
+        self._sequence += 1
+        heapq.heappush(self._queue, (time, self._sequence, kind, packet, link))
+
+    def inject(
+        self,
+        src_id: int,
+        dst_id: int,
+        size: int,
+        at: Optional[float] = None,
+        priority: PacketPriority = PacketPriority.NORMAL,
+        virtual_channel: Optional[int] = None,
+        flow: Any = None,
+    ) -> int:
+        """
+        Schedule one packet to enter the network.
+
+        Without ``virtual_channel`` the packet uses its priority's
+        channel (see ``priority_vcs``). ``flow`` is the flow key passed
+        to the path selector.
+
+        Returns:
+            The packet id
+
+        Raises:
+            ValueError: If ``at`` is earlier than the current time or
+                ``virtual_channel`` is out of range
+        """
+        time = self.now if at is None else at
+        if time < self.now:
+            raise ValueError(f"Cannot inject at {time}, before the current time {self.now}")
+        if virtual_channel is None:
+            virtual_channel = self.priority_vcs()[priority.value]
+        elif not 0 <= virtual_channel < self.num_vcs:
+            raise ValueError(f"Virtual channel {virtual_channel} out of range")
+        index_of = self.routing.index_of
+        src, dst = index_of[src_id], index_of[dst_id]
+        packet = len(self.packet_src)
+        self.packet_src.append(src)
+        self.packet_dst.append(dst)
+        self.packet_size.append(size)
+        self.packet_priority.append(priority.value)
+        self.packet_vc.append(virtual_channel)
+        self.packet_sent.append(0.0)
+        self.packet_received.append(-1.0)
+        self.packet_node.append(src)
+        self.packet_hops.append(0)
+        self.packet_flow.append(flow)
+        self.packet_route.append(None)
+        self.schedule(time, INJECT, packet)
+        return packet
+
+    def inject_many(
+        self,
+        src_ids: Sequence[int],
+        dst_ids: Sequence[int],
+        sizes: Sequence[int],
+        times: Sequence[float],
+        priorities: Optional[Sequence[int]] = None,
+        virtual_channels: Optional[Sequence[int]] = None,
+        flows: Optional[Sequence[Any]] = None,
+    ) -> range:
+        """
+        Schedule many packets at once.
+
+        Arrays may be NumPy arrays or sequences; ``priorities`` holds
+        PacketPriority values, ``virtual_channels`` defaults to each
+        priority's channel and ``flows`` to None. Bulk injections are kept in a time-sorted
+        arrival stream that ``run`` merges with the event heap, so the heap
+        only holds packets in flight and stays small however many packets
+        are queued up front. Call this between runs, not from a handler.
+
+        Returns:
+            The range of new packet ids
+        """
+        src = self._indices(src_ids)
+        dst = self._indices(dst_ids)
+        time_array = np.asarray(times, dtype=np.float64)
+        count = len(time_array)
+        if count and time_array.min() < self.now:
+            raise ValueError(f"Cannot inject before the current time {self.now}")
+        vc_array: Optional[np.ndarray] = None
+        if virtual_channels is not None:
+            vc_array = np.asarray(virtual_channels, dtype=np.int64)
+            if len(vc_array) and (vc_array.min() < 0 or vc_array.max() >= self.num_vcs):
+                raise ValueError("Virtual channel out of range")
+        first = len(self.packet_src)
+
+        src_list = src.tolist()
+        self.packet_src.extend(src_list)
+        self.packet_dst.extend(dst.tolist())
+        self.packet_size.extend(np.asarray(sizes, dtype=np.int64).tolist())
+        if priorities is None:
+            priority_array = np.full(count, PacketPriority.NORMAL.value, dtype=np.int64)
+        else:
+            priority_array = np.asarray(priorities, dtype=np.int64)
+        self.packet_priority.extend(priority_array.tolist())
+        if vc_array is None:
+            self.packet_vc.extend(np.asarray(self.priority_vcs())[priority_array].tolist())
+        else:
+            self.packet_vc.extend(vc_array.tolist())
+        self.packet_sent.extend([0.0] * count)
+        self.packet_received.extend([-1.0] * count)
+        self.packet_node.extend(src_list)
+        self.packet_hops.extend([0] * count)
+        self.packet_flow.extend([None] * count if flows is None else list(flows))
+        self.packet_route.extend([None] * count)
+
+        pending = self._next_arrival
+        arrival_time = np.concatenate([self._arrival_time[pending:], time_array])
+        arrival_packet = np.concatenate(
+            [
+                np.asarray(self._arrival_packet[pending:], dtype=np.int64),
+                np.arange(first, first + count, dtype=np.int64),
+            ]
+        )
+        order = np.argsort(arrival_time, kind="stable")
+        self._arrival_time = arrival_time[order].tolist()
+        self._arrival_packet = arrival_packet[order].tolist()
+        self._next_arrival = 0
+        return range(first, first + count)
+
+    @property
+    def num_vcs(self) -> int:
+        """Number of virtual channels packets may be injected on."""
+        return 1
+
+    def priority_vcs(self) -> List[int]:
+        """Virtual channel for each PacketPriority value; one channel here."""
+        return [0] * len(PacketPriority)
+
+    def _indices(self, node_ids: Sequence[int]) -> np.ndarray:
+        """Routing-table indices of an array of node ids."""
+        known = np.asarray(self.routing.node_ids, dtype=np.int64)
+        ids = np.asarray(node_ids, dtype=np.int64)
+        index = np.searchsorted(known, ids)
+        if len(ids) and (not len(known) or (known[np.minimum(index, len(known) - 1)] != ids).any()):
+            raise KeyError("Packet endpoint is not a node of the topology")
+        return index
+
+    def run(self, until: Optional[float] = None, max_events: Optional[int] = None) -> int:
+        """
+        Process events in time order.
+
+        Args:
+            until: Stop before the first event later than this time; the
+                clock is then advanced to ``until``
+            max_events: Stop after this many events
+
+        Returns:
+            Number of events processed
+        """
+        self._sync_routing()
+        queue = self._queue
+        handlers = self.handlers
+        on_inject = self._on_inject
+        pop = heapq.heappop
+        arrival_time = self._arrival_time
+        arrival_packet = self._arrival_packet
+        next_arrival = self._next_arrival
+        arrivals = len(arrival_time)
+        limit = float("inf") if until is None else until
+        budget = -1 if max_events is None else max_events
+        processed = 0
+
+        while processed != budget:
+            if next_arrival < arrivals and (not queue or arrival_time[next_arrival] <= queue[0][0]):
+                time = arrival_time[next_arrival]
+                if time > limit:
+                    break
+                self.now = time
+                next_arrival += 1
+                on_inject(arrival_packet[next_arrival - 1], -1)
+            elif queue and queue[0][0] <= limit:
+                time, _, kind, packet, link = pop(queue)
+                self.now = time
+                handlers[kind](packet, link)
+            else:
+                break
+            processed += 1
+
+        self._next_arrival = next_arrival
+        if until is not None and processed != budget and until > self.now:
+            self.now = until
+        self.events_processed += processed
+        return processed
+
+    def hop_delay(self, node: int, next_node: int, packet: int) -> float:
+        """Time for ``packet`` to cross the link from index ``node`` to ``next_node``."""
+        if self.jitter:
+            return self.hop_latency + self.rng.uniform(0.0, self.jitter)
+        return self.hop_latency
+
+    def _sync_routing(self) -> None:
+        """Drop cached next-hop rows if the routing table was rebuilt."""
+        routing = self.routing
+        if routing.is_stale:
+            routing.build()
+        if self._routing_version != routing.built_version:
+            if routing.node_ids != self._node_ids:
+                self._renumber(routing.node_ids)
+            self._rows = [None] * len(routing.node_ids)
+            self._routing_version = routing.built_version
+        # Skip the hop_delay call per hop unless it can return something else.
+        self._fixed_delay = (
+            self.hop_latency
+            if not self.jitter and type(self).hop_delay is Simulator.hop_delay
+            else None
+        )
+
+    def next_hop(self, node: int, dst: int) -> int:
+        """Next node index from ``node`` towards ``dst``; -1 if unreachable."""
+        row = self._rows[node]
+        if row is None:
+            row = self._rows[node] = self.routing.next_hops[node].tolist()
+        return row[dst]
+
+    def _renumber(self, node_ids: List[int]) -> None:
+        """Move packet node indices to a new routing index after nodes were added."""
+        if self.packet_src:
+            remap = np.searchsorted(np.asarray(node_ids), np.asarray(self._node_ids))
+            for column in (self.packet_src, self.packet_dst, self.packet_node):
+                column[:] = remap[np.asarray(column)].tolist()
+            routes = self.packet_route
+            for packet, route in enumerate(routes):
+                if route is not None:
+                    routes[packet] = remap[route].tolist()
+        self._node_ids = list(node_ids)
+
+    def route(self, packet: int) -> Optional[List[int]]:
+        """Node ids of a packet's source route, if it was given one."""
+        route = self.packet_route[packet]
+        if route is None:
+            return None
+        node_ids = self.routing.node_ids
+        return [node_ids[node] for node in route]
+
+    def _next_node(self, packet: int, node: int) -> int:
+        """Next node index of a packet at ``node``; -1 if it cannot be routed."""
+        route = self.packet_route[packet]
+        if route is not None:
+            return route[self.packet_hops[packet] + 1]
+        row = self._rows[node]
+        if row is None:
+            row = self._rows[node] = self.routing.next_hops[node].tolist()
+        return row[self.packet_dst[packet]]
+
+    def _start_route(self, packet: int) -> None:
+        """Give a packet entering the network its source route, if paths are selected."""
+        if self.path_selector is None:
+            return
+        node_ids = self.routing.node_ids
+        path = self.path_selector.select(
+            node_ids[self.packet_src[packet]],
+            node_ids[self.packet_dst[packet]],
+            self.packet_flow[packet],
+        )
+        if path is not None:
+            index_of = self.routing.index_of
+            self.packet_route[packet] = [index_of[node_id] for node_id in path]
+
+    def _forward(self, packet: int, link: int = -1) -> None:
+        """Send a packet over the next link of its route (also the HOP handler)."""
+        node = self.packet_node[packet]
+        dst = self.packet_dst[packet]
+        route = self.packet_route[packet]
+        if route is None:
+            row = self._rows[node]
+            if row is None:
+                row = self._rows[node] = self.routing.next_hops[node].tolist()
+            next_node = row[dst]
+            if next_node < 0:
+                self.dropped += 1
+                return
+        else:
+            next_node = route[self.packet_hops[packet] + 1]
+        self.packet_node[packet] = next_node
+        self.packet_hops[packet] += 1
+        delay = self._fixed_delay
+        if delay is None:
+            delay = self.hop_delay(node, next_node, packet)
+        self._sequence += 1
+        heapq.heappush(
+            self._queue,
+            (self.now + delay, self._sequence, DELIVER if next_node == dst else HOP, packet, -1),
+        )
+
+    def _on_inject(self, packet: int, link: int = -1) -> None:
+        self.packet_sent[packet] = self.now
+        self.metrics.record_sent(self.packet_size[packet])
+        self._start_route(packet)
+        if self.packet_src[packet] == self.packet_dst[packet]:
+            self._on_deliver(packet)
+        else:
+            self._forward(packet)
+
+    def _on_deliver(self, packet: int, link: int = -1) -> None:
+        self.delivered += 1
+        self.packet_received[packet] = self.now
+        latency = self.now - self.packet_sent[packet]
+        self.metrics.record_received(latency, self.packet_size[packet])
+        if self.qos_metrics is not None:
+            self.qos_metrics.record_priority(self.packet_priority[packet], latency)
+            self.qos_metrics.record_vc(self.packet_vc[packet], latency, self.packet_size[packet])
+
+
+class LinkSimulator(Simulator):
+    """
+    Simulator with a link-layer model on every directed link.
+
+    Each hop is store-and-forward over a Link: the packet waits in the
+    link's queue until the transmitter is free and the receiver has
+    announced credit for it. It then takes its serialization delay to
+    send (TX_DONE) and arrives one propagation delay after its last bit.
+    The buffer space it held at the previous router is credited back
+    when it has been sent on (or consumed at the destination), one
+    propagation delay later (CREDIT). Serialization caps each link's
+    throughput, and a full receiver stalls its transmitter, so congestion
+    backs up towards the sources.
+
+    Each link shares its bandwidth between virtual channels with its
+    scheduler (see Link). Router queues refuse packets beyond
+    ``queue_limit``, which count as dropped; packets waiting at their
+    source are not limited.
+
+    ``params`` applies to every link; ``configure_link`` overrides single
+    links. Shortest-path routing with finite buffers can deadlock on
+    cyclic topologies; packets stuck that way stay in ``in_flight``.
+
+    With ``routers`` every hop is decided by the RouterNetwork instead:
+    each packet carries a SpaceWire header, and the router at its node
+    forwards it with ``Router.forward``, whose ``busy`` flags mirror
+    ``Link.busy`` so group adaptive routing avoids links that are
+    sending. The header is the packet's ``route`` byte (``inject_packet``),
+    the path address of its selected route, its destination's logical
+    address or, failing that, the path address of its shortest path.
+    Packets a router spills, or delivers anywhere but at their
+    destination, are dropped.
+    """
+
+    def __init__(
+        self,
+        topology: Topology,
+        params: Optional[LinkParameters] = None,
+        metrics: Optional[MetricsCollector] = None,
+        seed: Optional[int] = None,
+        routing: Optional[RoutingTable] = None,
+        qos_metrics: Optional[QoSMetrics] = None,
+        path_selector: Optional[PathSelector] = None,
+        routers: Optional[RouterNetwork] = None,
+    ):
+        self.params = params or LinkParameters()
+        self.routers = routers
+        super().__init__(
+            topology,
+            metrics,
+            hop_latency=0.0,
+            seed=seed,
+            routing=routing,
+            qos_metrics=qos_metrics,
+            path_selector=path_selector,
+        )
+        self.links: List[Link] = []
+        self._link_by_ids: Dict[Tuple[int, int], Link] = {}
+        self._overrides: Dict[Tuple[int, int], LinkParameters] = {}
+        self._link_of: List[Dict[int, int]] = []
+        self._vc_maps: Dict[int, List[int]] = {}
+        self._links_version = -1
+        self.packet_in_link: List[int] = []
+        self.packet_header: List[bytes] = []
+        self._router_links: Dict[int, Tuple[Router, List[Link]]] = {}
+        self.handlers.extend([self._on_tx_done, self._on_credit])
+        self._build_links()
+
+    @classmethod
+    def from_network_config(
+        cls,
+        topology: Topology,
+        network: NetworkConfig,
+        qos: Optional[QoSConfig] = None,
+        **kwargs: Any,
+    ) -> "LinkSimulator":
+        """
+        Simulator with link settings from a NetworkConfig.
+
+        Each entry of ``network.links`` names ``src`` and ``dst`` (and
+        optionally ``bidirectional``, default True) plus the
+        LinkParameters fields to override on that link. Called on
+        LinkSimulator itself, ``network.switching == "wormhole"`` gives a
+        WormholeSimulator.
+        """
+        if cls is LinkSimulator and network.switching == "wormhole":
+            cls = WormholeSimulator
+        elif network.switching not in ("store_and_forward", "wormhole"):
+            raise ValueError(f"Unknown switching mode: {network.switching}")
+        sim = cls(topology, LinkParameters.from_config(network, qos), **kwargs)
+        for entry in network.links:
+            entry = dict(entry)
+            src_id, dst_id = entry.pop("src"), entry.pop("dst")
+            sim.configure_link(src_id, dst_id, entry.pop("bidirectional", True), **entry)
+        return sim
+
+    def configure_link(
+        self, src_id: int, dst_id: int, bidirectional: bool = True, **params: Any
+    ) -> None:
+        """Override LinkParameters fields for one link before it carries traffic."""
+        pairs = [(src_id, dst_id), (dst_id, src_id)] if bidirectional else [(src_id, dst_id)]
+        for pair in pairs:
+            base = self._overrides.get(pair, self.params)
+            self._overrides[pair] = base.override(**params)
+            link = self._link_by_ids.get(pair)
+            if link is not None:
+                if link.packets_sent or link.queued:
+                    raise ValueError(f"Link {pair[0]}->{pair[1]} is already carrying traffic")
+                replacement = Link(link.index, link.src, link.dst, self._overrides[pair])
+                self.links[link.index] = self._link_by_ids[pair] = replacement
+                self._map_vcs(replacement)
+        self._router_links.clear()
+
+    def link(self, src_id: int, dst_id: int) -> Optional[Link]:
+        """Link state for a directed node pair."""
+        return self._link_by_ids.get((src_id, dst_id))
+
+    def link_stats(self) -> List[Dict[str, Any]]:
+        """Per-link counters, with utilization over the simulated time so far."""
+        return [link.stats(self.now) for link in self.links]
+
+    def inject(self, *args: Any, **kwargs: Any) -> int:
+        packet = super().inject(*args, **kwargs)
+        self.packet_in_link.append(-1)
+        self.packet_header.append(b"")
+        return packet
+
+    def inject_many(self, *args: Any, **kwargs: Any) -> range:
+        packets = super().inject_many(*args, **kwargs)
+        self.packet_in_link.extend([-1] * len(packets))
+        self.packet_header.extend([b""] * len(packets))
+        return packets
+
+    def inject_packet(
+        self, packet: SpaceWirePacket, at: Optional[float] = None, flow: Any = None
+    ) -> int:
+        """
+        Schedule a SpaceWire or SpaceFibre packet to enter the network.
+
+        A non-zero ``route`` byte is the header the routers forward it
+        by: a logical address, or a port for a single hop.
+        """
+        index = self.inject(
+            packet.src, packet.dst, len(packet.data), at, packet.priority, flow=flow
+        )
+        if packet.route:
+            self.packet_header[index] = bytes([packet.route])
+        return index
+
+    @property
+    def num_vcs(self) -> int:
+        return self.params.virtual_channels
+
+    def priority_vcs(self) -> List[int]:
+        """Virtual channel for each PacketPriority value, from the default link settings."""
+        return [self.params.vc_of_priority(priority.value) for priority in PacketPriority]
+
+    def _map_vcs(self, link: Link) -> None:
+        """
+        Record how a link with its own channel layout maps packet channels.
+
+        Packet channels follow the default link settings; on a link with
+        a different layout a packet uses that link's first channel of the
+        packet's priority class.
+        """
+        params, base = link.params, self.params
+        if (params.virtual_channels, params.num_priorities) == (
+            base.virtual_channels,
+            base.num_priorities,
+        ):
+            self._vc_maps.pop(link.index, None)
+        else:
+            self._vc_maps[link.index] = [
+                params.vc_of_priority(base.priority_of_vc(vc))
+                for vc in range(base.virtual_channels)
+            ]
+
+    def _link_vc(self, packet: int, link: Link) -> int:
+        """Channel a packet uses on ``link``."""
+        vc_map = self._vc_maps.get(link.index)
+        vc = self.packet_vc[packet]
+        return vc if vc_map is None else vc_map[vc]
+
+    def _sync_routing(self) -> None:
+        super()._sync_routing()
+        if self._links_version != self.topology.version:
+            self._build_links()
+
+    def _build_links(self) -> None:
+        """Create Link state for new edges and index links by routing position."""
+        index_of = self.routing.index_of
+        link_of: List[Dict[int, int]] = [{} for _ in self.routing.node_ids]
+        for src_id, dsts in self.topology.edges.items():
+            for dst_id in dsts:
+                link = self._link_by_ids.get((src_id, dst_id))
+                if link is None:
+                    params = self._overrides.get((src_id, dst_id), self.params)
+                    link = Link(len(self.links), src_id, dst_id, params)
+                    self.links.append(link)
+                    self._map_vcs(link)
+                    self._link_by_ids[(src_id, dst_id)] = link
+                link_of[index_of[src_id]][index_of[dst_id]] = link.index
+        self._link_of = link_of
+        self._links_version = self.topology.version
+        self._router_links.clear()
+
+    def _start_route(self, packet: int) -> None:
+        super()._start_route(packet)
+        if self.routers is not None and not self.packet_header[packet]:
+            self.packet_header[packet] = self._header(packet)
+
+    def _header(self, packet: int) -> bytes:
+        """Default SpaceWire header for a packet; empty if none can address its route."""
+        routers = self.routers
+        assert routers is not None
+        node_ids = self.routing.node_ids
+        route = self.route(packet)
+        dst_id = node_ids[self.packet_dst[packet]]
+        if route is None:
+            if dst_id in routers.address_of:
+                return routers.logical_header(dst_id)
+            route = self.routing.path(node_ids[self.packet_src[packet]], dst_id)
+            if route is None:
+                return b""
+        try:
+            return routers.path_header(route)
+        except ValueError:
+            return b""
+
+    def _router_at(self, node: int) -> Tuple[Router, List[Link]]:
+        """Router at a node index and the Link behind each of its ports."""
+        assert self.routers is not None
+        router = self.routers.router(self.routing.node_ids[node])
+        cached = self._router_links.get(node)
+        if cached is None or cached[0] is not router:
+            link_of, index_of = self._link_of[node], self.routing.index_of
+            links = [self.links[link_of[index_of[dst_id]]] for dst_id in router.ports[1:]]
+            cached = self._router_links[node] = (router, links)
+        return cached
+
+    def _next_node(self, packet: int, node: int) -> int:
+        if self.routers is None:
+            return super()._next_node(packet, node)
+        router, links = self._router_at(node)
+        busy = router.busy
+        for port, link in enumerate(links, 1):
+            busy[port] = link.busy
+        decision = router.forward(self.packet_header[packet])
+        if decision is None:
+            return -1
+        port, self.packet_header[packet] = decision
+        if port == CONFIG_PORT:
+            return -1
+        return self.routing.index_of[router.ports[port]]
+
+    def _forward(self, packet: int, link: int = -1) -> None:
+        node = self.packet_node[packet]
+        index = self._link_of[node].get(self._next_node(packet, node))
+        if index is None:
+            self.dropped += 1
+            self._release(packet)
+            return
+        out = self.links[index]
+        size = self.packet_size[packet]
+        if not out.enqueue(
+            packet,
+            self._link_vc(packet, out),
+            out.params.credit_cost(size),
+            size,
+            self.packet_hops[packet] > 0,
+        ):
+            self.dropped += 1
+            self._release(packet)
+            return
+        if not out.busy:
+            self._transmit(out)
+
+    def _transmit(self, link: Link) -> None:
+        """Start the next packet on an idle link, if one has credit."""
+        choice = link.select()
+        if choice is None:
+            if link.queued:
+                link.stall(self.now)
+            return
+        vc, packet, cost = choice
+        delay = link.start(vc, self.packet_size[packet], cost, self.now)
+        next_node = self.routing.index_of[link.dst]
+        self.packet_node[packet] = next_node
+        self.packet_hops[packet] += 1
+        done = self.now + delay
+        self.schedule(done, TX_DONE, packet, link.index)
+        self.schedule(
+            done + link.params.propagation_delay,
+            DELIVER if next_node == self.packet_dst[packet] else HOP,
+            packet,
+            link.index,
+        )
+
+    def _release(self, packet: int) -> None:
+        """Return the buffer credit a packet holds on the link it arrived over."""
+        held = self.packet_in_link[packet]
+        if held >= 0:
+            self.schedule(
+                self.now + self.links[held].params.propagation_delay, CREDIT, packet, held
+            )
+
+    def _on_tx_done(self, packet: int, link: int) -> None:
+        self._release(packet)
+        self.packet_in_link[packet] = link
+        out = self.links[link]
+        out.busy = False
+        self._transmit(out)
+
+    def _on_credit(self, packet: int, link: int) -> None:
+        out = self.links[link]
+        vc = self._link_vc(packet, out)
+        out.credits[vc] += out.params.credit_cost(self.packet_size[packet])
+        if not out.busy:
+            self._transmit(out)
+
+    def _on_deliver(self, packet: int, link: int = -1) -> None:
+        super()._on_deliver(packet, link)
+        self._release(packet)
+
+
+class WormholeSimulator(LinkSimulator):
+    """
+    Simulator with wormhole-switched routers.
+
+    A router forwards a packet as soon as its routing header is in
+    (``LinkParameters.header_delay``), reserving the output link for that
+    packet until the tail has passed. If the output link is held, the
+    header waits in the link's queue and the packet keeps every link it
+    already holds: a blocked header stalls its whole path, and packets
+    queued behind any of those links are head-of-line blocked too.
+
+    Once the header reaches the destination the whole path is held and
+    the body streams at the rate of the slowest link on it; the tail
+    arrives after that link's serialization delay (less the header
+    already sent), and every link on the path is released then. Router
+    buffers are assumed small next to packets, so a worm always spans
+    its path. Only reservations are modelled, not credits: a link is
+    either free or held, so virtual channels only order the waiting
+    headers. Each packet costs one event per hop plus one for its tail.
+
+    ``packet_blocked`` is the time each packet's header spent waiting
+    for output links, and each Link's ``hol_time`` the time it was held
+    by a packet whose header was blocked further on, i.e. idle but
+    unavailable to anyone else. Shortest-path routing on cyclic
+    topologies can deadlock; ``blocked_paths`` and ``find_deadlock``
+    show which packets wait on which.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.packet_path: List[List[int]] = []
+        self.packet_tail: List[float] = []
+        self.packet_blocked: List[float] = []
+        self._blocked_since: List[float] = []
+        self._waiting_for: Dict[int, int] = {}
+        self.handlers.append(self._on_tail)
+        self._cache_links()
+
+    def inject(self, *args: Any, **kwargs: Any) -> int:
+        packet = super().inject(*args, **kwargs)
+        self.packet_path.append([])
+        self.packet_tail.append(0.0)
+        self.packet_blocked.append(0.0)
+        self._blocked_since.append(-1.0)
+        return packet
+
+    def inject_many(self, *args: Any, **kwargs: Any) -> range:
+        packets = super().inject_many(*args, **kwargs)
+        count = len(packets)
+        self.packet_path.extend([] for _ in packets)
+        self.packet_tail.extend([0.0] * count)
+        self.packet_blocked.extend([0.0] * count)
+        self._blocked_since.extend([-1.0] * count)
+        return packets
+
+    def configure_link(self, *args: Any, **kwargs: Any) -> None:
+        super().configure_link(*args, **kwargs)
+        self._cache_links()
+
+    def _sync_routing(self) -> None:
+        built = self._links_version
+        super()._sync_routing()
+        if self._links_version != built:
+            self._cache_links()
+
+    def _cache_links(self) -> None:
+        """Per-link header delays and routing indices, read once per hop."""
+        index_of = self.routing.index_of
+        self._header_delay = [
+            link.params.header_delay() + link.params.propagation_delay for link in self.links
+        ]
+        self._link_dst = [index_of[link.dst] for link in self.links]
+        self._body_delay: Dict[Tuple[int, int], float] = {}
+
+    @property
+    def hol_blocking_time(self) -> float:
+        """Link time lost to held-but-blocked paths, summed over all links."""
+        return sum(link.hol_time for link in self.links)
+
+    def blocking_stats(self) -> Dict[str, Any]:
+        """Summary of header blocking over all packets injected so far."""
+        blocked = [wait for wait in self.packet_blocked if wait > 0]
+        return {
+            "blocked_packets": len(blocked),
+            "currently_blocked": len(self._waiting_for),
+            "mean_wait": sum(blocked) / len(blocked) if blocked else 0.0,
+            "max_wait": max(blocked, default=0.0),
+            "hol_blocking_time": self.hol_blocking_time,
+        }
+
+    def blocked_paths(self) -> List[Dict[str, Any]]:
+        """Packets whose header is waiting now, with the links they hold."""
+        links = self.links
+        return [
+            {
+                "packet": packet,
+                "waiting_for": (links[link].src, links[link].dst),
+                "holder": links[link].holder,
+                "held": [(links[i].src, links[i].dst) for i in self.packet_path[packet]],
+                "since": self._blocked_since[packet],
+            }
+            for packet, link in self._waiting_for.items()
+        ]
+
+    def find_deadlock(self) -> Optional[List[int]]:
+        """
+        A cycle of packets each waiting for a link held by the next, if any.
+
+        Follows the wait-for chain from every blocked packet; each packet
+        is visited once, so this is linear in the number blocked.
+        """
+        waiting_for = self._waiting_for
+        links = self.links
+        done: Set[int] = set()
+        for start in waiting_for:
+            chain: Dict[int, int] = {}
+            packet = start
+            while packet in waiting_for and packet not in done and packet not in chain:
+                chain[packet] = len(chain)
+                packet = links[waiting_for[packet]].holder
+            if packet in chain:
+                return list(chain)[chain[packet] :]
+            done.update(chain)
+        return None
+
+    def _forward(self, packet: int, link: int = -1) -> None:
+        """Route a packet's header at its current node (also the HOP handler)."""
+        node = self.packet_node[packet]
+        index = self._link_of[node].get(self._next_node(packet, node))
+        if index is None:
+            self.dropped += 1
+            self._release_path(packet)
+            return
+        out = self.links[index]
+        if out.holder < 0:
+            self._advance(packet, out)
+        elif not out.enqueue(
+            packet,
+            self._link_vc(packet, out),
+            0,
+            self.packet_size[packet],
+            self.packet_hops[packet] > 0,
+        ):
+            self.dropped += 1
+            self._release_path(packet)
+        else:
+            self._blocked_since[packet] = self.now
+            self._waiting_for[packet] = out.index
+
+    def _advance(self, packet: int, out: Link) -> None:
+        """Reserve ``out`` for a packet and send its header across."""
+        now = self.now
+        path = self.packet_path[packet]
+        if self._blocked_since[packet] >= 0:
+            wait = now - self._blocked_since[packet]
+            self.packet_blocked[packet] += wait
+            links = self.links
+            for held in path:
+                links[held].hol_time += wait
+            self._blocked_since[packet] = -1.0
+            del self._waiting_for[packet]
+        index = out.index
+        size = self.packet_size[packet]
+        out.reserve(packet, size, now)
+        path.append(index)
+        body = self._body_delay.get((index, size))
+        if body is None:
+            body = self._body_delay[index, size] = (
+                out.params.serialization_delay(size) - out.params.header_delay()
+            )
+        if body > self.packet_tail[packet]:
+            self.packet_tail[packet] = body
+
+        next_node = self._link_dst[index]
+        self.packet_node[packet] = next_node
+        self.packet_hops[packet] += 1
+        self._sequence += 1
+        heapq.heappush(
+            self._queue,
+            (
+                now + self._header_delay[index],
+                self._sequence,
+                DELIVER if next_node == self.packet_dst[packet] else HOP,
+                packet,
+                index,
+            ),
+        )
+
+    def _release_path(self, packet: int) -> None:
+        """Free every link a packet holds and hand each to its next waiter."""
+        now = self.now
+        links = self.links
+        for index in self.packet_path[packet]:
+            link = links[index]
+            link.release(now)
+            choice = link.select()
+            if choice is not None:
+                vc, waiting, _ = choice
+                link.dequeue(vc)
+                self._advance(waiting, link)
+        self.packet_path[packet] = []
+
+    def _on_deliver(self, packet: int, link: int = -1) -> None:
+        """The header is at the destination; the body follows at the bottleneck rate."""
+        self.schedule(self.now + self.packet_tail[packet], TAIL, packet, link)
+
+    def _on_tail(self, packet: int, link: int) -> None:
+        Simulator._on_deliver(self, packet, link)
+        self._release_path(packet)
@@ -1,11 +1,22 @@
 """Network topology definitions and routing algorithms."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Tuple, Any
+from typing import AbstractSet, Dict, Iterable, List, Set, Optional, Sequence, Tuple, Any
 from enum import Enum
 from collections import deque
+import heapq
+import math
+from itertools import combinations
 import random
 
+import numpy as np
+
+from spacewire.csr import BFS_BLOCK_SIZE, AllPairsPaths, CSRAdjacency
+
+
+_COST_EPSILON = 1e-9
+"""Tolerance when comparing float path costs for equality."""
+
 
 class TopologyType(Enum):
     """Supported network topology types."""
@@ -16,6 +27,10 @@ class TopologyType(Enum):
     POINT_TO_POINT = "point-to-point"
     BUS = "bus"
     HYBRID = "hybrid"
+    FAT_TREE = "fat-tree"
+    TORUS = "torus"
+    GEOMETRIC = "geometric"
+    DUAL_PLANE = "dual-plane"
 
 
 @dataclass
@@ -37,6 +52,71 @@ class Node:
         return self.id == other.id
 
 
+class DisjointSet:
+    """
+    Union-find over node ids with union by size and path halving.
+
+    ``find`` and ``union`` run in amortized O(alpha(n)), and the number of
+    disjoint sets is tracked as elements are added and merged.
+    """
+
+    __slots__ = ("parent", "size", "count")
+
+    def __init__(self, elements: Iterable[int] = ()):
+        self.parent: Dict[int, int] = {}
+        self.size: Dict[int, int] = {}
+        self.count = 0
+        for element in elements:
+            self.add(element)
+
+    def __contains__(self, element: int) -> bool:
+        return element in self.parent
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def add(self, element: int) -> None:
+        """Add ``element`` as a singleton set (no-op if already present)."""
+        if element not in self.parent:
+            self.parent[element] = element
+            self.size[element] = 1
+            self.count += 1
+
+    def find(self, element: int) -> int:
+        """Representative of the set holding ``element``."""
+        parent = self.parent
+        while parent[element] != element:
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        Merge the sets holding ``a`` and ``b``, adding either if missing.
+
+        Returns:
+            True if two different sets were merged
+        """
+        self.add(a)
+        self.add(b)
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size.pop(root_b)
+        self.count -= 1
+        return True
+
+    def groups(self) -> List[Set[int]]:
+        """Members of every set, largest first."""
+        members: Dict[int, Set[int]] = {}
+        for element in self.parent:
+            members.setdefault(self.find(element), set()).add(element)
+        return sorted(members.values(), key=len, reverse=True)
+
+
 @dataclass
 class Topology:
     """Represents a network topology with nodes and connections."""
@@ -44,27 +124,224 @@ class Topology:
     topology_type: TopologyType
     nodes: Dict[int, Node] = field(default_factory=dict)
     edges: Dict[int, List[int]] = field(default_factory=dict)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    _neighbor_sets: Dict[int, Set[int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    failed_links: Set[Tuple[int, int]] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+    link_weights: Dict[Tuple[int, int], float] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    _csr: Optional[CSRAdjacency] = field(default=None, init=False, repr=False, compare=False)
+    _csr_version: int = field(default=-1, init=False, repr=False, compare=False)
+    _astar_cache: Optional[Tuple[int, np.ndarray, float]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _components: Optional[DisjointSet] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._index_edges()
+
+    def _index_edges(self) -> None:
+        """Rebuild the membership sets after ``edges`` was replaced wholesale."""
+        self._neighbor_sets = {src: set(dsts) for src, dsts in self.edges.items()}
+        self._components = None
+        self.version += 1
 
     def add_node(self, node: Node) -> None:
         """Add a node to the topology."""
         self.nodes[node.id] = node
-
-    def add_edge(self, src_id: int, dst_id: int, bidirectional: bool = True) -> None:
-        """Add an edge between two nodes."""
-        if src_id not in self.edges:
-            self.edges[src_id] = []
-        if dst_id not in self.edges:
-            self.edges[dst_id] = []
-
-        if dst_id not in self.edges[src_id]:
-            self.edges[src_id].append(dst_id)
-        if bidirectional and src_id not in self.edges[dst_id]:
-            self.edges[dst_id].append(src_id)
-
-        if src_id in self.nodes and dst_id in self.nodes:
-            self.nodes[src_id].connections.append(self.nodes[dst_id])
+        if self._components is not None:
+            self._components.add(node.id)
+        self.version += 1
+
+    def add_nodes(self, nodes: Iterable[Node]) -> None:
+        """Add many nodes at once."""
+        nodes = list(nodes)
+        self.nodes.update((node.id, node) for node in nodes)
+        if self._components is not None:
+            for node in nodes:
+                self._components.add(node.id)
+        self.version += 1
+
+    def add_edge(
+        self, src_id: int, dst_id: int, bidirectional: bool = True, weight: Optional[float] = None
+    ) -> None:
+        """Add an edge between two nodes, optionally with a link cost."""
+        self.add_edges(((src_id, dst_id),), bidirectional)
+        if weight is not None:
+            self.set_link_weight(src_id, dst_id, weight, bidirectional)
+
+    def set_link_weight(
+        self, src_id: int, dst_id: int, weight: float, bidirectional: bool = True
+    ) -> None:
+        """
+        Set the routing cost of a link (1 when never set).
+
+        Weights are kept across ``fail_link``/``restore_link``.
+        """
+        self.link_weights[(src_id, dst_id)] = weight
+        if bidirectional:
+            self.link_weights[(dst_id, src_id)] = weight
+        self.version += 1
+
+    def set_euclidean_weights(self) -> None:
+        """Set every link's cost to the distance between its node coordinates."""
+        nodes = self.nodes
+        for src_id, dsts in self.edges.items():
+            a = nodes.get(src_id)
+            for dst_id in dsts:
+                b = nodes.get(dst_id)
+                if a is not None and b is not None:
+                    self.link_weights[(src_id, dst_id)] = math.hypot(a.x - b.x, a.y - b.y)
+        self.version += 1
+
+    def add_edges(
+        self, edges: Iterable[Tuple[int, int]], bidirectional: bool = True
+    ) -> int:
+        """
+        Add many edges at once.
+
+        Membership is checked against per-node neighbor sets, so each edge
+        costs O(1) regardless of degree, and an edge that already exists is
+        not added again (to ``edges`` or to ``Node.connections``). The
+        connectivity index, if built, is updated in place.
+
+        Returns:
+            Number of directed links that were new
+        """
+        adjacency = self.edges
+        neighbor_sets = self._neighbor_sets
+        nodes = self.nodes
+        components = self._components
+        added = 0
+
+        def link(src_id: int, dst_id: int) -> None:
+            nonlocal added
+            neighbors = neighbor_sets.get(src_id)
+            if neighbors is None:
+                neighbors = neighbor_sets[src_id] = set()
+                adjacency[src_id] = []
+            if dst_id in neighbors:
+                return
+            neighbors.add(dst_id)
+            adjacency[src_id].append(dst_id)
+            added += 1
+            if components is not None:
+                components.union(src_id, dst_id)
+            if src_id in nodes and dst_id in nodes:
+                nodes[src_id].connections.append(nodes[dst_id])
+
+        for src_id, dst_id in edges:
+            link(src_id, dst_id)
             if bidirectional:
-                self.nodes[dst_id].connections.append(self.nodes[src_id])
+                link(dst_id, src_id)
+            elif dst_id not in neighbor_sets:
+                neighbor_sets[dst_id] = set()
+                adjacency[dst_id] = []
+
+        self.version += 1
+        return added
+
+    @classmethod
+    def from_edge_list(
+        cls,
+        edges: Iterable[Tuple[int, int]],
+        name: str = "Topology",
+        topology_type: TopologyType = TopologyType.HYBRID,
+        bidirectional: bool = True,
+        node_ids: Optional[Iterable[int]] = None,
+    ) -> "Topology":
+        """
+        Build a topology from ``(src, dst)`` pairs in one pass.
+
+        A node is created for every id in ``node_ids`` and every edge
+        endpoint, before the edges are linked.
+        """
+        edges = list(edges)
+        ids = set(node_ids) if node_ids is not None else set()
+        for src_id, dst_id in edges:
+            ids.add(src_id)
+            ids.add(dst_id)
+        topo = cls(name, topology_type)
+        topo.add_nodes(Node(id=did, name=f"Node_{did:02X}") for did in sorted(ids))
+        topo.add_edges(edges, bidirectional)
+        return topo
+
+    def remove_edge(self, src_id: int, dst_id: int, bidirectional: bool = True) -> int:
+        """
+        Remove an edge between two nodes.
+
+        Returns:
+            Number of directed links that were removed
+        """
+        removed = 0
+        pairs = ((src_id, dst_id), (dst_id, src_id)) if bidirectional else ((src_id, dst_id),)
+        for a, b in pairs:
+            neighbors = self._neighbor_sets.get(a)
+            if neighbors is None or b not in neighbors:
+                continue
+            neighbors.discard(b)
+            self.edges[a].remove(b)
+            if a in self.nodes and b in self.nodes:
+                connections = self.nodes[a].connections
+                if self.nodes[b] in connections:
+                    connections.remove(self.nodes[b])
+            removed += 1
+        if removed:
+            # Union-find cannot split a set; rebuild on the next query.
+            self._components = None
+            self.version += 1
+        return removed
+
+    def fail_link(self, src_id: int, dst_id: int, bidirectional: bool = True) -> List[Tuple[int, int]]:
+        """
+        Take a link down, remembering it so ``restore_link`` can bring it back.
+
+        Returns:
+            The directed links that went down
+        """
+        pairs = [(src_id, dst_id), (dst_id, src_id)] if bidirectional else [(src_id, dst_id)]
+        failed = [pair for pair in pairs if self.remove_edge(*pair, bidirectional=False)]
+        self.failed_links.update(failed)
+        return failed
+
+    def restore_link(self, src_id: int, dst_id: int, bidirectional: bool = True) -> List[Tuple[int, int]]:
+        """
+        Bring a failed link back up.
+
+        Returns:
+            The directed links that were restored
+        """
+        pairs = [(src_id, dst_id), (dst_id, src_id)] if bidirectional else [(src_id, dst_id)]
+        restored = [pair for pair in pairs if pair in self.failed_links]
+        self.failed_links.difference_update(restored)
+        if restored:
+            self.add_edges(restored, bidirectional=False)
+        return restored
+
+    def fail_node(self, node_id: int) -> List[Tuple[int, int]]:
+        """Fail every link into and out of a node (a router failure)."""
+        incident = [(node_id, dst) for dst in self.edges.get(node_id, [])]
+        incident += [
+            (src, node_id) for src, neighbors in self._neighbor_sets.items() if node_id in neighbors
+        ]
+        failed: List[Tuple[int, int]] = []
+        for pair in dict.fromkeys(incident):
+            failed.extend(self.fail_link(*pair, bidirectional=False))
+        return failed
+
+    def restore_node(self, node_id: int) -> List[Tuple[int, int]]:
+        """Restore every failed link into and out of a node."""
+        pairs = [pair for pair in self.failed_links if node_id in pair]
+        restored: List[Tuple[int, int]] = []
+        for pair in pairs:
+            restored.extend(self.restore_link(*pair, bidirectional=False))
+        return restored
 
     def get_neighbors(self, node_id: int) -> List[int]:
         """Get neighboring nodes."""
@@ -74,31 +351,78 @@ class Topology:
         """Find shortest path using BFS."""
         if src_id not in self.edges or dst_id not in self.edges:
             return None
+        return self._bfs_tree(src_id, dst_id).path_to(dst_id)
 
-        queue = deque([(src_id, [src_id])])
-        visited: Set[int] = {src_id}
+    def shortest_path_tree(self, src_id: int) -> "ShortestPathTree":
+        """Hop-count shortest paths from ``src_id`` to every reachable node."""
+        return self._bfs_tree(src_id)
 
-        while queue:
-            current, path = queue.popleft()
-            if current == dst_id:
-                return path
+    def _bfs_tree(self, src_id: int, stop_at: Optional[int] = None) -> "ShortestPathTree":
+        """Parent-pointer BFS from ``src_id``, optionally stopping at ``stop_at``."""
+        parent: Dict[int, Optional[int]] = {src_id: None}
+        distance: Dict[int, int] = {src_id: 0}
+        queue = deque([src_id])
 
+        while queue:
+            current = queue.popleft()
+            if current == stop_at:
+                break
+            next_distance = distance[current] + 1
             for neighbor in self.edges.get(current, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    distance[neighbor] = next_distance
+                    queue.append(neighbor)
 
-        return None
+        return ShortestPathTree(src_id, parent, distance)
 
     def dijkstra_path(
         self, src_id: int, dst_id: int, weights: Optional[Dict[Tuple[int, int], float]] = None
     ) -> Optional[List[int]]:
-        """Find shortest path using Dijkstra's algorithm."""
+        """
+        Find shortest path using Dijkstra's algorithm.
+
+        Without ``weights`` the search runs over the cached CSR arrays with
+        the stored ``link_weights``. An explicit ``weights`` dict is looked
+        up per relaxation instead, which avoids converting it for a single
+        query.
+        """
         if src_id not in self.edges or dst_id not in self.edges:
             return None
-
-        import heapq
-
+        if weights is None:
+            return self.to_csr().dijkstra_path(src_id, dst_id)
+        result = self._dijkstra(src_id, dst_id, weights)
+        return result[1] if result else None
+
+    def astar_path(self, src_id: int, dst_id: int) -> Optional[List[int]]:
+        """
+        Find shortest path using A* guided by node x/y coordinates.
+
+        The straight-line distance to the destination, scaled so it never
+        overestimates (see ``CSRAdjacency.heuristic_scale``), steers the
+        search, so on geometric topologies far fewer nodes are expanded
+        than with Dijkstra. Uses the stored ``link_weights``.
+        """
+        if src_id not in self.edges or dst_id not in self.edges:
+            return None
+        csr = self.to_csr()
+        if self._astar_cache is None or self._astar_cache[0] != self.version:
+            coords = self.node_coordinates(csr)
+            self._astar_cache = (self.version, coords, csr.heuristic_scale(coords))
+        _, coords, scale = self._astar_cache
+        return csr.astar_path(src_id, dst_id, coords, scale=scale)
+
+    def _dijkstra(
+        self,
+        src_id: int,
+        dst_id: int,
+        weights: Optional[Dict[Tuple[int, int], float]] = None,
+        banned_nodes: AbstractSet[int] = frozenset(),
+        banned_edges: AbstractSet[Tuple[int, int]] = frozenset(),
+    ) -> Optional[Tuple[float, List[int]]]:
+        """Cost and path from ``src_id`` to ``dst_id`` avoiding banned nodes/edges."""
+        if weights is None:
+            weights = self.link_weights
         distances: Dict[int, float] = {src_id: 0}
         previous: Dict[int, Optional[int]] = {src_id: None}
         heap = [(0, src_id)]
@@ -113,6 +437,8 @@ class Topology:
                 break
 
             for neighbor in self.edges.get(current, []):
+                if neighbor in banned_nodes or (current, neighbor) in banned_edges:
+                    continue
                 weight = weights.get((current, neighbor), 1) if weights else 1
                 distance = current_dist + weight
 
@@ -129,23 +455,167 @@ class Topology:
         while current is not None:
             path.append(current)
             current = previous[current]
-        return list(reversed(path))
+        return distances[dst_id], list(reversed(path))
+
+    def path_cost(
+        self, path: List[int], weights: Optional[Dict[Tuple[int, int], float]] = None
+    ) -> float:
+        """Total weight of a path (stored ``link_weights`` when omitted)."""
+        if weights is None:
+            weights = self.link_weights
+        if not weights:
+            return len(path) - 1
+        return sum(weights.get(edge, 1) for edge in zip(path, path[1:]))
+
+    def ecmp_paths(
+        self,
+        src_id: int,
+        dst_id: int,
+        weights: Optional[Dict[Tuple[int, int], float]] = None,
+        max_paths: int = 16,
+    ) -> List[List[int]]:
+        """
+        All equal-cost shortest paths from ``src_id`` to ``dst_id``.
+
+        One Dijkstra pass records every predecessor that ties for the best
+        distance; the paths are then read off that DAG. At most
+        ``max_paths`` are returned, since a dense mesh can have
+        exponentially many.
+        """
+        if src_id not in self.edges or dst_id not in self.edges:
+            return []
+        if weights is None:
+            weights = self.link_weights
 
-    def is_connected(self) -> bool:
-        """Check if topology is fully connected."""
-        if not self.nodes:
-            return True
-        visited: Set[int] = set()
-        queue = deque([next(iter(self.nodes))])
+        distances: Dict[int, float] = {src_id: 0}
+        predecessors: Dict[int, List[int]] = {src_id: []}
+        heap: List[Tuple[float, int]] = [(0.0, src_id)]
+        settled: Set[int] = set()
 
-        while queue:
-            node = queue.popleft()
-            if node in visited:
+        while heap:
+            current_dist, current = heapq.heappop(heap)
+            if current in settled:
                 continue
-            visited.add(node)
-            queue.extend(self.edges.get(node, []))
+            settled.add(current)
+            if current == dst_id:
+                break
 
-        return len(visited) == len(self.nodes)
+            for neighbor in self.edges.get(current, []):
+                weight = weights.get((current, neighbor), 1) if weights else 1
+                distance = current_dist + weight
+                best = distances.get(neighbor, float('inf'))
+                if distance < best - _COST_EPSILON:
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = [current]
+                    heapq.heappush(heap, (distance, neighbor))
+                elif distance <= best + _COST_EPSILON and neighbor not in settled:
+                    predecessors[neighbor].append(current)
+
+        if dst_id not in predecessors:
+            return []
+
+        paths: List[List[int]] = []
+        stack = [[dst_id]]
+        while stack and len(paths) < max_paths:
+            partial = stack.pop()
+            head = partial[-1]
+            if head == src_id:
+                paths.append(partial[::-1])
+                continue
+            stack.extend(partial + [pred] for pred in reversed(predecessors[head]))
+        return paths
+
+    def k_shortest_paths(
+        self,
+        src_id: int,
+        dst_id: int,
+        k: int,
+        weights: Optional[Dict[Tuple[int, int], float]] = None,
+    ) -> List[List[int]]:
+        """
+        Up to ``k`` loop-free paths in order of increasing cost (Yen's algorithm).
+        """
+        if src_id not in self.edges or dst_id not in self.edges or k < 1:
+            return []
+        first = self._dijkstra(src_id, dst_id, weights)
+        if first is None:
+            return []
+
+        accepted = [first[1]]
+        candidates: List[Tuple[float, List[int]]] = []
+        seen = {tuple(first[1])}
+
+        while len(accepted) < k:
+            previous = accepted[-1]
+            for i in range(len(previous) - 1):
+                spur = previous[i]
+                root = previous[:i + 1]
+                banned_edges = {
+                    (path[i], path[i + 1]) for path in accepted
+                    if len(path) > i + 1 and path[:i + 1] == root
+                }
+                spur_result = self._dijkstra(
+                    spur, dst_id, weights, frozenset(root[:-1]), banned_edges
+                )
+                if spur_result is None:
+                    continue
+                path = root[:-1] + spur_result[1]
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heapq.heappush(candidates, (self.path_cost(path, weights), path))
+            if not candidates:
+                break
+            accepted.append(heapq.heappop(candidates)[1])
+
+        return accepted
+
+    @property
+    def components(self) -> DisjointSet:
+        """
+        Union-find index of weakly connected components.
+
+        Covers every node and every link endpoint. Adding nodes and edges
+        updates it incrementally; removing or failing a link drops it, and
+        it is rebuilt in O(E alpha(n)) on the next query.
+        """
+        if self._components is None:
+            components = DisjointSet(self.nodes)
+            for src_id, dsts in self.edges.items():
+                for dst_id in dsts:
+                    components.union(src_id, dst_id)
+            self._components = components
+        return self._components
+
+    def component_of(self, node_id: int) -> Optional[int]:
+        """
+        Representative id of a node's component, or None for an unknown id.
+
+        Representatives are only comparable until the topology next changes.
+        """
+        components = self.components
+        return components.find(node_id) if node_id in components else None
+
+    def same_component(self, a_id: int, b_id: int) -> bool:
+        """Check whether two nodes are linked, ignoring link direction."""
+        components = self.components
+        return a_id in components and b_id in components and (
+            components.find(a_id) == components.find(b_id)
+        )
+
+    def component_count(self) -> int:
+        """Number of weakly connected components."""
+        return self.components.count
+
+    def is_connected(self) -> bool:
+        """
+        Check if topology is fully connected.
+
+        Link direction is ignored, so a hub that only has outbound links
+        still joins its devices into one network.
+        """
+        if not self.nodes:
+            return True
+        return self.components.count == 1
 
     def validate(self) -> Tuple[bool, List[str]]:
         """Validate topology configuration."""
@@ -157,12 +627,543 @@ class Topology:
         if not self.is_connected():
             errors.append("Topology is not fully connected")
 
-        for src, dsts in self.edges.items():
-            if src not in self.nodes:
-                errors.append(f"Edge source {src} not in nodes")
+        for src in sorted(self.edges.keys() - self.nodes.keys()):
+            errors.append(f"Edge source {src} not in nodes")
 
         return len(errors) == 0, errors
 
+    def node_ids(self) -> Set[int]:
+        """Ids of all nodes, including those that only appear in edges."""
+        ids: Set[int] = set(self.nodes) | set(self.edges)
+        for dsts in self.edges.values():
+            ids.update(dsts)
+        return ids
+
+    def to_csr(self) -> CSRAdjacency:
+        """
+        Snapshot the adjacency and link weights as a CSR array backend.
+
+        The snapshot is cached until the topology ``version`` changes.
+        """
+        if self._csr is None or self._csr_version != self.version:
+            self._csr = CSRAdjacency.from_dict(self.edges, self.node_ids(), self.link_weights)
+            self._csr_version = self.version
+        return self._csr
+
+    def node_coordinates(self, csr: Optional[CSRAdjacency] = None) -> np.ndarray:
+        """``(num_nodes, 2)`` x/y array in CSR index order; NaN for unknown nodes."""
+        csr = csr or self.to_csr()
+        coords = np.full((csr.num_nodes, 2), np.nan)
+        nodes = self.nodes
+        for i, node_id in enumerate(csr.node_ids.tolist()):
+            node = nodes.get(node_id)
+            if node is not None:
+                coords[i] = (node.x, node.y)
+        return coords
+
+    def all_pairs_shortest_paths(
+        self,
+        weights: Optional[Dict[Tuple[int, int], float]] = None,
+        workers: Optional[int] = None,
+    ) -> AllPairsPaths:
+        """
+        Distance and next-hop matrices for every src/dst pair.
+
+        Args:
+            weights: Optional ``{(src, dst): cost}``; stored ``link_weights`` when omitted
+            workers: Processes to shard source nodes across (default: CPU count)
+
+        Returns:
+            AllPairsPaths with ``distance`` and ``next_hop`` NumPy matrices
+            indexed by position in its ``node_ids``
+        """
+        csr = self.to_csr()
+        edge_weights = csr.edge_weights(weights) if weights else None
+        return csr.all_pairs(edge_weights, workers)
+
+    @classmethod
+    def from_csr(
+        cls,
+        csr: CSRAdjacency,
+        name: str = "CSR",
+        topology_type: TopologyType = TopologyType.HYBRID,
+    ) -> "Topology":
+        """Build a dict-backed topology from a CSR adjacency."""
+        topo = cls(name, topology_type)
+        topo.nodes = {
+            node_id: Node(id=node_id, name=f"Node_{node_id:02X}")
+            for node_id in csr.node_ids.tolist()
+        }
+        topo.edges = csr.to_dict()
+        topo.link_weights = csr.weight_dict()
+        topo._index_edges()
+        nodes = topo.nodes
+        for node_id, dsts in topo.edges.items():
+            nodes[node_id].connections = [nodes[dst] for dst in dsts]
+        return topo
+
+    @classmethod
+    def from_arrays(
+        cls,
+        src_ids: np.ndarray,
+        dst_ids: np.ndarray,
+        name: str = "Topology",
+        topology_type: TopologyType = TopologyType.HYBRID,
+        bidirectional: bool = True,
+        node_ids: Optional[np.ndarray] = None,
+        positions: Optional[np.ndarray] = None,
+    ) -> "Topology":
+        """
+        Build a large topology from NumPy edge arrays without per-edge Python work.
+
+        Duplicate links are dropped (the first occurrence keeps its place
+        in the neighbor order). ``positions``, if given, is an ``(N, 2)``
+        array of x/y coordinates aligned with ``node_ids``.
+        """
+        src = np.asarray(src_ids, dtype=np.int64)
+        dst = np.asarray(dst_ids, dtype=np.int64)
+        if bidirectional:
+            src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+        if len(src):
+            _, first = np.unique(np.stack([src, dst], axis=1), axis=0, return_index=True)
+            first.sort()
+            src, dst = src[first], dst[first]
+
+        topo = cls.from_csr(CSRAdjacency.from_edges(src, dst, node_ids), name, topology_type)
+        if positions is not None:
+            if node_ids is None:
+                raise ValueError("positions require node_ids to align with")
+            nodes = topo.nodes
+            for node_id, (x, y) in zip(np.asarray(node_ids).tolist(), np.asarray(positions).tolist()):
+                node = nodes[node_id]
+                node.x, node.y = x, y
+        return topo
+
+
+@dataclass
+class ShortestPathTree:
+    """
+    Routes from one source to every node it reaches.
+
+    Stores one parent pointer per node rather than a path per node, so a
+    single traversal serves every destination; multicast and broadcast
+    traffic from one source can share it.
+    """
+    source: int
+    parent: Dict[int, Optional[int]]
+    distance: Dict[int, int]
+
+    def __contains__(self, node_id: int) -> bool:
+        return node_id in self.parent
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def path_to(self, dst_id: int) -> Optional[List[int]]:
+        """Path from the source to ``dst_id``, or None if unreachable."""
+        if dst_id not in self.parent:
+            return None
+        path = []
+        current: Optional[int] = dst_id
+        while current is not None:
+            path.append(current)
+            current = self.parent[current]
+        path.reverse()
+        return path
+
+    def routes(self) -> Dict[int, List[int]]:
+        """Paths to every reachable node, keyed by destination."""
+        routes: Dict[int, List[int]] = {}
+        for node_id in self.parent:
+            path = self.path_to(node_id)
+            if path is not None:
+                routes[node_id] = path
+        return routes
+
+    def multicast_edges(self, dst_ids: List[int]) -> Set[Tuple[int, int]]:
+        """
+        Links used to reach all ``dst_ids`` from the source.
+
+        Links shared by several destinations are counted once, as a
+        multicast packet would be replicated only where the routes split.
+        """
+        edges: Set[Tuple[int, int]] = set()
+        for dst_id in dst_ids:
+            current = dst_id
+            parent = self.parent.get(current)
+            while parent is not None:
+                edge = (parent, current)
+                if edge in edges:
+                    break
+                edges.add(edge)
+                current, parent = parent, self.parent.get(parent)
+        return edges
+
+
+class RoutingTable:
+    """
+    Precomputed all-pairs next-hop table for a topology.
+
+    Every node's next hop towards every destination is stored in one dense
+    array, so a per-packet route lookup is O(1) per hop instead of a graph
+    search. The table records the topology ``version`` it was built from
+    and rebuilds itself on the next lookup after ``add_node``/``add_edge``
+    change the graph. Edits made directly to ``Topology.edges`` bypass the
+    version counter; call ``build()`` after those.
+    """
+
+    def __init__(self, topology: Topology, block_size: int = BFS_BLOCK_SIZE):
+        self.topology = topology
+        self.block_size = block_size
+        self.node_ids: List[int] = []
+        self.index_of: Dict[int, int] = {}
+        self.next_hops = np.empty((0, 0), dtype=np.int32)
+        self.built_version = -1
+        self.build()
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the topology changed since the table was built."""
+        return self.built_version != self.topology.version
+
+    def build(self) -> None:
+        """(Re)compute next hops for all node pairs."""
+        csr = self.topology.to_csr()
+        self.node_ids = csr.node_ids.tolist()
+        self.index_of = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        n = csr.num_nodes
+
+        dtype = np.int16 if n < np.iinfo(np.int16).max else np.int32
+        next_hops: np.ndarray = np.empty((n, n), dtype=dtype)
+        for start in range(0, n, self.block_size):
+            sources = np.arange(start, min(start + self.block_size, n), dtype=np.int64)
+            next_hops[start:start + len(sources)] = csr.first_hops(sources)
+        self.next_hops = next_hops
+        self.built_version = self.topology.version
+
+    def next_hop(self, src_id: int, dst_id: int) -> Optional[int]:
+        """Node to forward to from ``src_id`` towards ``dst_id``, or None."""
+        if self.is_stale:
+            self.build()
+        src = self.index_of.get(src_id)
+        dst = self.index_of.get(dst_id)
+        if src is None or dst is None:
+            return None
+        hop = self.next_hops[src, dst]
+        return self.node_ids[hop] if hop >= 0 else None
+
+    def path(self, src_id: int, dst_id: int) -> Optional[List[int]]:
+        """Full route from ``src_id`` to ``dst_id`` by following next hops."""
+        if self.is_stale:
+            self.build()
+        src = self.index_of.get(src_id)
+        dst = self.index_of.get(dst_id)
+        if src is None or dst is None or self.next_hops[src, dst] < 0:
+            return None
+        path = [src]
+        while path[-1] != dst:
+            path.append(int(self.next_hops[path[-1], dst]))
+        return [self.node_ids[i] for i in path]
+
+
+class DynamicRoutingTable:
+    """
+    All-pairs routes that are repaired in place when links fail or recover.
+
+    Keeps a distance and a next-hop matrix (rows are the current node,
+    columns the destination). Link changes go through this table's
+    ``fail_link``/``restore_link``/``fail_node``/``restore_node``, which
+    update the topology and then repair only the entries that change:
+
+    - On a failure of ``u -> v`` only destinations routed over that link
+      are touched, and for each only the nodes whose route passes through
+      it are re-solved, seeded from their unaffected neighbors.
+    - On a recovery of ``u -> v`` only destinations that ``u`` now reaches
+      more cheaply are touched, and improvements are pushed back from
+      ``u`` over its in-neighbors.
+
+    Any other topology change (new nodes or edges added directly) triggers
+    a full rebuild on the next lookup.
+    """
+
+    def __init__(self, topology: Topology, weights: Optional[Dict[Tuple[int, int], float]] = None):
+        self.topology = topology
+        self.weights = topology.link_weights if weights is None else weights
+        self.node_ids: List[int] = []
+        self.index_of: Dict[int, int] = {}
+        self.distance = np.empty((0, 0), dtype=np.float64)
+        self.next_hops = np.empty((0, 0), dtype=np.int32)
+        self.built_version = -1
+        self.repaired_entries = 0
+        self.build()
+
+    def build(self) -> None:
+        """Full recompute from the current topology."""
+        result = self.topology.all_pairs_shortest_paths(self.weights or None, workers=1)
+        self.node_ids = result.node_ids.tolist()
+        self.index_of = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.distance = result.distance
+        self.next_hops = result.next_hop
+        self._in_neighbors: List[Set[int]] = [set() for _ in self.node_ids]
+        for src_id, dsts in self.topology.edges.items():
+            src = self.index_of[src_id]
+            for dst_id in dsts:
+                self._in_neighbors[self.index_of[dst_id]].add(src)
+        self.built_version = self.topology.version
+
+    def _check(self) -> None:
+        if self.built_version != self.topology.version:
+            self.build()
+
+    def _weight(self, src: int, dst: int) -> float:
+        return self.weights.get((self.node_ids[src], self.node_ids[dst]), 1.0)
+
+    def next_hop(self, src_id: int, dst_id: int) -> Optional[int]:
+        """Node to forward to from ``src_id`` towards ``dst_id``, or None."""
+        self._check()
+        src, dst = self.index_of.get(src_id), self.index_of.get(dst_id)
+        if src is None or dst is None or self.next_hops[src, dst] < 0:
+            return None
+        return self.node_ids[int(self.next_hops[src, dst])]
+
+    def path(self, src_id: int, dst_id: int) -> Optional[List[int]]:
+        """Current route from ``src_id`` to ``dst_id``."""
+        self._check()
+        src, dst = self.index_of.get(src_id), self.index_of.get(dst_id)
+        if src is None or dst is None or self.next_hops[src, dst] < 0:
+            return None
+        path = [src]
+        while path[-1] != dst:
+            path.append(int(self.next_hops[path[-1], dst]))
+        return [self.node_ids[i] for i in path]
+
+    def cost(self, src_id: int, dst_id: int) -> float:
+        """Current route cost (``inf`` if unreachable)."""
+        self._check()
+        return float(self.distance[self.index_of[src_id], self.index_of[dst_id]])
+
+    def fail_link(self, src_id: int, dst_id: int, bidirectional: bool = True) -> int:
+        """Fail a link and repair affected routes; returns entries repaired."""
+        self._check()
+        failed = self.topology.fail_link(src_id, dst_id, bidirectional)
+        repaired = sum(self._link_down(*pair) for pair in failed)
+        self.built_version = self.topology.version
+        return repaired
+
+    def restore_link(self, src_id: int, dst_id: int, bidirectional: bool = True) -> int:
+        """Restore a link and repair affected routes; returns entries repaired."""
+        self._check()
+        restored = self.topology.restore_link(src_id, dst_id, bidirectional)
+        repaired = sum(self._link_up(*pair) for pair in restored)
+        self.built_version = self.topology.version
+        return repaired
+
+    def fail_node(self, node_id: int) -> int:
+        """Fail every link of a node and repair affected routes."""
+        self._check()
+        failed = self.topology.fail_node(node_id)
+        repaired = sum(self._link_down(*pair) for pair in failed)
+        self.built_version = self.topology.version
+        return repaired
+
+    def restore_node(self, node_id: int) -> int:
+        """Restore every failed link of a node and repair affected routes."""
+        self._check()
+        restored = self.topology.restore_node(node_id)
+        repaired = sum(self._link_up(*pair) for pair in restored)
+        self.built_version = self.topology.version
+        return repaired
+
+    def _link_down(self, src_id: int, dst_id: int) -> int:
+        u, v = self.index_of[src_id], self.index_of[dst_id]
+        self._in_neighbors[v].discard(u)
+        repaired = 0
+        for dest in np.flatnonzero(self.next_hops[u] == v).tolist():
+            if dest != u:
+                repaired += self._repair_after_failure(u, dest)
+        self.repaired_entries += repaired
+        return repaired
+
+    def _repair_after_failure(self, u: int, dest: int) -> int:
+        """Re-solve the routes to ``dest`` that went through ``u``'s failed link."""
+        next_hops = self.next_hops[:, dest]
+        distance = self.distance[:, dest]
+        in_neighbors = self._in_neighbors
+        index_of = self.index_of
+        edges = self.topology.edges
+        node_ids = self.node_ids
+
+        # Walk u's subtree of dest's in-tree in order of distance. A node
+        # with an equal-cost next hop outside the affected set keeps its
+        # distance and just switches to that hop; with positive weights the
+        # hop is strictly closer, so its status is already settled.
+        affected: Set[int] = set()
+        rescued = 0
+        pending = [(distance[u], u)]
+        decided: Set[int] = set()
+        while pending:
+            dist, node = heapq.heappop(pending)
+            if node in decided:
+                continue
+            decided.add(node)
+            for neighbor_id in edges.get(node_ids[node], ()):
+                neighbor = index_of[neighbor_id]
+                if neighbor in affected or next_hops[neighbor] < 0:
+                    continue
+                if abs(distance[neighbor] + self._weight(node, neighbor) - dist) <= _COST_EPSILON:
+                    next_hops[node] = neighbor
+                    rescued += 1
+                    break
+            else:
+                affected.add(node)
+                for prev in in_neighbors[node]:
+                    if prev not in decided and next_hops[prev] == node:
+                        heapq.heappush(pending, (distance[prev], prev))
+
+        if not affected:
+            return rescued
+
+        # Seed each affected node from neighbors whose routes are still intact.
+        heap: List[Tuple[float, int]] = []
+        for node in affected:
+            best, best_hop = float("inf"), -1
+            for neighbor_id in edges.get(node_ids[node], ()):
+                neighbor = index_of[neighbor_id]
+                if neighbor in affected:
+                    continue
+                candidate = distance[neighbor] + self._weight(node, neighbor)
+                if candidate < best:
+                    best, best_hop = candidate, neighbor
+            distance[node] = best
+            next_hops[node] = best_hop
+            if best_hop >= 0:
+                heapq.heappush(heap, (best, node))
+
+        # Dijkstra restricted to the affected region.
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if dist > distance[node]:
+                continue
+            for prev in in_neighbors[node]:
+                if prev not in affected:
+                    continue
+                candidate = dist + self._weight(prev, node)
+                if candidate < distance[prev]:
+                    distance[prev] = candidate
+                    next_hops[prev] = node
+                    heapq.heappush(heap, (candidate, prev))
+
+        return len(affected) + rescued
+
+    def _link_up(self, src_id: int, dst_id: int) -> int:
+        u, v = self.index_of[src_id], self.index_of[dst_id]
+        self._in_neighbors[v].add(u)
+        weight = self._weight(u, v)
+        improved = np.flatnonzero(self.distance[v] + weight < self.distance[u])
+        repaired = 0
+        for dest in improved.tolist():
+            repaired += self._repair_after_recovery(u, v, weight, dest)
+        self.repaired_entries += repaired
+        return repaired
+
+    def _repair_after_recovery(self, u: int, v: int, weight: float, dest: int) -> int:
+        """Propagate the shorter routes to ``dest`` that ``u -> v`` opened up."""
+        next_hops = self.next_hops[:, dest]
+        distance = self.distance[:, dest]
+        in_neighbors = self._in_neighbors
+
+        distance[u] = distance[v] + weight
+        next_hops[u] = v
+        repaired = 1
+        heap = [(distance[u], u)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if dist > distance[node]:
+                continue
+            for prev in in_neighbors[node]:
+                candidate = dist + self._weight(prev, node)
+                if candidate < distance[prev]:
+                    distance[prev] = candidate
+                    next_hops[prev] = node
+                    repaired += 1
+                    heapq.heappush(heap, (candidate, prev))
+        return repaired
+
+
+class PathSelector:
+    """
+    Spreads traffic between a node pair over several paths.
+
+    Candidate paths are the equal-cost shortest paths (ECMP) or, when
+    ``k`` is given, the ``k`` shortest loop-free paths. In ``hash`` mode
+    every packet of a flow takes the same path, chosen by hashing the
+    flow key, so a flow is never reordered. In ``round-robin`` mode
+    successive packets rotate over the candidates. Candidates are cached
+    per pair and dropped when the topology ``version`` changes. Per-link
+    packet counts are kept in ``link_load``.
+    """
+
+    HASH = "hash"
+    ROUND_ROBIN = "round-robin"
+
+    def __init__(
+        self,
+        topology: Topology,
+        mode: str = HASH,
+        k: Optional[int] = None,
+        weights: Optional[Dict[Tuple[int, int], float]] = None,
+        max_paths: int = 8,
+    ):
+        if mode not in (self.HASH, self.ROUND_ROBIN):
+            raise ValueError(f"Invalid path selection mode: {mode}")
+        self.topology = topology
+        self.mode = mode
+        self.k = k
+        self.weights = weights
+        self.max_paths = max_paths
+        self.link_load: Dict[Tuple[int, int], int] = {}
+        self._paths: Dict[Tuple[int, int], List[List[int]]] = {}
+        self._turn: Dict[Tuple[int, int], int] = {}
+        self._version = topology.version
+
+    def paths(self, src_id: int, dst_id: int) -> List[List[int]]:
+        """Candidate paths for a pair."""
+        if self._version != self.topology.version:
+            self._paths.clear()
+            self._turn.clear()
+            self._version = self.topology.version
+        key = (src_id, dst_id)
+        paths = self._paths.get(key)
+        if paths is None:
+            if self.k is None:
+                paths = self.topology.ecmp_paths(src_id, dst_id, self.weights, self.max_paths)
+            else:
+                paths = self.topology.k_shortest_paths(src_id, dst_id, self.k, self.weights)
+            self._paths[key] = paths
+        return paths
+
+    def select(self, src_id: int, dst_id: int, flow: Any = None) -> Optional[List[int]]:
+        """Path for the next packet of ``flow`` from ``src_id`` to ``dst_id``."""
+        paths = self.paths(src_id, dst_id)
+        if not paths:
+            return None
+        key = (src_id, dst_id)
+        if self.mode == self.HASH:
+            path = paths[hash((src_id, dst_id, flow)) % len(paths)]
+        else:
+            turn = self._turn.get(key, 0)
+            self._turn[key] = turn + 1
+            path = paths[turn % len(paths)]
+
+        load = self.link_load
+        for edge in zip(path, path[1:]):
+            load[edge] = load.get(edge, 0) + 1
+        return path
+
+    def max_link_load(self) -> int:
+        """Packets carried by the busiest link so far."""
+        return max(self.link_load.values(), default=0)
+
 
 class TopologyBuilder:
     """Builder class for creating standard topologies."""
@@ -171,13 +1172,9 @@ class TopologyBuilder:
     def star(hub_id: int, device_ids: List[int]) -> Topology:
         """Create a star topology."""
         topo = Topology("Star", TopologyType.STAR)
-
-        for did in device_ids:
-            topo.add_node(Node(id=did, name=f"Node_{did:02X}"))
-
-        for did in device_ids:
-            topo.add_edge(hub_id, did, bidirectional=False)
-
+        topo.add_node(Node(id=hub_id, name=f"Hub_{hub_id:02X}"))
+        topo.add_nodes(Node(id=did, name=f"Node_{did:02X}") for did in device_ids)
+        topo.add_edges(((hub_id, did) for did in device_ids), bidirectional=False)
         return topo
 
     @staticmethod
@@ -185,47 +1182,40 @@ class TopologyBuilder:
         """Create a ring topology."""
         topo = Topology("Ring", TopologyType.RING)
         all_ids = [start_id] + device_ids
-
-        for did in all_ids:
-            topo.add_node(Node(id=did, name=f"Node_{did:02X}"))
-
-        for i in range(len(all_ids)):
-            src = all_ids[i]
-            dst = all_ids[(i + 1) % len(all_ids)]
-            topo.add_edge(src, dst, bidirectional=False)
-
+        topo.add_nodes(Node(id=did, name=f"Node_{did:02X}") for did in all_ids)
+        topo.add_edges(zip(all_ids, all_ids[1:] + all_ids[:1]), bidirectional=False)
         return topo
 
     @staticmethod
     def mesh(device_ids: List[int]) -> Topology:
         """Create a full mesh topology."""
         topo = Topology("Mesh", TopologyType.MESH)
-
-        for did in device_ids:
-            topo.add_node(Node(id=did, name=f"Node_{did:02X}"))
-
-        for i, src in enumerate(device_ids):
-            for dst in device_ids[i + 1:]:
-                topo.add_edge(src, dst)
-
+        topo.add_nodes(Node(id=did, name=f"Node_{did:02X}") for did in device_ids)
+        topo.add_edges(combinations(device_ids, 2))
         return topo
 
     @staticmethod
-    def tree(root_id: int, levels: List[List[int]]) -> Topology:
-        """Create a tree topology."""
+    def tree(root_id: int, levels: List[List[int]], seed: Optional[int] = 0) -> Topology:
+        """
+        Create a tree topology.
+
+        Each level hangs off one node of the level above, picked with a
+        ``random.Random(seed)`` so the same seed always gives the same tree.
+        """
+        rng = random.Random(seed)
         topo = Topology("Tree", TopologyType.TREE)
         topo.add_node(Node(id=root_id, name=f"Root_{root_id:02X}"))
+        topo.add_nodes(
+            Node(id=did, name=f"Node_{did:02X}") for level_nodes in levels for did in level_nodes
+        )
 
-        for level_nodes in levels:
-            for did in level_nodes:
-                topo.add_node(Node(id=did, name=f"Node_{did:02X}"))
-
+        edges: List[Tuple[int, int]] = []
         parent_id = root_id
         for level_nodes in levels:
-            for did in level_nodes:
-                topo.add_edge(parent_id, did, bidirectional=False)
+            edges.extend((parent_id, did) for did in level_nodes)
             if level_nodes:
-                parent_id = random.choice(level_nodes)
+                parent_id = rng.choice(level_nodes)
+        topo.add_edges(edges, bidirectional=False)
 
         return topo
 
@@ -233,22 +1223,241 @@ class TopologyBuilder:
     def point_to_point(src_id: int, dst_id: int) -> Topology:
         """Create a point-to-point topology."""
         topo = Topology("Point-to-Point", TopologyType.POINT_TO_POINT)
-        topo.add_node(Node(id=src_id, name=f"Src_{src_id:02X}"))
-        topo.add_node(Node(id=dst_id, name=f"Dst_{dst_id:02X}"))
-        topo.add_edge(src_id, dst_id, bidirectional=False)
+        topo.add_nodes([
+            Node(id=src_id, name=f"Src_{src_id:02X}"),
+            Node(id=dst_id, name=f"Dst_{dst_id:02X}"),
+        ])
+        topo.add_edges([(src_id, dst_id)], bidirectional=False)
         return topo
 
     @staticmethod
     def bus(device_ids: List[int]) -> Topology:
         """Create a bus topology."""
         topo = Topology("Bus", TopologyType.BUS)
+        topo.add_nodes(Node(id=did, name=f"Node_{did:02X}") for did in device_ids)
+        topo.add_edges(((0x00, did) for did in device_ids), bidirectional=False)
+        return topo
 
-        for did in device_ids:
-            topo.add_node(Node(id=did, name=f"Node_{did:02X}"))
+    @staticmethod
+    def torus(dims: Sequence[int], name: str = "Torus") -> Topology:
+        """
+        Create a torus with the given size along each dimension.
+
+        Node ids are row-major grid indices; every node links to its two
+        wrap-around neighbors in each dimension (one for a size-2
+        dimension, none for size 1). Nodes are laid out on their first two
+        coordinates.
+        """
+        dims = [int(d) for d in dims]
+        total = int(np.prod(dims))
+        ids = np.arange(total, dtype=np.int64)
+        coords = np.stack(np.unravel_index(ids, dims), axis=1)
+        strides = np.array([int(np.prod(dims[i + 1:])) for i in range(len(dims))], dtype=np.int64)
+
+        src: List[np.ndarray] = []
+        dst: List[np.ndarray] = []
+        for axis, size in enumerate(dims):
+            if size < 2:
+                continue
+            step = (coords[:, axis] + 1) % size - coords[:, axis]
+            src.append(ids)
+            dst.append(ids + step * strides[axis])
+
+        positions = np.zeros((total, 2))
+        positions[:, :min(2, len(dims))] = coords[:, :2]
+        return Topology.from_arrays(
+            np.concatenate(src) if src else ids[:0],
+            np.concatenate(dst) if dst else ids[:0],
+            name, TopologyType.TORUS, node_ids=ids, positions=positions,
+        )
+
+    @staticmethod
+    def torus_2d(rows: int, cols: int) -> Topology:
+        """Create a 2D torus of ``rows x cols`` nodes."""
+        return TopologyBuilder.torus([rows, cols], "Torus2D")
+
+    @staticmethod
+    def torus_3d(x: int, y: int, z: int) -> Topology:
+        """Create a 3D torus of ``x * y * z`` nodes."""
+        return TopologyBuilder.torus([x, y, z], "Torus3D")
+
+    @staticmethod
+    def k_ary_n_cube(k: int, n: int) -> Topology:
+        """Create a k-ary n-cube (an n-dimensional torus of side k; k=2 is a hypercube)."""
+        return TopologyBuilder.torus([k] * n, f"{k}-ary {n}-cube")
 
-        for did in device_ids:
-            topo.add_edge(0x00, did, bidirectional=False)
+    @staticmethod
+    def fat_tree(k: int) -> Topology:
+        """
+        Create a three-level k-ary fat-tree (k even).
+
+        There are ``(k/2)^2`` core switches and ``k`` pods, each with
+        ``k/2`` aggregation and ``k/2`` edge switches; every edge switch
+        serves ``k/2`` end nodes, giving ``k^3/4`` end nodes in total.
+        Node ids run core, aggregation, edge, then end nodes; each node's
+        ``metadata["role"]`` names its tier.
+        """
+        if k < 2 or k % 2:
+            raise ValueError("Fat-tree arity k must be an even number >= 2")
+        half = k // 2
+        num_core, num_agg, num_edge = half * half, k * half, k * half
+        agg0 = num_core
+        edge0 = agg0 + num_agg
+        host0 = edge0 + num_edge
+        total = host0 + num_edge * half
+
+        # Aggregation switch j of pod p links to core switches j*half .. j*half+half-1.
+        agg = np.arange(num_agg)
+        core_src = np.repeat(agg0 + agg, half)
+        core_dst = (np.repeat(agg % half, half) * half + np.tile(np.arange(half), num_agg))
+        # Every edge switch links to every aggregation switch in its pod.
+        edge = np.arange(num_edge)
+        pod_src = np.repeat(edge0 + edge, half)
+        pod_dst = agg0 + np.repeat(edge // half, half) * half + np.tile(np.arange(half), num_edge)
+        # End nodes hang off their edge switch.
+        hosts = np.arange(num_edge * half)
+        host_src = host0 + hosts
+        host_dst = edge0 + hosts // half
+
+        tiers = [
+            ("core", 0, num_core, 3.0),
+            ("aggregation", agg0, num_agg, 2.0),
+            ("edge", edge0, num_edge, 1.0),
+            ("host", host0, num_edge * half, 0.0),
+        ]
+        ids = np.arange(total)
+        positions = np.zeros((total, 2))
+        for _, start, count, level in tiers:
+            positions[start:start + count, 0] = np.arange(count) * (num_edge * half / max(count, 1))
+            positions[start:start + count, 1] = level
+
+        topo = Topology.from_arrays(
+            np.concatenate([core_src, pod_src, host_src]),
+            np.concatenate([core_dst, pod_dst, host_dst]),
+            f"FatTree(k={k})", TopologyType.FAT_TREE, node_ids=ids, positions=positions,
+        )
+        nodes = topo.nodes
+        for role, start, count, _ in tiers:
+            for node_id in range(start, start + count):
+                nodes[node_id].metadata["role"] = role
+        return topo
 
+    @staticmethod
+    def random_geometric(
+        num_nodes: int, radius: float, seed: Optional[int] = 0, size: float = 1.0
+    ) -> Topology:
+        """
+        Create a random geometric graph.
+
+        Nodes are placed uniformly in a ``size x size`` square with
+        ``numpy.random.default_rng(seed)`` and linked when closer than
+        ``radius``. Neighbor search buckets nodes into ``radius``-sized
+        cells and compares only adjacent cells, so the cost grows with the
+        number of links rather than the square of the node count.
+        """
+        rng = np.random.default_rng(seed)
+        points = rng.random((num_nodes, 2)) * size
+        cells_per_side = max(1, int(size / radius))
+        cell_xy = np.minimum((points / size * cells_per_side).astype(np.int64), cells_per_side - 1)
+        cell = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+        order = np.argsort(cell, kind="stable")
+        sorted_cell = cell[order]
+        starts = np.searchsorted(sorted_cell, np.arange(cells_per_side * cells_per_side))
+        ends = np.searchsorted(sorted_cell, np.arange(cells_per_side * cells_per_side), side="right")
+
+        src: List[np.ndarray] = []
+        dst: List[np.ndarray] = []
+        # Half of the 3x3 neighborhood; the other half is covered from the other side.
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            nx, ny = cell_xy[:, 0] + dx, cell_xy[:, 1] + dy
+            valid = (nx >= 0) & (nx < cells_per_side) & (ny >= 0) & (ny < cells_per_side)
+            nodes = np.flatnonzero(valid)
+            other = nx[valid] * cells_per_side + ny[valid]
+            counts = ends[other] - starts[other]
+            owner = np.repeat(np.arange(len(nodes)), counts)
+            offsets = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+            a = nodes[owner]
+            b = order[starts[other][owner] + offsets]
+            keep = (a < b) if (dx, dy) == (0, 0) else np.ones(len(a), dtype=bool)
+            a, b = a[keep], b[keep]
+            close = np.hypot(*(points[a] - points[b]).T) < radius
+            src.append(a[close])
+            dst.append(b[close])
+
+        return Topology.from_arrays(
+            np.concatenate(src), np.concatenate(dst),
+            "RandomGeometric", TopologyType.GEOMETRIC,
+            node_ids=np.arange(num_nodes), positions=points,
+        )
+
+    @staticmethod
+    def dual_plane_backbone(
+        num_nodes: int,
+        routers_per_plane: int,
+        seed: Optional[int] = 0,
+        chords: int = 2,
+        cross_strap: bool = False,
+    ) -> Topology:
+        """
+        Create a redundant dual-plane spacecraft backbone.
+
+        Two independent router planes (nominal and redundant) each form a
+        ring with ``chords`` extra links per router to routers at
+        power-of-two distances around the ring, which keeps the plane
+        diameter logarithmic. Every end node attaches to one router in each
+        plane, chosen with ``numpy.random.default_rng(seed)``, so a single
+        router or link failure never isolates it.
+        With ``cross_strap`` the matching routers of the two planes are
+        also linked. Router ids come first (plane A then plane B); each
+        node's ``metadata`` records its ``role`` and routers their
+        ``plane``.
+        """
+        if routers_per_plane < 1:
+            raise ValueError("A plane needs at least one router")
+        rng = np.random.default_rng(seed)
+        r = routers_per_plane
+        plane_a = np.arange(r)
+        plane_b = plane_a + r
+        end0 = 2 * r
+        ends = end0 + np.arange(num_nodes)
+
+        src: List[np.ndarray] = []
+        dst: List[np.ndarray] = []
+        for plane in (plane_a, plane_b):
+            if r < 2:
+                continue
+            for hop in [1] + [2 ** (c + 1) for c in range(chords)]:
+                if hop >= r:
+                    break
+                src.append(plane)
+                dst.append(plane[(np.arange(r) + hop) % r])
+        if cross_strap:
+            src.append(plane_a)
+            dst.append(plane_b)
+        src.extend([ends, ends])
+        dst.extend([plane_a[rng.integers(0, r, num_nodes)], plane_b[rng.integers(0, r, num_nodes)]])
+
+        total = end0 + num_nodes
+        angle = 2 * np.pi * np.arange(r) / r
+        positions = np.zeros((total, 2))
+        positions[:r] = np.stack([np.cos(angle), np.sin(angle)], axis=1)
+        positions[r:end0] = positions[:r] * 2.0
+        ring = 2 * np.pi * np.arange(num_nodes) / max(num_nodes, 1)
+        positions[end0:] = np.stack([np.cos(ring), np.sin(ring)], axis=1) * 3.0
+
+        topo = Topology.from_arrays(
+            np.concatenate(src), np.concatenate(dst),
+            "DualPlaneBackbone", TopologyType.DUAL_PLANE,
+            node_ids=np.arange(total), positions=positions,
+        )
+        nodes = topo.nodes
+        for node_id in range(total):
+            metadata = nodes[node_id].metadata
+            if node_id < end0:
+                metadata["role"] = "router"
+                metadata["plane"] = "A" if node_id < r else "B"
+            else:
+                metadata["role"] = "node"
         return topo
 
 
@@ -0,0 +1,79 @@
+"""Unit tests for channel module."""
+
+import numpy as np
+import pytest
+from spacewire.channel import BitErrorChannel
+from spacewire.packet import PacketFactory, SpaceWirePacket, SpaceFibrePacket
+
+
+class TestBitErrorChannel:
+    """Tests for the bit-error channel model."""
+
+    def test_invalid_parameters(self):
+        """Test out-of-range parameters are rejected."""
+        with pytest.raises(ValueError):
+            BitErrorChannel(ber=1.5)
+        with pytest.raises(ValueError):
+            BitErrorChannel(burst_length=0.5)
+        with pytest.raises(ValueError):
+            BitErrorChannel(burst_density=1.2)
+
+    def test_zero_ber_is_clean(self):
+        """Test a perfect channel leaves the batch intact."""
+        batch = PacketFactory.create_packet_batch(1, 2, bytes(10000), chunk_size=100)
+        report = BitErrorChannel(ber=0.0, seed=1).transmit(batch)
+        assert report.bit_errors == 0
+        assert not report.corrupted.any()
+        assert batch.verify().all()
+
+    def test_measured_ber(self):
+        """Test the realised bit error rate tracks the configured BER."""
+        batch = PacketFactory.create_packet_batch(1, 2, bytes(1_000_000), chunk_size=1000)
+        report = BitErrorChannel(ber=1e-4, seed=2).transmit(batch)
+        assert 0.5e-4 < report.measured_ber < 2e-4
+        assert report.packets_corrupted > 0
+
+    @pytest.mark.parametrize("protocol", ["spacewire", "spacefibre"])
+    def test_single_bit_errors_detected(self, protocol):
+        """Test CRCs catch every single-bit error."""
+        batch = PacketFactory.create_packet_batch(1, 2, bytes(200_000), 100, protocol)
+        report = BitErrorChannel(ber=2e-5, seed=3).transmit(batch)
+        assert report.bit_errors == report.packets_corrupted > 0
+        assert report.undetected_errors == 0
+        assert (report.detected == report.corrupted).all()
+
+    def test_read_only_payload_copied(self):
+        """Test mmap/bytes-backed payloads are copied before corruption."""
+        data = bytes(5000)
+        batch = PacketFactory.create_packet_batch(1, 2, data, chunk_size=500)
+        BitErrorChannel(ber=1e-2, seed=4).transmit(batch)
+        assert data == bytes(5000)
+        assert not batch.verify().all()
+
+    def test_caller_buffer_unchanged(self):
+        """Test a writable payload buffer is copied, not corrupted."""
+        data = bytearray(5000)
+        batch = PacketFactory.create_packet_batch(1, 2, data, chunk_size=500)
+        BitErrorChannel(ber=1e-2, seed=4).transmit(batch)
+        assert data == bytearray(5000)
+        assert not batch.verify().all()
+
+    def test_bursts(self):
+        """Test burst errors flip clustered bits."""
+        channel = BitErrorChannel(ber=0.0, burst_rate=1e-4, burst_length=16, seed=5)
+        positions = channel.error_positions(1_000_000)
+        assert len(positions) > 0
+        assert (np.diff(positions) < 32).any()
+
+    @pytest.mark.parametrize("cls", [SpaceWirePacket, SpaceFibrePacket])
+    def test_transmit_packet(self, cls):
+        """Test corrupting a single packet object."""
+        pkt = cls(src=1, dst=2, data=bytes(1000))
+        assert BitErrorChannel(ber=0.5, seed=6).transmit_packet(pkt) is True
+        assert pkt.verify() is False
+        clean = cls(src=1, dst=2, data=bytes(1000))
+        assert BitErrorChannel(ber=0.0).transmit_packet(clean) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
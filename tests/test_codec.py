@@ -0,0 +1,69 @@
+"""Unit tests for codec module."""
+
+import pytest
+from spacewire.codec import encode_many, decode_many, iter_frames, encoded_size, EOP, EEP
+from spacewire.packet import SpaceWirePacket, SpaceFibrePacket, PacketBatch, PacketFactory
+
+
+class TestEncodeMany:
+    """Tests for bulk stream encoding."""
+
+    def test_encode_objects_matches_batch(self):
+        """Test object and batch encoders produce identical streams."""
+        packets = [SpaceWirePacket(src=1, dst=2, data=bytes([i]) * (i * 7)) for i in range(6)]
+        batch = PacketBatch.from_packets(packets)
+        assert encode_many(packets) == encode_many(batch)
+
+    def test_encode_into_preallocated(self):
+        """Test encoding into an existing buffer at an offset."""
+        packets = [SpaceFibrePacket(src=1, dst=2, data=b"abc", sequence_number=4)]
+        out = bytearray(2 + encoded_size(packets))
+        result = encode_many(packets, out=out, offset=2)
+        assert result is out
+        frames = list(iter_frames(out, offset=2))
+        assert bytes(frames[0][0]) == packets[0].to_bytes()
+        assert frames[0][1] == EOP
+
+    def test_buffer_too_small(self):
+        """Test an undersized buffer is rejected."""
+        packets = [SpaceWirePacket(data=b"abc")]
+        with pytest.raises(ValueError):
+            encode_many(packets, out=bytearray(4))
+
+
+class TestDecodeMany:
+    """Tests for stream decoding."""
+
+    @pytest.mark.parametrize("protocol", ["spacewire", "spacefibre"])
+    def test_roundtrip(self, protocol):
+        """Test packets survive an encode/decode round trip."""
+        batch = PacketFactory.create_packet_batch(1, 2, bytes(range(256)) * 10, 300, protocol)
+        views = list(decode_many(encode_many(batch), protocol))
+        assert len(views) == len(batch)
+        assert all(v.verify() for v in views)
+        assert b"".join(bytes(v.data) for v in views) == bytes(range(256)) * 10
+
+    def test_eep_packets_skipped(self):
+        """Test packets ending in EEP are dropped unless requested."""
+        packets = [SpaceWirePacket(data=bytes([i])) for i in range(4)]
+        stream = encode_many(packets, errors=[False, True, False, True])
+        assert [bytes(v.data) for v in decode_many(stream)] == [b"\x00", b"\x02"]
+        markers = [m for _, m in iter_frames(stream)]
+        assert markers == [EOP, EEP, EOP, EEP]
+        assert len(list(decode_many(stream, skip_eep=False))) == 4
+
+    def test_partial_frame_ignored(self):
+        """Test a truncated trailing frame is not yielded."""
+        stream = encode_many([SpaceWirePacket(data=b"one"), SpaceWirePacket(data=b"two")])
+        assert len(list(decode_many(stream[:-3]))) == 1
+
+    def test_invalid_marker(self):
+        """Test a corrupted marker raises."""
+        stream = encode_many([SpaceWirePacket(data=b"one")])
+        stream[-1] = 0x7F
+        with pytest.raises(ValueError):
+            list(decode_many(stream))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,202 @@
+"""Unit tests for the CSR adjacency backend."""
+
+import numpy as np
+import pytest
+
+from spacewire.csr import CSRAdjacency
+from spacewire.topology import Topology, TopologyType, TopologyBuilder, Node
+
+
+def _ring(n):
+    src = np.arange(n)
+    return CSRAdjacency.from_edges(
+        np.concatenate([src, (src + 1) % n]), np.concatenate([(src + 1) % n, src])
+    )
+
+
+class TestConstruction:
+    """Tests for building and converting CSR adjacency."""
+
+    def test_from_edges(self):
+        """Test arrays from an edge list."""
+        csr = CSRAdjacency.from_edges([10, 10, 20], [20, 30, 30])
+        assert csr.node_ids.tolist() == [10, 20, 30]
+        assert csr.indptr.tolist() == [0, 2, 3, 3]
+        assert csr.indices.tolist() == [1, 2, 2]
+        assert csr.num_nodes == 3
+        assert csr.num_edges == 3
+
+    def test_isolated_nodes(self):
+        """Test nodes without edges are kept when listed."""
+        csr = CSRAdjacency.from_edges([1], [2], node_ids=[1, 2, 3])
+        assert csr.num_nodes == 3
+        assert csr.degree().tolist() == [1, 0, 0]
+
+    def test_dict_round_trip(self):
+        """Test conversion to and from the dict form."""
+        topo = TopologyBuilder.mesh([0x01, 0x02, 0x03, 0x04])
+        csr = CSRAdjacency.from_dict(topo.edges)
+        assert csr.to_dict() == topo.edges
+
+    def test_topology_round_trip(self):
+        """Test Topology.to_csr / from_csr."""
+        topo = TopologyBuilder.bus([0x01, 0x02, 0x03])
+        csr = topo.to_csr()
+        assert 0x00 in csr.node_ids
+        rebuilt = Topology.from_csr(csr, "Bus", TopologyType.BUS)
+        assert rebuilt.edges == topo.edges
+        assert set(rebuilt.nodes) == {0x00, 0x01, 0x02, 0x03}
+
+    def test_stored_weights(self):
+        """Test weights follow their edges and round-trip through Topology."""
+        csr = CSRAdjacency.from_edges([2, 1, 1], [3, 3, 2], weights=[7.0, 5.0, 1.0])
+        assert csr.indices.tolist() == [2, 1, 2]
+        assert csr.weights.tolist() == [5.0, 1.0, 7.0]
+        assert csr.dijkstra_path(1, 3) == [1, 3]
+        assert csr.weight_dict() == {(1, 3): 5.0, (1, 2): 1.0, (2, 3): 7.0}
+        topo = Topology.from_csr(csr)
+        assert topo.link_weights == csr.weight_dict()
+        assert topo.to_csr().weights.tolist() == [5.0, 1.0, 7.0]
+
+    def test_misaligned_weights(self):
+        """Test weights must match the edges."""
+        with pytest.raises(ValueError):
+            CSRAdjacency(np.array([1, 2]), np.array([0, 1, 1]), np.array([1]), np.array([1.0, 2.0]))
+
+    def test_mismatched_edges(self):
+        """Test edge arrays of different lengths are rejected."""
+        with pytest.raises(ValueError):
+            CSRAdjacency.from_edges([1, 2], [3])
+
+
+class TestSearch:
+    """Tests for BFS and Dijkstra on CSR arrays."""
+
+    def test_bfs_distances(self):
+        """Test hop distances on a ring."""
+        distance, parent = _ring(10).bfs(0)
+        assert distance.tolist() == [0, 1, 2, 3, 4, 5, 4, 3, 2, 1]
+        assert parent[0] == 0
+
+    def test_bfs_path_matches_topology(self):
+        """Test paths have the same length as Topology.bfs_path."""
+        topo = TopologyBuilder.mesh(list(range(1, 8)))
+        topo.add_edge(7, 20)
+        csr = topo.to_csr()
+        for dst in (2, 7, 20):
+            assert len(csr.bfs_path(1, dst)) == len(topo.bfs_path(1, dst))
+
+    def test_unreachable(self):
+        """Test unreachable targets give no path."""
+        csr = CSRAdjacency.from_edges([1, 3], [2, 4])
+        assert csr.bfs_path(1, 4) is None
+        assert csr.dijkstra_path(1, 4) is None
+        assert csr.bfs_path(1, 99) is None
+
+    def test_dijkstra_weights(self):
+        """Test weighted routing avoids an expensive direct link."""
+        topo = Topology("Test", TopologyType.MESH)
+        topo.add_edge(1, 2)
+        topo.add_edge(2, 3)
+        topo.add_edge(1, 3)
+        csr = topo.to_csr()
+        weights = csr.edge_weights({(1, 3): 5.0, (3, 1): 5.0})
+        assert csr.dijkstra_path(1, 3) == [1, 3]
+        assert csr.dijkstra_path(1, 3, weights) == [1, 2, 3]
+        assert csr.dijkstra_path(1, 3, weights) == topo.dijkstra_path(1, 3, {(1, 3): 5.0})
+
+    def test_heuristic_scale(self):
+        """Test the A* scale is the smallest cost per unit length."""
+        csr = CSRAdjacency.from_edges([0, 1], [1, 2], weights=[2.0, 3.0])
+        coords = np.array([[0.0, 0.0], [1.0, 0.0], [3.0, 0.0]])
+        assert csr.heuristic_scale(coords) == 1.5
+        assert csr.astar_path(0, 2, coords) == [0, 1, 2]
+
+    def test_first_hops(self):
+        """Test multi-source first hops on a ring."""
+        hops = _ring(6).first_hops(np.array([0, 3]))
+        assert hops[0, [0, 1, 2, 4, 5]].tolist() == [0, 1, 1, 5, 5]
+        assert hops[0, 3] in (1, 5)
+        assert hops[1, 3] == 3
+        assert hops[1, 4] == 4
+
+
+class TestValidation:
+    """Tests for connectivity and validation on CSR arrays."""
+
+    def test_connected(self):
+        """Test a ring is connected and valid."""
+        csr = _ring(100)
+        assert csr.is_connected()
+        assert csr.validate() == (True, [])
+
+    def test_not_connected(self):
+        """Test disconnected graphs fail validation."""
+        csr = CSRAdjacency.from_edges([1, 3], [2, 4])
+        assert not csr.is_connected()
+        is_valid, errors = csr.validate()
+        assert not is_valid
+        assert "Topology is not fully connected" in errors
+
+    def test_matches_topology(self):
+        """Test both backends agree on weak connectivity."""
+        topologies = [
+            TopologyBuilder.point_to_point(2, 1),
+            TopologyBuilder.tree(5, [[1, 2]]),
+            TopologyBuilder.ring(1, [2, 3, 4]),
+            Topology.from_edge_list([(1, 2)], node_ids=[3]),
+        ]
+        for topo in topologies:
+            csr = topo.to_csr()
+            assert csr.is_connected() == topo.is_connected()
+            assert csr.validate()[0] == topo.validate()[0]
+        assert not topologies[-1].to_csr().is_connected()
+
+    def test_empty(self):
+        """Test an empty graph fails validation."""
+        csr = CSRAdjacency.from_edges([], [])
+        is_valid, errors = csr.validate()
+        assert not is_valid
+        assert "Topology has no nodes" in errors
+
+
+class TestAllPairs:
+    """Tests for all-pairs shortest paths."""
+
+    def test_hop_counts(self):
+        """Test hop distances and next hops on a ring."""
+        result = _ring(8).all_pairs(workers=1)
+        assert result.distance[0].tolist() == [0, 1, 2, 3, 4, 3, 2, 1]
+        assert result.next_hop[0, 1] == 1
+        assert result.next_hop[0, 7] == 7
+        assert result.next_hop[3, 3] == 3
+        assert len(result.path(0, 4)) == 5
+
+    def test_weighted(self):
+        """Test weights steer next hops."""
+        topo = Topology("Test", TopologyType.MESH)
+        topo.add_edges([(1, 2), (2, 3), (1, 3)])
+        result = topo.all_pairs_shortest_paths({(1, 3): 5.0}, workers=1)
+        i, k = result.index(1), result.index(3)
+        assert result.distance[i, k] == 2.0
+        assert result.path(1, 3) == [1, 2, 3]
+        assert result.path(3, 1) == [3, 1]
+
+    def test_unreachable(self):
+        """Test unreachable pairs are inf / -1."""
+        topo = Topology("Test", TopologyType.MESH)
+        topo.add_edges([(1, 2), (3, 4)])
+        result = topo.all_pairs_shortest_paths(workers=1)
+        i, k = result.index(1), result.index(4)
+        assert np.isinf(result.distance[i, k])
+        assert result.next_hop[i, k] == -1
+        assert result.path(1, 4) is None
+
+    @pytest.mark.parametrize("weights", [None, {(0, 1): 3.0}])
+    def test_process_pool_matches_serial(self, weights):
+        """Test sharded results equal the in-process results."""
+        topo = Topology.from_edge_list((i, (i + 1) % 30) for i in range(30))
+        serial = topo.all_pairs_shortest_paths(weights, workers=1)
+        pooled = topo.all_pairs_shortest_paths(weights, workers=2)
+        assert np.array_equal(serial.distance, pooled.distance)
+        assert np.array_equal(serial.next_hop, pooled.next_hop)
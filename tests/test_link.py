@@ -0,0 +1,128 @@
+"""Unit tests for link module."""
+
+import numpy as np
+import pytest
+from spacewire.config import NetworkConfig, QoSConfig
+from spacewire.link import Link, LinkParameters
+
+
+class TestLinkParameters:
+    """Tests for link timing and credit arithmetic."""
+
+    def test_spacewire_timing(self):
+        """Test SpaceWire sends 10-bit data characters plus a 4-bit EOP."""
+        params = LinkParameters(data_rate=200e6)
+        assert params.wire_bits(1000) == 10 * 1005 + 4
+        assert params.serialization_delay(1000) == pytest.approx(10054 / 200e6)
+
+    def test_spacefibre_timing(self):
+        """Test SpaceFibre adds per-frame overhead and 8B/10B coding."""
+        params = LinkParameters(protocol="spacefibre", rx_buffer=1024)
+        assert params.wire_bits(100) == 10 * (107 + 8)
+        assert params.wire_bits(1000) == 10 * (1007 + 4 * 8)
+
+    def test_header_delay(self):
+        """Test routers see the address after one character or word."""
+        assert LinkParameters(data_rate=100e6).header_delay() == pytest.approx(1e-7)
+        params = LinkParameters(protocol="spacefibre", data_rate=100e6, rx_buffer=256)
+        assert params.header_delay() == pytest.approx(8e-7)
+
+    def test_credit_cost(self):
+        """Test credits round up to FCTs and are capped by the buffer."""
+        params = LinkParameters(rx_buffer=56)
+        assert params.credit_cost(2) == 8
+        assert params.credit_cost(20) == 32
+        assert params.credit_cost(1000) == 56
+
+    def test_vc_shares(self):
+        """Test class allocations are split over each class's channels."""
+        qos = QoSConfig()
+        params = LinkParameters.from_config(
+            NetworkConfig(link_protocol="spacefibre", rx_buffer=1024), qos
+        )
+        shares = params.vc_shares()
+        assert [share for share, _ in shares] == pytest.approx(
+            [0.2, 0.2, 0.15, 0.15, 0.1, 0.1, 0.05, 0.05]
+        )
+        assert [strict for _, strict in shares] == [True, True] + [False] * 6
+        assert [params.vc_of_priority(p) for p in range(4)] == [0, 2, 4, 6]
+        two = params.override(virtual_channels=2).vc_shares()
+        assert two == [(pytest.approx(0.7), True), (pytest.approx(0.3), False)]
+
+    def test_invalid(self):
+        """Test inconsistent settings are rejected."""
+        with pytest.raises(ValueError):
+            LinkParameters(protocol="ethernet")
+        with pytest.raises(ValueError):
+            LinkParameters(data_rate=0)
+        with pytest.raises(ValueError):
+            LinkParameters(protocol="spacefibre", rx_buffer=56)
+
+    def test_from_config(self):
+        """Test config defaults, with VCs only for SpaceFibre."""
+        qos = QoSConfig(virtual_channels=8)
+        assert LinkParameters.from_config(NetworkConfig(), qos).virtual_channels == 1
+        network = NetworkConfig(link_protocol="spacefibre", rx_buffer=1024)
+        params = LinkParameters.from_config(network, qos)
+        assert params.virtual_channels == 8
+        assert params.override(data_rate=1e9).data_rate == 1e9
+
+
+class TestLink:
+    """Tests for link queueing and credit state."""
+
+    def test_select_skips_stalled_channel(self):
+        """Test a channel without credit does not block the others."""
+        link = Link(
+            0, 1, 2, LinkParameters(protocol="spacefibre", rx_buffer=512, virtual_channels=2)
+        )
+        link.enqueue(10, 0, 512, 500)
+        link.enqueue(11, 1, 256, 100)
+        link.credits[0] = 256
+        assert link.select() == (1, 11, 256)
+        link.start(1, 100, 256, now=0.0)
+        assert link.select() is None
+        link.credits[0] = 512
+        assert link.select() == (0, 10, 512)
+
+    def test_deficit_round_robin_shares(self):
+        """Test backlogged channels are served in proportion to their shares."""
+        params = LinkParameters(
+            protocol="spacefibre",
+            rx_buffer=1 << 20,
+            virtual_channels=8,
+            bandwidth_allocation=QoSConfig().bandwidth_allocation,
+        )
+        link = Link(0, 1, 2, params)
+        rng = np.random.default_rng(0)
+        for packet in range(3000):
+            link.enqueue(packet, 2 + 2 * (packet % 3), 0, int(rng.integers(100, 1000)))
+        sent = {2: 0, 4: 0, 6: 0}
+        while sum(sent.values()) < 200_000:
+            vc, packet, _ = link.select()
+            size = link.queues[vc][0][2]
+            link.start(vc, size, 0, now=0.0)
+            sent[vc] += size
+        assert sent[2] / sent[6] == pytest.approx(3.0, rel=0.05)
+        assert sent[4] / sent[6] == pytest.approx(2.0, rel=0.05)
+
+    def test_critical_first(self):
+        """Test CRITICAL channels preempt the round robin."""
+        params = LinkParameters(protocol="spacefibre", rx_buffer=1024, virtual_channels=8)
+        link = Link(0, 1, 2, params)
+        link.enqueue(1, 6, 256, 100)
+        link.enqueue(2, 1, 256, 100)
+        assert link.select() == (1, 2, 256)
+
+    def test_channel_out_of_range(self):
+        """Test packets for a missing channel are refused, not wrapped."""
+        link = Link(0, 1, 2, LinkParameters())
+        with pytest.raises(ValueError):
+            link.enqueue(1, 1, 8, 1)
+
+    def test_queue_limit(self):
+        """Test a full channel refuses packets."""
+        link = Link(0, 1, 2, LinkParameters(queue_limit=2))
+        assert link.enqueue(1, 0, 8, 1) and link.enqueue(2, 0, 8, 1)
+        assert not link.enqueue(3, 0, 8, 1)
+        assert link.dropped == 1 and link.queued == 2
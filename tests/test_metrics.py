@@ -112,6 +112,18 @@ class TestMetricsCollector:
         assert snapshot.packets_sent == 1
         assert isinstance(snapshot.timestamp, float)
 
+    def test_custom_clock(self):
+        """Test runtime and timestamps follow an injected clock."""
+        now = [100.0]
+        metrics = MetricsCollector(clock=lambda: now[0])
+        metrics.record_sent(100)
+        now[0] = 102.0
+        assert metrics.runtime == 2.0
+        assert metrics.get_throughput() == 0.5
+        assert metrics.take_snapshot().timestamp == 102.0
+        metrics.set_clock(lambda: 5.0)
+        assert metrics.runtime == 0.0
+
     def test_export_json(self, tmp_path):
         """Test JSON export."""
         metrics = MetricsCollector()
@@ -143,6 +155,17 @@ class TestQoSMetrics:
         stats = qos.get_priority_stats()
         assert stats[1]["count"] == 2
 
+    def test_vc_stats(self):
+        """Test per-VC throughput on a custom clock."""
+        now = [0.0]
+        qos = QoSMetrics(clock=lambda: now[0])
+        qos.record_vc(3, 0.001, 500)
+        qos.record_vc(3, 0.003, 500)
+        now[0] = 2.0
+        stats = qos.get_vc_stats()
+        assert stats[3]["throughput_bps"] == 4000
+        assert stats[3]["avg_latency"] == pytest.approx(0.002)
+
 
 class TestMetricsSnapshot:
     """Tests for MetricsSnapshot."""
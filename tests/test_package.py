@@ -0,0 +1,81 @@
+"""Unit tests for package-level imports."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import spacewire
+from spacewire._lazy import lazy_import, is_available
+
+IMPORT_BUDGET_SECONDS = 0.05
+"""Maximum cumulative time ``import spacewire`` may take."""
+
+HEAVY_MODULES = ("numpy", "scapy", "yaml", "tkinter", "matplotlib")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        check=True,
+    )
+
+
+class TestLazyPackage:
+    """Tests for lazy package attributes."""
+
+    def test_import_time_budget(self):
+        """Test ``import spacewire`` stays within the import-time budget."""
+        result = _run("import spacewire")
+        lines = [l for l in result.stderr.splitlines() if l.rstrip().endswith("| spacewire")]
+        assert lines, result.stderr
+        cumulative_us = int(lines[-1].split("|")[1])
+        assert cumulative_us / 1e6 < IMPORT_BUDGET_SECONDS
+
+    def test_no_heavy_dependencies_on_import(self):
+        """Test importing the package loads no heavy dependency."""
+        code = (
+            "import sys, spacewire; " f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        )
+        assert _run(code).stdout.strip() == "[]"
+
+    def test_packet_module_skips_scapy(self):
+        """Test the packet module does not import scapy."""
+        code = (
+            "import sys, spacewire.packet, spacewire.config; "
+            "print('scapy' in sys.modules, 'yaml' in sys.modules)"
+        )
+        assert _run(code).stdout.strip() == "False False"
+
+    def test_lazy_attributes(self):
+        """Test public names resolve on access."""
+        from spacewire.packet import SpaceWirePacket
+
+        assert spacewire.SpaceWirePacket is SpaceWirePacket
+        assert "Topology" in dir(spacewire)
+        with pytest.raises(AttributeError):
+            spacewire.DoesNotExist
+
+
+class TestLazyImport:
+    """Tests for deferred optional imports."""
+
+    def test_lazy_module_loads_on_use(self):
+        """Test a lazy module proxies attributes of the real module."""
+        json_module = lazy_import("json")
+        assert json_module.dumps([1]) == "[1]"
+
+    def test_is_available(self):
+        """Test availability probing."""
+        assert is_available("json") is True
+        assert is_available("spacewire_missing_dependency") is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,9 +1,13 @@
 """Unit tests for packet module."""
 
+import random
+import threading
+
+import numpy as np
 import pytest
 from spacewire.packet import (
-    CRC8, CRC16, SpaceWirePacket, SpaceFibrePacket, 
-    PacketFactory, PacketPriority, PacketType
+    CRC8, CRC16, CRC16Context, SpaceWirePacket, SpaceFibrePacket, 
+    PacketFactory, PacketPriority, PacketType, PacketBatch, PacketView, SequenceAllocator
 )
 
 
@@ -35,6 +39,36 @@ class TestCRC8:
         crc = CRC8.calculate(b"")
         assert crc == 0
 
+    def test_crc8_table_matches_bitwise(self):
+        """Test table-driven CRC-8 against the bit-by-bit definition."""
+        def bitwise(data):
+            crc = 0
+            for byte in data:
+                crc ^= byte
+                for _ in range(8):
+                    crc = ((crc << 1) ^ CRC8.POLYNOMIAL) if crc & 0x80 else (crc << 1)
+                    crc &= 0xFF
+            return crc
+
+        rng = random.Random(1)
+        for length in (0, 1, 7, 64, 1000):
+            data = bytes(rng.randrange(256) for _ in range(length))
+            assert CRC8.calculate(data) == bitwise(data)
+
+    def test_crc8_batch(self):
+        """Test batched CRC-8 with mixed payload lengths."""
+        rng = random.Random(2)
+        payloads = [bytes(rng.randrange(256) for _ in range(n)) for n in (0, 3, 100, 17, 100)]
+        crcs = CRC8.calculate_batch(payloads)
+        assert crcs.tolist() == [CRC8.calculate(p) for p in payloads]
+
+    def test_crc8_chunks(self):
+        """Test chunked CRC-8 including a short tail chunk."""
+        data = bytes(range(256)) * 10
+        crcs = CRC8.calculate_chunks(data, 300)
+        expected = [CRC8.calculate(data[i:i + 300]) for i in range(0, len(data), 300)]
+        assert crcs.tolist() == expected
+
 
 class TestCRC16:
     """Tests for CRC-16 implementation."""
@@ -59,6 +93,45 @@ class TestCRC16:
         corrupted = data[:-1] + bytes([(data[-1] + 1) % 256])
         assert CRC16.verify(corrupted, crc) is False
 
+    def test_crc16_known_value(self):
+        """Test CRC-16/CCITT-FALSE check value."""
+        assert CRC16.calculate(b"123456789") == 0x29B1
+
+    @pytest.mark.parametrize("slices", [1, 4, 8])
+    def test_crc16_slice_widths(self, slices):
+        """Test slice-by-N paths agree for lengths around the slice width."""
+        rng = random.Random(slices)
+        for length in range(0, 40):
+            data = bytes(rng.randrange(256) for _ in range(length))
+            assert CRC16.update(0xFFFF, data, slices) == CRC16.update(0xFFFF, data, 1)
+
+    def test_crc16_invalid_slices(self):
+        """Test unsupported slice widths are rejected."""
+        with pytest.raises(ValueError):
+            CRC16.update(0xFFFF, b"12345678", slices=3)
+
+
+class TestCRC16Context:
+    """Tests for incremental CRC-16."""
+
+    def test_incremental_matches_calculate(self):
+        """Test chunked updates over memoryviews match a one-shot CRC."""
+        data = bytes(range(256)) * 5 + b"tail"
+        view = memoryview(data)
+        ctx = CRC16Context()
+        for i in range(0, len(data), 13):
+            ctx.update(view[i:i + 13])
+        assert ctx.digest() == CRC16.calculate(data)
+
+    def test_copy_and_reset(self):
+        """Test copying and resetting a context."""
+        ctx = CRC16Context(b"abc")
+        clone = ctx.copy().update(b"def")
+        assert ctx.digest() == CRC16.calculate(b"abc")
+        assert clone.digest() == CRC16.calculate(b"abcdef")
+        ctx.reset()
+        assert ctx.digest() == CRC16.calculate(b"")
+
 
 class TestSpaceWirePacket:
     """Tests for SpaceWire packet."""
@@ -102,6 +175,50 @@ class TestSpaceWirePacket:
         assert "0x01" in repr_str
         assert "0x02" in repr_str
 
+    def test_packet_has_no_dict(self):
+        """Test packets are slotted."""
+        pkt = SpaceFibrePacket(src=0x01, dst=0x02, data=b"test")
+        assert not hasattr(pkt, "__dict__")
+        with pytest.raises(AttributeError):
+            pkt.unknown = 1
+
+    def test_simulated_clock(self):
+        """Test packets can be stamped from a simulated clock."""
+        try:
+            SpaceWirePacket.set_clock(lambda: 42.0)
+            assert SpaceWirePacket(data=b"x").timestamp == 42.0
+            assert SpaceFibrePacket(data=b"x").timestamp == 42.0
+            assert SpaceWirePacket(data=b"x", timestamp=1.5).timestamp == 1.5
+        finally:
+            SpaceWirePacket.set_clock()
+
+    def test_deferred_timestamp(self):
+        """Test deferred timestamps are taken on first access."""
+        now = [1.0]
+        try:
+            SpaceWirePacket.set_clock(lambda: now[0], deferred=True)
+            pkt = SpaceWirePacket(data=b"x")
+            now[0] = 2.0
+            assert pkt.timestamp == 2.0
+            now[0] = 3.0
+            assert pkt.timestamp == 2.0
+        finally:
+            SpaceWirePacket.set_clock()
+
+    def test_from_bytes_roundtrip(self):
+        """Test deserialization keeps fields and the wire CRC."""
+        pkt = SpaceWirePacket(src=0x01, dst=0x02, route=0x05, data=b"test")
+        parsed = SpaceWirePacket.from_bytes(pkt.to_bytes())
+        assert (parsed.src, parsed.dst, parsed.route, parsed.data) == (1, 2, 5, b"test")
+        assert parsed.crc == pkt.crc
+        assert parsed.verify() is True
+
+    def test_from_bytes_detects_corruption(self):
+        """Test a corrupted frame no longer verifies after parsing."""
+        wire = bytearray(SpaceWirePacket(src=0x01, dst=0x02, data=b"test").to_bytes())
+        wire[5] ^= 0x10
+        assert SpaceWirePacket.from_bytes(bytes(wire)).verify() is False
+
 
 class TestSpaceFibrePacket:
     """Tests for SpaceFibre packet."""
@@ -120,6 +237,49 @@ class TestSpaceFibrePacket:
         pkt.crc = CRC16.calculate(pkt.data)
         assert pkt.verify() is True
 
+    def test_from_bytes_roundtrip(self):
+        """Test SpaceFibre deserialization."""
+        pkt = SpaceFibrePacket(
+            src=0x01, dst=0x02, data=b"fibre", virtual_channel=5, sequence_number=9,
+            flow_control=True,
+        )
+        parsed = SpaceFibrePacket.from_bytes(pkt.to_bytes())
+        assert isinstance(parsed, SpaceFibrePacket)
+        assert parsed.virtual_channel == 5
+        assert parsed.sequence_number == 9
+        assert parsed.flow_control is True
+        assert parsed.data == b"fibre"
+        assert parsed.crc == pkt.crc
+
+
+class TestPacketView:
+    """Tests for zero-copy packet views."""
+
+    def test_view_fields(self):
+        """Test header fields and payload view over a bytearray."""
+        wire = bytearray(SpaceWirePacket(src=0x03, dst=0x04, route=0x21, data=b"abc").to_bytes())
+        view = PacketView(wire)
+        assert (view.src, view.dst, view.route) == (0x03, 0x04, 0x21)
+        assert view.packet_type == PacketType.DATA
+        assert len(view) == 3
+        assert view.verify() is True
+        wire[4] = ord("x")
+        assert bytes(view.data) == b"xbc"
+
+    def test_view_spacefibre_verify(self):
+        """Test SpaceFibre views check the on-wire CRC-16."""
+        wire = bytearray(SpaceFibrePacket(src=1, dst=2, data=b"payload", virtual_channel=3).to_bytes())
+        assert PacketView(wire, "spacefibre").verify() is True
+        wire[-1] ^= 0x01
+        view = PacketView(wire, "spacefibre")
+        assert view.virtual_channel == 3
+        assert view.verify() is False
+
+    def test_view_too_short(self):
+        """Test truncated frames are rejected."""
+        with pytest.raises(ValueError):
+            PacketView(b"\x01\x02\x03\x04", "spacewire")
+
 
 class TestPacketFactory:
     """Tests for packet factory."""
@@ -141,6 +301,141 @@ class TestPacketFactory:
         assert len(packets) == 3
         assert all(p.virtual_channel == 2 for p in packets)
 
+    def test_spacewire_batch_rejects_virtual_channel(self):
+        """Test virtual channels are refused for SpaceWire batches."""
+        with pytest.raises(TypeError):
+            PacketFactory.create_batch(0x01, 0x02, b"C" * 10, protocol="spacewire", virtual_channel=1)
+
+    def test_batch_crc_matches_constructor(self):
+        """Test batched CRCs equal per-packet CRCs."""
+        data = bytes(range(256)) * 9
+        packets = PacketFactory.create_batch(0x01, 0x02, data, chunk_size=500)
+        assert all(p.crc == CRC8.calculate(p.data) for p in packets)
+        assert all(p.verify() for p in packets)
+
+    def test_iter_file_packets(self, tmp_path):
+        """Test streaming a file yields the same packets as create_batch."""
+        data = bytes(range(256)) * 11
+        path = tmp_path / "payload.bin"
+        path.write_bytes(data)
+        streamed = list(PacketFactory.iter_file(str(path), chunk_size=300))
+        expected = PacketFactory.create_batch(0x01, 0x02, data, chunk_size=300)
+        assert [p.data for p in streamed] == [p.data for p in expected]
+        assert [p.crc for p in streamed] == [p.crc for p in expected]
+
+    def test_iter_file_batches(self, tmp_path):
+        """Test streaming a file in PacketBatch blocks."""
+        path = tmp_path / "payload.bin"
+        path.write_bytes(b"D" * 10500)
+        blocks = list(PacketFactory.iter_file_batches(
+            str(path), chunk_size=1000, protocol="spacefibre", batch_size=4
+        ))
+        assert [len(b) for b in blocks] == [4, 4, 3]
+        assert all(b.verify().all() for b in blocks)
+        assert blocks[-1].lengths.tolist() == [1000, 1000, 500]
+
+    def test_iter_file_empty(self, tmp_path):
+        """Test an empty file yields nothing."""
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+        assert list(PacketFactory.iter_file(str(path))) == []
+
+    def test_spacefibre_sequence_wraps(self):
+        """Test per-link/VC sequence numbers fit the one-byte header field."""
+        batch = PacketFactory.create_packet_batch(
+            0x0A, 0x0B, bytes(300), chunk_size=1, protocol="spacefibre", virtual_channel=6
+        )
+        assert batch.sequence_number.max() <= 255
+        assert batch.sequence_number[256] == batch.sequence_number[0]
+        pkt = PacketFactory.create_spacefibre(0x0A, 0x0B, b"x", virtual_channel=6)
+        assert len(pkt.to_bytes()) == 8
+
+
+class TestSequenceAllocator:
+    """Tests for sequence number allocation."""
+
+    def test_reserve_contiguous(self):
+        """Test ranges are contiguous and independent per key."""
+        alloc = SequenceAllocator(modulus=None)
+        assert alloc.reserve(10, key="a") == 0
+        assert alloc.reserve(5, key="a") == 10
+        assert alloc.reserve(3, key="b") == 0
+
+    def test_reserve_array_wraps(self):
+        """Test reserved arrays wrap at the modulus."""
+        alloc = SequenceAllocator(modulus=256)
+        alloc.reserve(250)
+        assert alloc.reserve_array(10).tolist() == [250, 251, 252, 253, 254, 255, 0, 1, 2, 3]
+
+    def test_next_threads_unique(self):
+        """Test concurrent producers never get a number twice."""
+        alloc = SequenceAllocator(modulus=None)
+        results = [[] for _ in range(4)]
+
+        def worker(out):
+            for _ in range(1000):
+                out.append(alloc.next("link"))
+
+        threads = [threading.Thread(target=worker, args=(r,)) for r in results]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        values = [v for r in results for v in r]
+        assert len(set(values)) == 4000
+        assert all(r == sorted(r) for r in results)
+
+    def test_single_and_batch_in_order(self):
+        """Test single and batch creation on one link/VC share one ordered space."""
+        PacketFactory._sequences.reset()
+        key = dict(virtual_channel=2)
+        numbers = [PacketFactory.create_spacefibre(0x0C, 0x0D, b"x", **key).sequence_number]
+        batch = PacketFactory.create_packet_batch(
+            0x0C, 0x0D, bytes(3), chunk_size=1, protocol="spacefibre", **key
+        )
+        numbers += batch.sequence_number.tolist()
+        numbers.append(PacketFactory.create_spacefibre(0x0C, 0x0D, b"x", **key).sequence_number)
+        # Sequence spaces start at 0 (the old class-wide counter started at 1).
+        assert numbers == [0, 1, 2, 3, 4]
+        for _ in range(300):
+            numbers.append(PacketFactory.create_spacefibre(0x0C, 0x0D, b"x", **key).sequence_number)
+        assert all((b - a) % 256 == 1 for a, b in zip(numbers, numbers[1:]))
+
+
+class TestPacketBatch:
+    """Tests for columnar packet batches."""
+
+    def test_batch_fields(self):
+        """Test column values and lazy packet views."""
+        batch = PacketFactory.create_packet_batch(
+            0x01, 0x02, b"C" * 2500, chunk_size=1000, protocol="spacefibre", virtual_channel=4
+        )
+        assert len(batch) == 3
+        assert batch.lengths.tolist() == [1000, 1000, 500]
+        assert (batch.virtual_channel == 4).all()
+        assert batch[2].data == b"C" * 500
+        assert bytes(batch.payload_view(1)) == b"C" * 1000
+
+    @pytest.mark.parametrize("cls", [SpaceWirePacket, SpaceFibrePacket])
+    def test_batch_crc_and_serialize(self, cls):
+        """Test vectorized CRC and serialization against packet objects."""
+        rng = random.Random(3)
+        packets = [
+            cls(src=1, dst=2, data=bytes(rng.randrange(256) for _ in range(n)))
+            for n in (5, 0, 40, 5, 17)
+        ]
+        batch = PacketBatch.from_packets(packets)
+        assert batch.compute_crc().tolist() == [p.crc for p in packets]
+        assert batch.verify().all()
+        assert batch.to_bytes() == b"".join(p.to_bytes() for p in packets)
+
+    def test_batch_inject_errors(self):
+        """Test vectorized error injection corrupts exactly the masked CRCs."""
+        batch = PacketFactory.create_packet_batch(0x01, 0x02, bytes(5000), chunk_size=100)
+        mask = batch.inject_errors(0.5, rng=np.random.default_rng(7))
+        assert mask.any()
+        assert (batch.verify() == ~mask).all()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
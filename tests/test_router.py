@@ -0,0 +1,110 @@
+"""Unit tests for router module."""
+
+import pytest
+from spacewire.router import (
+    Router,
+    RouterNetwork,
+    CONFIG_PORT,
+    LOGICAL_ADDRESS_MIN,
+)
+from spacewire.topology import Topology, TopologyBuilder
+
+
+class TestRouter:
+    """Tests for a single router."""
+
+    def test_path_address_deleted(self):
+        """Test path addresses pick a port and strip the leading byte."""
+        router = Router(1, [2, 3])
+        assert router.forward(bytes([2, 1, 0])) == (2, bytes([1, 0]))
+        assert router.forward(bytes([5])) is None
+
+    def test_logical_address(self):
+        """Test logical addresses use the table and keep the header by default."""
+        router = Router(1, [2, 3])
+        router.set_route(40, [1])
+        router.set_route(41, [2], delete_header=True)
+        assert router.forward(bytes([40])) == (1, bytes([40]))
+        assert router.forward(bytes([41, 7])) == (2, bytes([7]))
+        assert router.forward(bytes([42])) is None
+
+    def test_group_adaptive(self):
+        """Test the first free port of a group is chosen."""
+        router = Router(1, [2, 3, 4])
+        router.set_route(50, [1, 2, 3])
+        assert router.forward(bytes([50]))[0] == 1
+        router.busy[1] = 1
+        assert router.forward(bytes([50]))[0] == 2
+        router.busy[2] = router.busy[3] = 1
+        assert router.forward(bytes([50]))[0] == 1
+
+    def test_invalid_route(self):
+        """Test out-of-range addresses and ports are rejected."""
+        router = Router(1, [2])
+        with pytest.raises(ValueError):
+            router.set_route(10, [1])
+        with pytest.raises(ValueError):
+            router.set_route(40, [2])
+
+
+class TestRouterNetwork:
+    """Tests for routing tables compiled from a topology."""
+
+    def test_default_addresses(self):
+        """Test small ids are renumbered into the logical range."""
+        network = RouterNetwork(TopologyBuilder.mesh([0x01, 0x02, 0x03]))
+        assert network.address_of == {1: 32, 2: 33, 3: 34}
+        network = RouterNetwork(TopologyBuilder.mesh([0x40, 0x41]))
+        assert network.address_of == {0x40: 0x40, 0x41: 0x41}
+
+    def test_too_many_nodes(self):
+        """Test networks beyond the logical address space need explicit addresses."""
+        topo = TopologyBuilder.torus_2d(16, 16)
+        with pytest.raises(ValueError):
+            RouterNetwork(topo)
+        network = RouterNetwork(topo, addresses={0: LOGICAL_ADDRESS_MIN})
+        assert len(network.trace(136, network.logical_header(0))) == 17
+
+    def test_logical_routes_are_shortest(self):
+        """Test every logical route follows a shortest path."""
+        topo = TopologyBuilder.torus_2d(4, 5)
+        network = RouterNetwork(topo)
+        for src in topo.nodes:
+            for dst in topo.nodes:
+                path = network.trace(src, network.logical_header(dst))
+                assert path[0] == src and path[-1] == dst
+                assert len(path) == len(topo.bfs_path(src, dst))
+
+    def test_adaptive_groups(self):
+        """Test groups hold every equal-cost port."""
+        topo = TopologyBuilder.torus_2d(4, 4)
+        network = RouterNetwork(topo)
+        router = network.router(0)
+        group = router.lookup(network.address_of[5])
+        assert sorted(router.ports[port] for port in group) == [1, 4]
+        assert router.lookup(network.address_of[0]) == (CONFIG_PORT,)
+
+    def test_path_header(self):
+        """Test path addressing reaches the destination with header deletion."""
+        topo = TopologyBuilder.ring(0x01, [0x02, 0x03, 0x04])
+        network = RouterNetwork(topo)
+        header = network.path_header([1, 2, 3])
+        assert header == bytes([1, 1, CONFIG_PORT])
+        assert network.trace(1, header) == [1, 2, 3]
+        with pytest.raises(ValueError):
+            network.path_header([1, 3])
+
+    def test_directed_links(self):
+        """Test tables follow link direction."""
+        network = RouterNetwork(TopologyBuilder.ring(0x01, [0x02, 0x03, 0x04]))
+        assert network.trace(2, network.logical_header(1)) == [2, 3, 4, 1]
+
+    def test_recompile_after_failure(self):
+        """Test tables are rebuilt after a link fails."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3), (1, 3)])
+        network = RouterNetwork(topo, delete_logical=True)
+        assert network.trace(1, network.logical_header(3)) == [1, 3]
+        assert network.router(3).forward(network.logical_header(3)) == (CONFIG_PORT, b"")
+        topo.fail_link(1, 3)
+        assert network.is_stale
+        assert network.trace(1, network.logical_header(3)) == [1, 2, 3]
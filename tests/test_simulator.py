@@ -0,0 +1,384 @@
+"""Unit tests for simulator module."""
+
+import numpy as np
+import pytest
+from spacewire.config import NetworkConfig, QoSConfig, SimulationConfig
+from spacewire.link import LinkParameters
+from spacewire.metrics import MetricsCollector, QoSMetrics
+from spacewire.packet import SpaceWirePacket
+from spacewire.router import RouterNetwork
+from spacewire.simulator import LinkSimulator, Simulator, WormholeSimulator
+from spacewire.topology import PathSelector, Topology, TopologyBuilder
+
+
+class TestSimulator:
+    """Tests for the discrete-event kernel."""
+
+    def test_single_packet(self):
+        """Test a packet's latency is one hop delay per link."""
+        topo = TopologyBuilder.ring(0x01, [0x02, 0x03, 0x04])
+        sim = Simulator(topo, hop_latency=0.5)
+        packet = sim.inject(1, 4, 100, at=2.0)
+        assert sim.run() == 4
+        assert sim.now == 3.5
+        assert sim.packet_hops[packet] == 3
+        assert sim.metrics.packets_received == 1
+        assert sim.metrics.get_avg_latency() == 1.5
+
+    def test_time_order(self):
+        """Test events run in time order whichever way they were injected."""
+        topo = TopologyBuilder.mesh([1, 2])
+        sim = Simulator(topo, hop_latency=1.0)
+        delivered = []
+        deliver = sim.handlers[2]
+        sim.handlers[2] = lambda packet, link: (
+            delivered.append((sim.now, packet)),
+            deliver(packet),
+        )
+        sim.inject_many([1, 1], [2, 2], [10, 10], [5.0, 0.0])
+        sim.inject(2, 1, 10, at=3.0)
+        sim.inject_many([1], [2], [10], [1.0])
+        sim.run()
+        assert delivered == [(1.0, 1), (2.0, 3), (4.0, 2), (6.0, 0)]
+
+    def test_run_until(self):
+        """Test a bounded run stops at the horizon and can resume."""
+        topo = TopologyBuilder.mesh([1, 2])
+        sim = Simulator(topo, hop_latency=1.0)
+        sim.inject_many([1] * 10, [2] * 10, [10] * 10, np.arange(10.0))
+        sim.run(until=4.5)
+        assert sim.now == 4.5
+        assert sim.delivered == 4
+        assert sim.pending == 6
+        sim.run(max_events=3)
+        assert sim.events_processed == 12
+        sim.run()
+        assert sim.delivered == 10
+
+    def test_past_time_rejected(self):
+        """Test packets and events cannot be scheduled before now."""
+        sim = Simulator(TopologyBuilder.mesh([1, 2]), hop_latency=1.0)
+        sim.inject(1, 2, 10, at=2.0)
+        sim.run()
+        with pytest.raises(ValueError):
+            sim.inject(1, 2, 10, at=1.0)
+        with pytest.raises(ValueError):
+            sim.inject_many([1], [2], [10], [0.5])
+        with pytest.raises(ValueError):
+            sim.schedule(0.0, 0, 0)
+        assert sim.num_packets == 1
+
+    def test_unreachable_dropped(self):
+        """Test packets with no route are dropped, not delivered."""
+        topo = Topology.from_edge_list([(1, 2)], node_ids=[3])
+        sim = Simulator(topo)
+        sim.inject(1, 3, 10)
+        sim.inject(3, 3, 10)
+        sim.run()
+        assert sim.dropped == 1
+        assert sim.delivered == 1
+        assert sim.in_flight == 0
+        assert sim.latency(1) == 0.0
+        with pytest.raises(KeyError):
+            sim.inject_many([1], [9], [10], [0.0])
+
+    def test_reroutes_after_failure(self):
+        """Test routing follows topology changes between runs."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3), (1, 3)])
+        sim = Simulator(topo, hop_latency=1.0)
+        sim.inject(1, 3, 10)
+        sim.run()
+        topo.fail_link(1, 3)
+        sim.inject(1, 3, 10)
+        sim.run()
+        assert sim.packet_hops == [1, 2]
+
+    def test_from_config_jitter(self):
+        """Test config latency and a seeded jitter."""
+        config = SimulationConfig(latency_base=0.01, latency_variance=0.002)
+        topo = TopologyBuilder.mesh([1, 2])
+        runs = []
+        for _ in range(2):
+            sim = Simulator.from_config(topo, config, seed=4)
+            sim.inject_many([1] * 50, [2] * 50, [10] * 50, [0.0] * 50)
+            sim.run()
+            runs.append(sim.metrics.get_latency_stats())
+        assert runs[0] == runs[1]
+        assert 0.01 <= runs[0]["min"] <= runs[0]["max"] <= 0.012
+
+    def test_metrics_use_simulated_time(self):
+        """Test a shared collector measures runtime in simulated seconds."""
+        metrics = MetricsCollector()
+        topo = TopologyBuilder.torus_2d(4, 4)
+        sim = Simulator(topo, metrics=metrics, hop_latency=1e-6)
+        rng = np.random.default_rng(0)
+        n = 20000
+        sim.inject_many(
+            rng.integers(0, 16, n), rng.integers(0, 16, n), [64] * n, np.linspace(0, 10, n)
+        )
+        sim.run()
+        assert metrics.packets_sent == metrics.packets_received == n
+        assert 10.0 <= metrics.runtime < 10.0 + 1e-3
+        assert metrics.get_throughput() == pytest.approx(n / metrics.runtime)
+
+
+class TestLinkSimulator:
+    """Tests for simulation with the link-layer model."""
+
+    def test_single_packet_latency(self):
+        """Test one hop costs serialization plus propagation delay."""
+        params = LinkParameters(data_rate=100e6, propagation_delay=1e-6)
+        sim = LinkSimulator(TopologyBuilder.point_to_point(1, 2), params)
+        packet = sim.inject(1, 2, 1000)
+        sim.run()
+        assert sim.latency(packet) == pytest.approx(params.serialization_delay(1000) + 1e-6)
+
+    def test_throughput_ceiling(self):
+        """Test a saturated link delivers at its data rate and queues the rest."""
+        params = LinkParameters(data_rate=10e6, propagation_delay=0.0, rx_buffer=4096)
+        sim = LinkSimulator(TopologyBuilder.point_to_point(1, 2), params)
+        sim.inject_many([1] * 200, [2] * 200, [500] * 200, [0.0] * 200)
+        sim.run()
+        assert sim.now == pytest.approx(200 * params.serialization_delay(500))
+        assert sim.link(1, 2).utilization(sim.now) == pytest.approx(1.0)
+        latencies = sorted(sim.latency(p) for p in range(200))
+        assert latencies[-1] == pytest.approx(200 * latencies[0])
+
+    def test_back_pressure(self):
+        """Test a slow downstream link stalls the upstream transmitter."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        sim = LinkSimulator(topo, LinkParameters(data_rate=100e6, rx_buffer=2048))
+        sim.configure_link(2, 3, data_rate=10e6)
+        sim.inject_many([1] * 50, [3] * 50, [1000] * 50, [0.0] * 50)
+        sim.run()
+        first, second = sim.link(1, 2), sim.link(2, 3)
+        assert sim.delivered == 50
+        assert first.stall_time > 5 * first.busy_time
+        assert second.utilization(sim.now) > 0.95
+
+    def test_virtual_channel_credits(self):
+        """Test a blocked SpaceFibre VC does not hold up traffic on another VC."""
+        worst = {}
+        for protocol in ("spacewire", "spacefibre"):
+            topo = Topology.from_edge_list([(1, 2), (2, 3)])
+            params = LinkParameters(protocol=protocol, rx_buffer=1024, virtual_channels=2)
+            sim = LinkSimulator(topo, params)
+            sim.configure_link(2, 3, data_rate=20e6)
+            sim.inject_many([1] * 50, [3] * 50, [1000] * 50, [0.0] * 50, virtual_channels=[0] * 50)
+            probes = sim.inject_many(
+                [1] * 20,
+                [2] * 20,
+                [100] * 20,
+                np.arange(20) * 1e-4,
+                virtual_channels=[params.virtual_channels - 1] * 20,
+            )
+            sim.run()
+            worst[protocol] = max(sim.latency(p) for p in probes)
+        assert worst["spacefibre"] < 1e-4 < worst["spacewire"]
+
+    def test_from_network_config(self):
+        """Test defaults and per-link overrides come from the network config."""
+        network = NetworkConfig(
+            link_protocol="spacefibre",
+            data_rate=2.5e9,
+            rx_buffer=2048,
+            links=[{"src": 1, "dst": 2, "data_rate": 1e9}],
+        )
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        sim = LinkSimulator.from_network_config(topo, network, QoSConfig(virtual_channels=4))
+        assert sim.link(1, 2).params.data_rate == sim.link(2, 1).params.data_rate == 1e9
+        assert sim.link(2, 3).params.data_rate == 2.5e9
+        assert len(sim.link(2, 3).credits) == 4
+        sim.inject(1, 3, 100)
+        sim.run()
+        with pytest.raises(ValueError):
+            sim.configure_link(1, 2, data_rate=5e8)
+
+    def test_bandwidth_allocation(self):
+        """Test a saturated link splits its bandwidth by the QoS allocation."""
+        qos = QoSConfig(queue_limit=0)
+        network = NetworkConfig(link_protocol="spacefibre", data_rate=1e9, rx_buffer=1 << 20)
+        qos_metrics = QoSMetrics()
+        sim = LinkSimulator.from_network_config(
+            TopologyBuilder.point_to_point(1, 2), network, qos, qos_metrics=qos_metrics
+        )
+        n = 3000
+        priorities = np.arange(n) % 4
+        sim.inject_many([1] * n, [2] * n, [1000] * n, np.zeros(n), priorities=priorities)
+        sim.run(until=n * 0.4 * sim.params.serialization_delay(1000))
+        stats = qos_metrics.get_vc_stats()
+        assert stats[0]["count"] == n // 4
+        assert stats[2]["bytes"] / stats[6]["bytes"] == pytest.approx(3.0, rel=0.05)
+        assert stats[4]["bytes"] / stats[6]["bytes"] == pytest.approx(2.0, rel=0.05)
+        latency = qos_metrics.get_priority_stats()
+        assert latency[0]["max_latency"] < latency[1]["avg_latency"]
+
+    def test_queue_limit_drops(self):
+        """Test router queues drop packets beyond the limit, sources do not."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        sim = LinkSimulator(topo, LinkParameters(rx_buffer=2048, queue_limit=10))
+        sim.configure_link(2, 3, data_rate=1e6)
+        sim.inject_many([1] * 40, [3] * 40, [100] * 40, [0.0] * 40)
+        sim.run()
+        assert sim.link(1, 2).dropped == 0
+        assert sim.dropped == sim.link(2, 3).dropped > 0
+        assert sim.delivered + sim.dropped == 40
+
+    def test_link_with_fewer_channels(self):
+        """Test a link with fewer VCs maps packets by priority class."""
+        network = NetworkConfig(link_protocol="spacefibre", rx_buffer=1024)
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        sim = LinkSimulator.from_network_config(topo, network, QoSConfig())
+        sim.configure_link(2, 3, virtual_channels=2)
+        packets = sim.inject_many([1] * 4, [3] * 4, [100] * 4, [0.0] * 4, priorities=[0, 1, 2, 3])
+        assert [sim.packet_vc[p] for p in packets] == [0, 2, 4, 6]
+        assert [sim._link_vc(p, sim.link(2, 3)) for p in packets] == [0, 0, 1, 1]
+        sim.run()
+        assert sim.delivered == 4
+        assert sim.link(2, 3).credits == [1024, 1024]
+        with pytest.raises(ValueError):
+            sim.inject(1, 3, 100, virtual_channel=8)
+
+    def test_multipath_throughput(self):
+        """Test selected source routes spread a pair's traffic over a torus."""
+        delivered = {}
+        for mode in (None, PathSelector.ROUND_ROBIN, PathSelector.HASH):
+            topo = TopologyBuilder.torus_2d(4, 4)
+            selector = PathSelector(topo, mode=mode) if mode else None
+            params = LinkParameters(data_rate=100e6, rx_buffer=4096)
+            sim = LinkSimulator(topo, params, path_selector=selector)
+            n = 400
+            packets = sim.inject_many([0] * n, [5] * n, [1000] * n, np.zeros(n), flows=range(n))
+            sim.run(until=100 * params.serialization_delay(1000))
+            delivered[mode] = sim.delivered
+            if selector is not None:
+                candidates = selector.paths(0, 5)
+                assert all(sim.route(p) in candidates for p in packets)
+        assert delivered[PathSelector.ROUND_ROBIN] > 1.8 * delivered[None]
+        assert delivered[PathSelector.HASH] > 1.5 * delivered[None]
+
+    def test_router_forwarding(self):
+        """Test routers forward by header and adapt to busy links."""
+        topo = TopologyBuilder.torus_2d(4, 4)
+        routers = RouterNetwork(topo)
+        sim = LinkSimulator(topo, routers=routers)
+        sim.inject_many([0] * 2, [5] * 2, [1000] * 2, [0.0] * 2)
+        sim.run()
+        assert sim.delivered == 2
+        assert sim.link(0, 1).packets_sent == sim.link(0, 4).packets_sent == 1
+
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        routers = RouterNetwork(topo)
+        sim = LinkSimulator(topo, routers=routers)
+        port = routers.router(1).port_of[2]
+        one_hop = sim.inject_packet(SpaceWirePacket(src=1, dst=2, data=b"x", route=port))
+        spilled = sim.inject_packet(SpaceWirePacket(src=1, dst=3, data=b"x", route=port))
+        misrouted = sim.inject_packet(
+            SpaceWirePacket(src=1, dst=3, data=b"x", route=routers.address_of[2])
+        )
+        logical = sim.inject_packet(SpaceWirePacket(src=1, dst=3, data=b"x"))
+        sim.run()
+        assert sim.latency(one_hop) is not None and sim.latency(logical) is not None
+        assert sim.latency(spilled) is None and sim.latency(misrouted) is None
+        assert sim.dropped == 2
+
+    def test_new_links_after_topology_change(self):
+        """Test links added between runs get link state."""
+        topo = Topology.from_edge_list([(1, 2)], node_ids=[3])
+        sim = LinkSimulator(topo)
+        topo.add_edge(2, 3)
+        sim.inject(1, 3, 10)
+        sim.run()
+        assert sim.delivered == 1
+        assert sim.link(2, 3).packets_sent == 1
+
+
+class TestWormholeSimulator:
+    """Tests for wormhole switching."""
+
+    def test_cut_through_latency(self):
+        """Test only the header is delayed per hop, not the whole packet."""
+        params = LinkParameters(data_rate=100e6, propagation_delay=1e-6)
+        topo = Topology.from_edge_list([(1, 2), (2, 3), (3, 4)])
+        sim = WormholeSimulator(topo, params)
+        packet = sim.inject(1, 4, 1000)
+        sim.run()
+        expected = params.serialization_delay(1000) + 2 * params.header_delay() + 3e-6
+        assert sim.latency(packet) == pytest.approx(expected)
+        assert sim.link(2, 3).packets_sent == 1
+        assert not sim.link(2, 3).busy
+
+    def test_blocked_path(self):
+        """Test a blocked header holds its path and blocks traffic behind it."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3), (4, 2), (5, 4)])
+        sim = WormholeSimulator(topo, LinkParameters(data_rate=100e6))
+        first = sim.inject(1, 3, 10000)
+        second = sim.inject(5, 3, 1000, at=1e-6)
+        third = sim.inject(5, 4, 1000, at=2e-6)
+        sim.run(until=1e-4)
+        assert sim.blocked_paths() == [
+            {
+                "packet": second,
+                "waiting_for": (2, 3),
+                "holder": first,
+                "held": [(5, 4), (4, 2)],
+                "since": pytest.approx(1.3e-6),
+            },
+            {
+                "packet": third,
+                "waiting_for": (5, 4),
+                "holder": second,
+                "held": [],
+                "since": pytest.approx(2e-6),
+            },
+        ]
+        sim.run()
+        assert sim.delivered == 3
+        assert sim.packet_received[first] < sim.packet_received[second] < sim.packet_received[third]
+        assert sim.packet_blocked[third] > sim.link(1, 2).params.serialization_delay(9000)
+        assert sim.link(4, 2).hol_time == sim.link(5, 4).hol_time == sim.packet_blocked[second]
+        assert sim.link(1, 2).hol_time == 0.0
+        stats = sim.blocking_stats()
+        assert stats["blocked_packets"] == 2 and stats["currently_blocked"] == 0
+
+    def test_deadlock_detected(self):
+        """Test a cycle of blocked headers is reported."""
+        topo = TopologyBuilder.ring(0x01, [0x02, 0x03, 0x04])
+        sim = WormholeSimulator(topo)
+        for src in range(1, 5):
+            sim.inject(src, (src + 1) % 4 + 1, 1000)
+        sim.run()
+        assert sim.in_flight == 4
+        assert sorted(sim.find_deadlock()) == [0, 1, 2, 3]
+
+    def test_no_deadlock_on_tree(self):
+        """Test heavy traffic on a tree drains with no deadlock reported."""
+        topo = TopologyBuilder.fat_tree(4)
+        hosts = [node_id for node_id, node in topo.nodes.items() if node.metadata["role"] == "host"]
+        sim = WormholeSimulator(topo)
+        rng = np.random.default_rng(1)
+        n = 2000
+        sim.inject_many(rng.choice(hosts, n), rng.choice(hosts, n), [500] * n, rng.random(n) * 1e-3)
+        sim.run(until=5e-4)
+        assert sim.find_deadlock() is None
+        sim.run()
+        assert sim.delivered == n
+        assert sim.blocking_stats()["hol_blocking_time"] > 0
+
+    def test_switching_from_config(self):
+        """Test the network config selects the switching model."""
+        topo = TopologyBuilder.mesh([1, 2])
+        sim = LinkSimulator.from_network_config(topo, NetworkConfig(switching="wormhole"))
+        assert isinstance(sim, WormholeSimulator)
+        with pytest.raises(ValueError):
+            LinkSimulator.from_network_config(topo, NetworkConfig(switching="circuit"))
+
+    def test_adaptive_routing_around_held_link(self):
+        """Test a router sends a header past a link held by another worm."""
+        topo = TopologyBuilder.torus_2d(4, 4)
+        sim = WormholeSimulator(topo, routers=RouterNetwork(topo))
+        sim.inject_many([0] * 2, [5] * 2, [1000] * 2, [0.0] * 2)
+        sim.run()
+        assert sim.delivered == 2
+        assert sum(sim.packet_blocked) == 0
+        assert sim.link(0, 1).packets_sent == sim.link(0, 4).packets_sent == 1
@@ -1,8 +1,12 @@
 """Unit tests for topology module."""
 
+import random
+
+import numpy as np
 import pytest
 from spacewire.topology import (
-    Topology, TopologyType, Node, TopologyBuilder,
+    Topology, TopologyType, Node, TopologyBuilder, RoutingTable, PathSelector,
+    DynamicRoutingTable,
     get_topology, format_node_id
 )
 
@@ -68,6 +72,69 @@ class TestTopology:
         assert 2 in neighbors
         assert 3 in neighbors
 
+    def test_duplicate_edge(self):
+        """Test re-adding an edge does not duplicate links or connections."""
+        topo = Topology("Test", TopologyType.MESH)
+        topo.add_nodes([Node(id=1, name="Node1"), Node(id=2, name="Node2")])
+        topo.add_edge(1, 2)
+        topo.add_edge(1, 2)
+        topo.add_edge(2, 1)
+        assert topo.edges == {1: [2], 2: [1]}
+        assert topo.nodes[1].connections == [topo.nodes[2]]
+        assert topo.nodes[2].connections == [topo.nodes[1]]
+
+    def test_add_edges(self):
+        """Test bulk edge insertion."""
+        topo = Topology("Test", TopologyType.MESH)
+        added = topo.add_edges([(1, 2), (2, 3), (1, 2)], bidirectional=False)
+        assert added == 2
+        assert topo.edges == {1: [2], 2: [3], 3: []}
+
+    def test_from_edge_list(self):
+        """Test building a topology from an edge list."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3)], name="Line", node_ids=[9])
+        assert set(topo.nodes) == {1, 2, 3, 9}
+        assert topo.edges[2] == [1, 3]
+        assert topo.nodes[2].connections == [topo.nodes[1], topo.nodes[3]]
+
+    def test_remove_edge(self):
+        """Test removing links and connections."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        assert topo.remove_edge(1, 2) == 2
+        assert topo.edges[1] == []
+        assert topo.edges[2] == [3]
+        assert topo.nodes[2].connections == [topo.nodes[3]]
+        assert topo.remove_edge(1, 2) == 0
+        topo.add_edge(1, 2)
+        assert topo.edges[1] == [2]
+
+    def test_fail_and_restore_link(self):
+        """Test failed links are remembered and restored."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        assert topo.fail_link(1, 2) == [(1, 2), (2, 1)]
+        assert topo.bfs_path(1, 3) is None
+        assert topo.failed_links == {(1, 2), (2, 1)}
+        assert topo.restore_link(1, 2, bidirectional=False) == [(1, 2)]
+        assert topo.bfs_path(1, 3) == [1, 2, 3]
+        assert topo.failed_links == {(2, 1)}
+        assert topo.restore_link(1, 3) == []
+
+    def test_fail_and_restore_node(self):
+        """Test a router failure takes down all its links."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3), (3, 1)])
+        failed = topo.fail_node(2)
+        assert set(failed) == {(2, 1), (2, 3), (1, 2), (3, 2)}
+        assert topo.edges[2] == []
+        assert topo.bfs_path(1, 3) == [1, 3]
+        assert len(topo.restore_node(2)) == 4
+        assert topo.failed_links == set()
+        assert topo.bfs_path(1, 2) == [1, 2]
+
+    def test_initial_edges_indexed(self):
+        """Test edges passed to the constructor are deduplicated on insert."""
+        topo = Topology("Test", TopologyType.MESH, edges={1: [2], 2: [1]})
+        assert topo.add_edges([(1, 2)]) == 0
+
 
 class TestTopologyBuilder:
     """Tests for TopologyBuilder."""
@@ -88,11 +155,23 @@ class TestTopologyBuilder:
         topo = TopologyBuilder.mesh([0x01, 0x02, 0x03])
         assert len(topo.nodes) == 3
 
+    def test_large_mesh(self):
+        """Test a large mesh has every link exactly once."""
+        topo = TopologyBuilder.mesh(list(range(300)))
+        assert all(len(dsts) == 299 for dsts in topo.edges.values())
+        assert all(len(node.connections) == 299 for node in topo.nodes.values())
+
     def test_tree_topology(self):
         """Test tree topology creation."""
         topo = TopologyBuilder.tree(0x01, [[0x02, 0x03], [0x04, 0x05]])
         assert len(topo.nodes) == 5
 
+    def test_tree_seeded(self):
+        """Test the same seed gives the same tree."""
+        levels = [[0x02, 0x03, 0x04], [0x05, 0x06], [0x07]]
+        trees = [TopologyBuilder.tree(0x01, levels, seed=7).edges for _ in range(3)]
+        assert trees[0] == trees[1] == trees[2]
+
     def test_point_to_point(self):
         """Test point-to-point topology."""
         topo = TopologyBuilder.point_to_point(0x01, 0x02)
@@ -104,6 +183,92 @@ class TestTopologyBuilder:
         assert len(topo.nodes) == 3
 
 
+class TestGenerators:
+    """Tests for large-scale topology generators."""
+
+    def test_from_arrays(self):
+        """Test bulk construction drops duplicate links and sets positions."""
+        topo = Topology.from_arrays(
+            np.array([1, 2, 1]), np.array([2, 3, 2]),
+            node_ids=np.array([1, 2, 3, 4]), positions=np.array([[0, 0], [1, 0], [2, 0], [3, 0]]),
+        )
+        assert topo.edges == {1: [2], 2: [3, 1], 3: [2], 4: []}
+        assert topo.nodes[3].x == 2
+        assert topo.nodes[2].connections == [topo.nodes[3], topo.nodes[1]]
+        assert topo.add_edges([(1, 2)]) == 0
+
+    def test_torus_2d(self):
+        """Test every node of a torus has four neighbors."""
+        topo = TopologyBuilder.torus_2d(4, 5)
+        assert len(topo.nodes) == 20
+        assert all(len(dsts) == 4 for dsts in topo.edges.values())
+        assert set(topo.edges[0]) == {1, 4, 5, 15}
+        assert topo.is_connected()
+
+    def test_torus_3d(self):
+        """Test a 3D torus has six neighbors per node."""
+        topo = TopologyBuilder.torus_3d(3, 3, 3)
+        assert len(topo.nodes) == 27
+        assert all(len(dsts) == 6 for dsts in topo.edges.values())
+
+    def test_hypercube(self):
+        """Test a 2-ary n-cube is a hypercube."""
+        topo = TopologyBuilder.k_ary_n_cube(2, 4)
+        assert len(topo.nodes) == 16
+        for node_id, dsts in topo.edges.items():
+            assert sorted(node_id ^ d for d in dsts) == [1, 2, 4, 8]
+
+    def test_fat_tree(self):
+        """Test fat-tree tier sizes and wiring."""
+        topo = TopologyBuilder.fat_tree(4)
+        roles = [node.metadata["role"] for node in topo.nodes.values()]
+        assert roles.count("core") == 4
+        assert roles.count("aggregation") == 8
+        assert roles.count("edge") == 8
+        assert roles.count("host") == 16
+        for node in topo.nodes.values():
+            expected = {"core": 4, "aggregation": 4, "edge": 4, "host": 1}[node.metadata["role"]]
+            assert len(topo.edges[node.id]) == expected
+        assert topo.is_connected()
+        with pytest.raises(ValueError):
+            TopologyBuilder.fat_tree(3)
+
+    def test_random_geometric(self):
+        """Test links join exactly the node pairs closer than the radius."""
+        topo = TopologyBuilder.random_geometric(300, 0.1, seed=3)
+        coords = np.array([(topo.nodes[i].x, topo.nodes[i].y) for i in range(300)])
+        distance = np.hypot(*(coords[:, None, :] - coords[None, :, :]).transpose(2, 0, 1))
+        expected = {(a, b) for a, b in zip(*np.nonzero(distance < 0.1)) if a != b}
+        actual = {(a, b) for a, dsts in topo.edges.items() for b in dsts}
+        assert actual == expected
+
+    def test_random_geometric_seeded(self):
+        """Test the same seed reproduces the graph."""
+        first = TopologyBuilder.random_geometric(200, 0.1, seed=5)
+        second = TopologyBuilder.random_geometric(200, 0.1, seed=5)
+        other = TopologyBuilder.random_geometric(200, 0.1, seed=6)
+        assert first.edges == second.edges
+        assert first.edges != other.edges
+
+    def test_dual_plane_backbone(self):
+        """Test every end node survives the loss of a whole plane."""
+        topo = TopologyBuilder.dual_plane_backbone(50, 8, seed=1)
+        routers = [n for n in topo.nodes.values() if n.metadata["role"] == "router"]
+        assert len(routers) == 16
+        assert len(topo.nodes) == 66
+        for node_id in range(16, 66):
+            planes = {topo.nodes[r].metadata["plane"] for r in topo.edges[node_id]}
+            assert planes == {"A", "B"}
+        for router in range(8):
+            topo.fail_node(router)
+        assert topo.bfs_path(16, 65) is not None
+
+    def test_dual_plane_cross_strap(self):
+        """Test cross-strapping links matching routers."""
+        topo = TopologyBuilder.dual_plane_backbone(4, 4, cross_strap=True)
+        assert 4 in topo.edges[0]
+
+
 class TestPathfinding:
     """Tests for pathfinding algorithms."""
 
@@ -123,6 +288,102 @@ class TestPathfinding:
         path = topo.bfs_path(1, 2)
         assert path is None
 
+    def test_bfs_long_ring(self):
+        """Test BFS on a long ring returns the full path."""
+        ids = list(range(1, 5000))
+        topo = TopologyBuilder.ring(0, ids)
+        path = topo.bfs_path(0, 4999)
+        assert path == [0] + ids
+
+    def test_dijkstra_stored_weights(self):
+        """Test stored link weights steer the array-backed search."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3), (1, 3)])
+        assert topo.dijkstra_path(1, 3) == [1, 3]
+        topo.set_link_weight(1, 3, 5.0)
+        assert topo.dijkstra_path(1, 3) == [1, 2, 3]
+        assert topo.dijkstra_path(1, 3, {}) == [1, 3]
+        assert topo.path_cost([1, 3]) == 5.0
+
+    def test_add_edge_weight(self):
+        """Test weights given with add_edge survive a failure."""
+        topo = Topology("Test", TopologyType.MESH)
+        topo.add_edge(1, 2, weight=4.0)
+        topo.add_edge(2, 3)
+        topo.add_edge(1, 3, weight=10.0)
+        topo.fail_link(1, 2)
+        topo.restore_link(1, 2)
+        assert topo.link_weights[(2, 1)] == 4.0
+        assert topo.dijkstra_path(1, 3) == [1, 2, 3]
+
+    @staticmethod
+    def _geometric_grid(side, seed=0):
+        rng = random.Random(seed)
+        topo = Topology("Grid", TopologyType.MESH)
+        topo.add_nodes(
+            Node(id=r * side + c, name="N", x=c + rng.random() * 0.4, y=r + rng.random() * 0.4)
+            for r in range(side) for c in range(side)
+        )
+        topo.add_edges(
+            [(r * side + c, r * side + c + 1) for r in range(side) for c in range(side - 1)]
+            + [(r * side + c, (r + 1) * side + c) for r in range(side - 1) for c in range(side)]
+        )
+        topo.set_euclidean_weights()
+        return topo
+
+    def test_astar_matches_dijkstra(self):
+        """Test A* finds routes as cheap as Dijkstra."""
+        topo = self._geometric_grid(12)
+        rng = random.Random(1)
+        for _ in range(20):
+            src, dst = rng.randrange(144), rng.randrange(144)
+            expected = topo.path_cost(topo.dijkstra_path(src, dst))
+            path = topo.astar_path(src, dst)
+            assert path[0] == src and path[-1] == dst
+            assert topo.path_cost(path) == pytest.approx(expected)
+
+    def test_astar_non_geometric_weights(self):
+        """Test A* stays exact when costs are unrelated to distance."""
+        topo = self._geometric_grid(6)
+        topo.set_link_weight(0, 1, 0.01)
+        topo.set_link_weight(1, 2, 0.01)
+        expected = topo.path_cost(topo.dijkstra_path(0, 35))
+        assert topo.path_cost(topo.astar_path(0, 35)) == pytest.approx(expected)
+
+    def test_astar_unknown_nodes(self):
+        """Test A* without coordinates or routes."""
+        topo = Topology.from_edge_list([(1, 2), (3, 4)])
+        assert topo.astar_path(1, 2) == [1, 2]
+        assert topo.astar_path(1, 4) is None
+        assert topo.astar_path(1, 99) is None
+
+    @staticmethod
+    def _hub(hub_id, device_ids):
+        topo = Topology("Hub", TopologyType.STAR)
+        for did in device_ids:
+            topo.add_edge(hub_id, did)
+        return topo
+
+    def test_shortest_path_tree(self):
+        """Test one traversal gives routes to every destination."""
+        topo = self._hub(0x01, [0x02, 0x03, 0x04])
+        tree = topo.shortest_path_tree(0x02)
+        assert tree.source == 0x02
+        assert tree.path_to(0x02) == [0x02]
+        assert tree.path_to(0x03) == [0x02, 0x01, 0x03]
+        assert tree.distance[0x04] == 2
+        assert tree.path_to(0x99) is None
+        routes = tree.routes()
+        assert set(routes) == {0x01, 0x02, 0x03, 0x04}
+        for dst, path in routes.items():
+            assert path == topo.bfs_path(0x02, dst)
+
+    def test_multicast_edges(self):
+        """Test shared links are counted once for multicast."""
+        topo = self._hub(0x01, [0x02, 0x03, 0x04])
+        tree = topo.shortest_path_tree(0x02)
+        edges = tree.multicast_edges([0x03, 0x04])
+        assert edges == {(0x02, 0x01), (0x01, 0x03), (0x01, 0x04)}
+
     def test_dijkstra_path(self):
         """Test Dijkstra pathfinding."""
         topo = TopologyBuilder.mesh([0x01, 0x02, 0x03, 0x04])
@@ -132,6 +393,232 @@ class TestPathfinding:
         assert path[-1] == 0x04
 
 
+def _grid(rows, cols):
+    """Bidirectional grid with node id ``r * cols + c``."""
+    edges = [(r * cols + c, r * cols + c + 1) for r in range(rows) for c in range(cols - 1)]
+    edges += [(r * cols + c, (r + 1) * cols + c) for r in range(rows - 1) for c in range(cols)]
+    return Topology.from_edge_list(edges)
+
+
+class TestMultipath:
+    """Tests for ECMP, k-shortest paths and path selection."""
+
+    def test_ecmp_ring(self):
+        """Test both directions around an even ring are found."""
+        topo = Topology.from_edge_list((i, (i + 1) % 6) for i in range(6))
+        assert topo.ecmp_paths(0, 3) == [[0, 1, 2, 3], [0, 5, 4, 3]]
+        assert topo.ecmp_paths(0, 1) == [[0, 1]]
+
+    def test_ecmp_grid(self):
+        """Test a 3x3 grid corner-to-corner has six shortest paths."""
+        paths = _grid(3, 3).ecmp_paths(0, 8)
+        assert len(paths) == 6
+        assert len({tuple(p) for p in paths}) == 6
+        assert all(len(p) == 5 for p in paths)
+        assert len(_grid(3, 3).ecmp_paths(0, 8, max_paths=4)) == 4
+
+    def test_ecmp_weights(self):
+        """Test weights break ties."""
+        topo = Topology.from_edge_list((i, (i + 1) % 6) for i in range(6))
+        assert topo.ecmp_paths(0, 3, {(0, 1): 2.0}) == [[0, 5, 4, 3]]
+
+    def test_ecmp_unreachable(self):
+        """Test no paths between disconnected nodes."""
+        topo = Topology.from_edge_list([(1, 2), (3, 4)])
+        assert topo.ecmp_paths(1, 4) == []
+
+    def test_k_shortest_paths(self):
+        """Test Yen's algorithm on a small mesh."""
+        topo = TopologyBuilder.mesh([1, 2, 3, 4])
+        paths = topo.k_shortest_paths(1, 4, 5)
+        assert paths[0] == [1, 4]
+        assert sorted(paths[1:3]) == [[1, 2, 4], [1, 3, 4]]
+        assert sorted(paths[3:]) == [[1, 2, 3, 4], [1, 3, 2, 4]]
+        costs = [topo.path_cost(p) for p in paths]
+        assert costs == sorted(costs)
+
+    def test_k_shortest_paths_exhausted(self):
+        """Test fewer than k paths when the graph has no more."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        assert topo.k_shortest_paths(1, 3, 4) == [[1, 2, 3]]
+
+    def test_hash_selection_is_per_flow(self):
+        """Test a flow always takes the same path."""
+        selector = PathSelector(_grid(3, 3))
+        first = selector.select(0, 8, flow=7)
+        assert all(selector.select(0, 8, flow=7) == first for _ in range(10))
+        used = {tuple(selector.select(0, 8, flow=f)) for f in range(100)}
+        assert len(used) > 1
+
+    def test_round_robin(self):
+        """Test round robin cycles through the candidates."""
+        selector = PathSelector(_grid(3, 3), mode=PathSelector.ROUND_ROBIN)
+        paths = [selector.select(0, 8) for _ in range(6)]
+        assert len({tuple(p) for p in paths}) == 6
+
+    def test_spreading_lowers_peak_load(self):
+        """Test multipath reduces the busiest link's load."""
+        topo = _grid(4, 4)
+        single = PathSelector(topo, max_paths=1)
+        spread = PathSelector(topo, max_paths=32)
+        for flow in range(200):
+            single.select(0, 15, flow)
+            spread.select(0, 15, flow)
+        assert single.max_link_load() == 200
+        assert spread.max_link_load() < 150
+
+    def test_k_mode_and_invalidation(self):
+        """Test k-shortest mode and cache reset on topology change."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        selector = PathSelector(topo, k=2)
+        assert selector.paths(1, 3) == [[1, 2, 3]]
+        topo.add_edge(1, 3)
+        assert selector.paths(1, 3) == [[1, 3], [1, 2, 3]]
+
+    def test_invalid_mode(self):
+        """Test unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            PathSelector(_grid(2, 2), mode="random")
+
+
+class TestDynamicRoutingTable:
+    """Tests for incremental route repair."""
+
+    @staticmethod
+    def _assert_matches_full(table, topo, weights=None):
+        full = topo.all_pairs_shortest_paths(weights, workers=1)
+        assert np.array_equal(table.distance, full.distance)
+        for src in topo.edges:
+            for dst in topo.edges:
+                path = table.path(src, dst)
+                if path is None:
+                    assert full.path(src, dst) is None
+                    continue
+                assert topo.path_cost(path, weights) == table.cost(src, dst)
+                assert all(b in topo.edges[a] for a, b in zip(path, path[1:]))
+
+    def test_link_failure_reroutes(self):
+        """Test a failed ring link reroutes the other way round."""
+        topo = Topology.from_edge_list((i, (i + 1) % 6) for i in range(6))
+        table = DynamicRoutingTable(topo)
+        assert table.path(0, 1) == [0, 1]
+        assert table.fail_link(0, 1) > 0
+        assert table.path(0, 1) == [0, 5, 4, 3, 2, 1]
+        assert table.cost(0, 1) == 5
+        table.restore_link(0, 1)
+        assert table.path(0, 1) == [0, 1]
+        self._assert_matches_full(table, topo)
+
+    def test_partition(self):
+        """Test routes disappear when the network splits."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3)])
+        table = DynamicRoutingTable(topo)
+        table.fail_link(2, 3)
+        assert table.path(1, 3) is None
+        assert table.next_hop(1, 3) is None
+        self._assert_matches_full(table, topo)
+
+    def test_repairs_are_local(self):
+        """Test an equal-cost alternative needs only one entry changed."""
+        topo = _grid(3, 3)
+        table = DynamicRoutingTable(topo)
+        hop = table.next_hop(0, 8)
+        assert table.fail_link(0, hop, bidirectional=False) < 9
+        assert table.cost(0, 8) == 4
+        self._assert_matches_full(table, topo)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_failures_match_full_recompute(self, seed):
+        """Test repaired tables equal a fresh computation."""
+        rng = random.Random(seed)
+        edges = {(rng.randrange(20), rng.randrange(20)) for _ in range(40)}
+        edges = {(a, b) for a, b in edges if a != b}
+        weights = {edge: rng.choice([1.0, 2.0, 3.0]) for edge in edges} if seed % 2 else None
+        topo = Topology.from_edge_list(edges, bidirectional=False)
+        table = DynamicRoutingTable(topo, weights)
+        for _ in range(15):
+            if topo.failed_links and rng.random() < 0.4:
+                table.restore_link(*rng.choice(sorted(topo.failed_links)), bidirectional=False)
+            elif rng.random() < 0.2:
+                table.fail_node(rng.randrange(20))
+            else:
+                src = rng.choice([k for k, v in topo.edges.items() if v])
+                table.fail_link(src, rng.choice(topo.edges[src]), bidirectional=False)
+            self._assert_matches_full(table, topo, weights)
+
+    def test_rebuild_after_direct_change(self):
+        """Test edges added outside the table trigger a rebuild."""
+        topo = Topology.from_edge_list([(1, 2)])
+        table = DynamicRoutingTable(topo)
+        topo.add_edge(2, 3)
+        assert table.path(1, 3) == [1, 2, 3]
+
+
+class TestRoutingTable:
+    """Tests for the precomputed next-hop table."""
+
+    @pytest.mark.parametrize("topo", [
+        TopologyBuilder.mesh([0x01, 0x02, 0x03, 0x04]),
+        TopologyBuilder.ring(0x01, [0x02, 0x03, 0x04, 0x05, 0x06]),
+        TopologyBuilder.tree(0x01, [[0x02, 0x03], [0x04, 0x05]]),
+        TopologyBuilder.bus([0x01, 0x02, 0x03]),
+    ])
+    def test_paths_match_bfs(self, topo):
+        """Test routes are valid and as short as BFS routes."""
+        table = RoutingTable(topo)
+        for src in topo.edges:
+            for dst in topo.edges:
+                expected = topo.bfs_path(src, dst)
+                path = table.path(src, dst)
+                if expected is None:
+                    assert path is None
+                    continue
+                assert len(path) == len(expected)
+                assert path[0] == src and path[-1] == dst
+                for a, b in zip(path, path[1:]):
+                    assert b in topo.edges[a]
+
+    def test_next_hop(self):
+        """Test single next-hop lookups on a unidirectional ring."""
+        topo = TopologyBuilder.ring(0x01, [0x02, 0x03, 0x04, 0x05])
+        table = RoutingTable(topo)
+        assert table.next_hop(0x01, 0x02) == 0x02
+        assert table.next_hop(0x01, 0x05) == 0x02
+        assert table.next_hop(0x05, 0x04) == 0x01
+        assert table.next_hop(0x03, 0x03) == 0x03
+        assert table.next_hop(0x01, 0x99) is None
+
+    def test_unreachable(self):
+        """Test disconnected nodes have no route."""
+        topo = Topology("Test", TopologyType.MESH)
+        topo.add_edge(1, 2)
+        topo.add_edge(3, 4)
+        table = RoutingTable(topo)
+        assert table.path(1, 2) == [1, 2]
+        assert table.path(1, 3) is None
+        assert table.next_hop(1, 4) is None
+
+    def test_invalidated_by_add_edge(self):
+        """Test the table rebuilds after the topology changes."""
+        topo = Topology("Test", TopologyType.MESH)
+        topo.add_edge(1, 2)
+        topo.add_edge(3, 4)
+        table = RoutingTable(topo)
+        assert not table.is_stale
+        topo.add_edge(2, 3)
+        assert table.is_stale
+        assert table.path(1, 4) == [1, 2, 3, 4]
+        assert not table.is_stale
+
+    def test_small_blocks(self):
+        """Test results do not depend on the source block size."""
+        topo = TopologyBuilder.mesh(list(range(1, 8)))
+        topo.add_edge(7, 8)
+        full = RoutingTable(topo)
+        blocked = RoutingTable(topo, block_size=3)
+        assert (full.next_hops == blocked.next_hops).all()
+
+
 class TestTopologyValidation:
     """Tests for topology validation."""
 
@@ -147,6 +634,52 @@ class TestTopologyValidation:
         is_valid, errors = topo.validate()
         assert is_valid
 
+    def test_validate_edge_source(self):
+        """Test links from unknown ids are reported."""
+        topo = TopologyBuilder.bus([0x01, 0x02, 0x03])
+        assert topo.is_connected()
+        assert topo.validate() == (False, ["Edge source 0 not in nodes"])
+
+    def test_components_incremental(self):
+        """Test the component index follows added nodes and edges."""
+        topo = Topology.from_edge_list([(1, 2), (3, 4)])
+        assert topo.component_count() == 2
+        assert topo.same_component(1, 2)
+        assert not topo.same_component(2, 3)
+        topo.add_node(Node(id=5, name="Node_05"))
+        assert topo.component_count() == 3
+        topo.add_edge(2, 3, bidirectional=False)
+        topo.add_edge(4, 5)
+        assert topo.is_connected()
+        assert topo.component_of(1) == topo.component_of(5)
+        assert topo.component_of(99) is None
+
+    def test_components_after_failure(self):
+        """Test failing and restoring a link splits and rejoins components."""
+        topo = Topology.from_edge_list([(1, 2), (2, 3), (3, 4)])
+        assert topo.is_connected()
+        topo.fail_link(2, 3)
+        assert topo.component_count() == 2
+        assert not topo.same_component(1, 4)
+        assert topo.validate() == (False, ["Topology is not fully connected"])
+        topo.restore_link(2, 3)
+        assert topo.is_connected()
+
+    def test_components_match_bfs(self):
+        """Test the index agrees with a BFS over random graphs."""
+        rng = random.Random(11)
+        for _ in range(20):
+            topo = Topology.from_edge_list([], node_ids=range(40))
+            for _ in range(30):
+                topo.add_edge(rng.randrange(40), rng.randrange(40))
+            for _ in range(5):
+                src = rng.randrange(40)
+                if topo.get_neighbors(src):
+                    topo.fail_link(src, rng.choice(topo.get_neighbors(src)))
+            expected = {frozenset(topo.shortest_path_tree(i).parent) for i in range(40)}
+            assert topo.component_count() == len(expected)
+            assert {frozenset(group) for group in topo.components.groups()} == expected
+
 
 class TestHelpers:
     """Tests for helper functions."""